@@ -0,0 +1,166 @@
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from fitting import CurveFitter
+
+
+def read_price_series(path, column=1):
+    """Значения одного CSV формата prices.csv (заголовок, затем Date,Price) в порядке строк файла."""
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        next(reader)  # скип заголовок
+        return np.array([float(row[column]) for row in reader if row])
+
+
+def load_series_directory(directory, pattern=".csv", column=1):
+    """Ряды из всех CSV каталога: (имена, список массивов). Длины рядов могут различаться."""
+    names = sorted(name for name in os.listdir(directory) if name.endswith(pattern))
+    return ([os.path.splitext(name)[0] for name in names],
+            [read_price_series(os.path.join(directory, name), column) for name in names])
+
+
+class BatchFitSummary:
+    """
+    Сводка пакетной подгонки: для каждого ряда и модели — R² и коэффициенты
+    (многочлен — при x^0..x^d, power и log — (a, b)). Подобранные кривые не хранятся,
+    их можно пересчитать через predict() модели.
+    """
+
+    def __init__(self, names, model_names, r2, coefficients, lengths):
+        self.names = list(names)
+        self.model_names = list(model_names)
+        self.r2 = r2                        # (n_series, n_models)
+        self.coefficients = coefficients    # (n_series, n_models, max_degree + 1), NaN в неиспользуемых
+        self.lengths = lengths
+
+    def __len__(self):
+        return len(self.names)
+
+    def best_models(self):
+        scores = np.where(np.isnan(self.r2), -np.inf, self.r2)
+        return [self.model_names[i] for i in np.argmax(scores, axis=1)]
+
+    def to_records(self):
+        records = []
+        for i, name in enumerate(self.names):
+            for j, model in enumerate(self.model_names):
+                coefficients = self.coefficients[i, j]
+                records.append({"series": name, "model": model, "r2": float(self.r2[i, j]),
+                                "coefficients": coefficients[~np.isnan(coefficients)].tolist()})
+        return records
+
+    def write_csv(self, path, precision=6):
+        """Одна строка на ряд: длина, лучшая модель, R² каждой модели и её коэффициенты."""
+        width = self.coefficients.shape[-1]
+        header = ["series", "length", "best"] + [f"r2_{model}" for model in self.model_names]
+        header += [f"{model}_c{k}" for model in self.model_names for k in range(width)]
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for i, (name, best) in enumerate(zip(self.names, self.best_models())):
+                row = [name, int(self.lengths[i]), best]
+                row += [f"{value:.{precision}g}" for value in self.r2[i]]
+                row += ["" if np.isnan(value) else f"{value:.{precision}g}" for value in self.coefficients[i].ravel()]
+                writer.writerow(row)
+
+    def __str__(self):
+        lines = [f"{'Ряд':<20} {'Лучшая':<8} " + " ".join(f"{model:>8}" for model in self.model_names)]
+        for name, best, r2 in zip(self.names, self.best_models(), self.r2):
+            lines.append(f"{name:<20} {best:<8} " + " ".join(f"{value:8.4f}" for value in r2))
+        return "\n".join(lines)
+
+
+def fit_series_batch(series, names=None, degrees=(1, 2, 3, 4, 5, 6), log_shift=1.0, plot=False, plot_limit=6):
+    """
+    Подгоняет все модели CurveFitter к набору рядов на сетке x = 0..n-1.
+
+    :param series: массив (n_series, n_time) или список одномерных рядов разной длины;
+                   ряды одной длины обрабатываются одним матричным проходом с общим разложением.
+                   Одномерный массив — это один ряд
+    :param names: имена рядов (по умолчанию номера)
+    :param plot: построить графики лучших моделей для первых plot_limit рядов
+    :return: BatchFitSummary
+    """
+    if isinstance(series, np.ndarray) and series.ndim == 1:
+        series = series[np.newaxis]
+    if isinstance(series, np.ndarray) and series.ndim == 2:
+        groups = {series.shape[1]: (np.arange(len(series)), series)}
+        count = len(series)
+    else:
+        series = [np.asarray(values, dtype=float) for values in series]
+        count = len(series)
+        lengths = np.array([len(values) for values in series])
+        groups = {length: (np.flatnonzero(lengths == length), None) for length in np.unique(lengths)}
+        groups = {length: (rows, np.vstack([series[i] for i in rows])) for length, (rows, _) in groups.items()}
+    names = [str(i) for i in range(count)] if names is None else list(names)
+    if len(names) != count:
+        raise ValueError("Число имён не совпадает с числом рядов")
+
+    degrees = sorted(set(degrees))
+    model_names = [CurveFitter.polynomial_name(degree) for degree in degrees] + ["log", "power"]
+    width = max(degrees[-1] + 1, 2)
+    r2 = np.full((count, len(model_names)), np.nan)
+    coefficients = np.full((count, len(model_names), width), np.nan)
+    row_lengths = np.zeros(count, dtype=int)
+    fitters = {}
+    for length, (rows, values) in groups.items():
+        fitter = CurveFitter(np.arange(length), degrees, log_shift)
+        fitters[length] = fitter
+        result = fitter.fit(values)
+        for j, model in enumerate(result):
+            r2[rows, j] = model.r2
+            coefficients[rows, j, :model.coefficients.shape[-1]] = model.coefficients
+        row_lengths[rows] = length
+
+    summary = BatchFitSummary(names, model_names, r2, coefficients, row_lengths)
+    if plot:
+        _plot_best(summary, series, fitters, plot_limit)
+    return summary
+
+
+def _plot_best(summary, series, fitters, limit):
+    import matplotlib.pyplot as plt
+
+    shown = min(limit, len(summary))
+    if shown == 0:
+        return
+    fig, axs = plt.subplots(shown, 1, figsize=(10, 3 * shown), squeeze=False)
+    for i, best in enumerate(summary.best_models()[:shown]):
+        values = np.asarray(series[i], dtype=float)
+        x = np.arange(len(values))
+        model = fitters[len(values)].fit(values)[best]
+        axs[i, 0].scatter(x, values, color='blue', label='Data')
+        axs[i, 0].plot(x, model.fitted, color='red', label=f'{best}: R^2={model.r2:.4f}')
+        axs[i, 0].set_title(summary.names[i])
+        axs[i, 0].legend()
+    plt.tight_layout()
+    plt.show()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная подгонка трендов для набора ценовых рядов")
+    parser.add_argument("source", help="каталог с CSV (Date,Price), CSV-файл или .npy массив (ряды × время)")
+    parser.add_argument("-o", "--output", default="fit_summary.csv", help="файл сводки")
+    parser.add_argument("--max-degree", type=int, default=6)
+    parser.add_argument("--plot", action="store_true", help="показать графики лучших моделей")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        names, series = load_series_directory(args.source)
+    elif args.source.endswith(".npy"):
+        series = np.load(args.source, mmap_mode="r")
+        names = None
+    else:
+        names, series = [os.path.splitext(os.path.basename(args.source))[0]], [read_price_series(args.source)]
+
+    summary = fit_series_batch(series, names, degrees=range(1, args.max_degree + 1), plot=args.plot)
+    summary.write_csv(args.output)
+    print(summary if len(summary) <= 20 else f"Рядов: {len(summary)}")
+    print(f"Сводка записана в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from math import comb
+
+import numpy as np
+from scipy.linalg import solve_triangular
+from scipy.optimize import curve_fit
+
+
+def r2_scores(y, prediction):
+    """R² по последней оси (для пакета рядов — по ряду на строку); NaN для постоянного ряда."""
+    residual = np.sum((y - prediction) ** 2, axis=-1)
+    total = np.sum((y - y.mean(axis=-1, keepdims=True)) ** 2, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, 1 - residual / np.where(total > 0, total, 1), np.nan)
+
+
+class PolynomialBasis:
+    """
+    QR-разложение матрицы Вандермонда степени max_degree на отмасштабированной сетке
+    t = (x - shift) / scale. Столбцы Q вложены: первые d + 1 из них — ортонормированный базис
+    многочленов степени d, поэтому одно разложение обслуживает все степени сразу.
+    """
+
+    def __init__(self, x, max_degree):
+        self.x = np.asarray(x, dtype=float)
+        if self.x.ndim != 1:
+            raise ValueError("Сетка x должна быть одномерной")
+        if len(self.x) <= max_degree:
+            raise ValueError(f"Для степени {max_degree} нужно больше {max_degree} точек, передано {len(self.x)}")
+        self.max_degree = max_degree
+        self.shift = self.x.mean()
+        self.scale = np.ptp(self.x) / 2 or 1.0
+        self.q, self.r = np.linalg.qr(np.vander(self._scaled(self.x), max_degree + 1, increasing=True))
+        # t^k = Σ_j C(k, j)·x^j·(-shift)^(k-j) / scale^k — переход к коэффициентам при степенях x
+        self._to_raw = np.array([[comb(k, j) * (-self.shift) ** (k - j) / self.scale ** k if j <= k else 0.0
+                                  for j in range(max_degree + 1)] for k in range(max_degree + 1)])
+
+    def _scaled(self, x):
+        return (np.asarray(x, dtype=float) - self.shift) / self.scale
+
+    def project(self, y):
+        """Проекции рядов на базис: (..., n) -> (..., max_degree + 1)."""
+        return y @ self.q
+
+    def fitted(self, projection, degree):
+        return projection[..., :degree + 1] @ self.q[:, :degree + 1].T
+
+    def scaled_coefficients(self, projection, degree):
+        """Коэффициенты по степеням t (устойчивы для вычисления прогноза)."""
+        columns = projection[..., :degree + 1].reshape(-1, degree + 1).T
+        solution = solve_triangular(self.r[:degree + 1, :degree + 1], columns)
+        return solution.T.reshape(projection.shape[:-1] + (degree + 1,))
+
+    def raw_coefficients(self, scaled, degree):
+        """Коэффициенты при x^0..x^degree."""
+        return scaled @ self._to_raw[:degree + 1, :degree + 1]
+
+    def evaluate(self, scaled, x):
+        return scaled @ np.vander(self._scaled(x), scaled.shape[-1], increasing=True).T
+
+
+class FittedModel:
+    """
+    Подобранная модель: kind — 'polynomial', 'power' (y = a·x^b) или 'log' (y = a·ln(x) + b).
+    coefficients — для многочлена коэффициенты при x^0..x^d, для power и log — (a, b);
+    для пакета рядов все массивы получают ведущую ось серий.
+    """
+
+    def __init__(self, name, kind, coefficients, fitted, r2, predictor):
+        self.name = name
+        self.kind = kind
+        self.coefficients = coefficients
+        self.fitted = fitted
+        self.r2 = r2
+        self._predictor = predictor
+
+    @property
+    def degree(self):
+        return self.coefficients.shape[-1] - 1 if self.kind == "polynomial" else None
+
+    def predict(self, x):
+        return self._predictor(np.asarray(x, dtype=float))
+
+    def equation(self, precision=2):
+        if self.kind == "power":
+            a, b = self.coefficients
+            return f"y = {a:.{precision}f}x^{b:.{precision}f}"
+        if self.kind == "log":
+            a, b = self.coefficients
+            return f"y = {a:.{precision}f}ln(x) + {b:.{precision}f}".replace("+ -", "- ")
+        terms = []
+        for i, coefficient in enumerate(self.coefficients):
+            if abs(coefficient) > 1e-6:
+                power = "" if i == 0 else "x" if i == 1 else f"x^{i}"
+                terms.append(f"{coefficient:.{precision}f}{power}")
+        return "y = " + (" + ".join(terms).replace("+ -", "- ") or "0")
+
+
+class FitResult:
+    """Все модели одного прохода в порядке добавления; best() — модель с наибольшим R²."""
+
+    def __init__(self, models):
+        self.models = {model.name: model for model in models}
+
+    def __getitem__(self, name):
+        return self.models[name]
+
+    def __iter__(self):
+        return iter(self.models.values())
+
+    def __len__(self):
+        return len(self.models)
+
+    def r2_table(self):
+        return {name: model.r2 for name, model in self.models.items()}
+
+    def best(self):
+        return max(self.models.values(), key=lambda model: np.nan_to_num(model.r2, nan=-np.inf))
+
+
+class CurveFitter:
+    """
+    Замкнутый МНК для линейной, полиномиальных, степенной и логарифмической моделей на общей сетке x.
+
+    Разложения строятся один раз в конструкторе, fit() для каждого ряда сводится к нескольким
+    умножениям матриц. Логарифмическая модель линейна по параметрам и решается точно; степенная
+    линеаризуется как ln y = ln a + b·ln x (минимизируется ошибка в логарифмах, а не в y, как
+    у curve_fit), а для рядов с y <= 0, где логарифм не определён, подбирается curve_fit.
+    Для степенной и логарифмической моделей используется x + log_shift (x = 0 допустим при сдвиге 1).
+
+    :param x: сетка (n,)
+    :param degrees: степени многочленов; степень 1 даёт модель 'linear'
+    :param log_shift: сдвиг аргумента для ln x
+    """
+
+    def __init__(self, x, degrees=(1, 2, 3, 4, 5, 6), log_shift=1.0):
+        self.x = np.asarray(x, dtype=float)
+        self.degrees = sorted(set(degrees))
+        if not self.degrees or self.degrees[0] < 1:
+            raise ValueError("Степени многочленов должны быть натуральными")
+        self.basis = PolynomialBasis(self.x, self.degrees[-1])
+        self.log_shift = log_shift
+        shifted = self.x + log_shift
+        if np.any(shifted <= 0):
+            raise ValueError("Для степенной и логарифмической моделей нужно x + log_shift > 0")
+        self.log_x = np.log(shifted)
+        self.log_basis = PolynomialBasis(self.log_x, 1)
+
+    @staticmethod
+    def polynomial_name(degree):
+        return "linear" if degree == 1 else f"poly{degree}"
+
+    def fit(self, y):
+        """
+        :param y: значения ряда (n,) или пакет рядов (n_series, n)
+        :return: FitResult со всеми моделями
+        """
+        y = np.asarray(y, dtype=float)
+        if y.shape[-1] != len(self.x):
+            raise ValueError(f"Длина ряда {y.shape[-1]} не совпадает с сеткой ({len(self.x)})")
+        models = []
+
+        projection = self.basis.project(y)
+        for degree in self.degrees:
+            fitted = self.basis.fitted(projection, degree)
+            scaled = self.basis.scaled_coefficients(projection, degree)
+            models.append(FittedModel(self.polynomial_name(degree), "polynomial",
+                                      self.basis.raw_coefficients(scaled, degree), fitted, r2_scores(y, fitted),
+                                      lambda x, scaled=scaled: self.basis.evaluate(scaled, x)))
+
+        # y = a·ln(x) + b: линейная модель по ln x
+        log_scaled = self.log_basis.scaled_coefficients(self.log_basis.project(y), 1)
+        log_coefficients = self.log_basis.raw_coefficients(log_scaled, 1)[..., ::-1]
+        log_fitted = log_coefficients[..., :1] * self.log_x + log_coefficients[..., 1:]
+        models.append(FittedModel("log", "log", log_coefficients, log_fitted, r2_scores(y, log_fitted),
+                                  lambda x, c=log_coefficients: self._log(x, c)))
+
+        power_coefficients = self._fit_power(y)
+        power_fitted = self._power(self.x, power_coefficients)
+        models.append(FittedModel("power", "power", power_coefficients, power_fitted, r2_scores(y, power_fitted),
+                                  lambda x, c=power_coefficients: self._power(x, c)))
+        return FitResult(models)
+
+    def _log(self, x, coefficients):
+        log_x = np.log(np.asarray(x, dtype=float) + self.log_shift)
+        return coefficients[..., :1] * log_x + coefficients[..., 1:] if coefficients.ndim > 1 \
+            else coefficients[0] * log_x + coefficients[1]
+
+    def _power(self, x, coefficients):
+        shifted = np.asarray(x, dtype=float) + self.log_shift
+        if coefficients.ndim > 1:
+            return coefficients[:, :1] * shifted ** coefficients[:, 1:]
+        return coefficients[0] * shifted ** coefficients[1]
+
+    def _fit_power(self, y):
+        rows = np.atleast_2d(y)
+        coefficients = np.full((len(rows), 2), np.nan)
+        positive = np.all(rows > 0, axis=1)
+        if np.any(positive):
+            log_y = np.log(rows[positive])
+            scaled = self.log_basis.scaled_coefficients(self.log_basis.project(log_y), 1)
+            intercept, slope = self.log_basis.raw_coefficients(scaled, 1).T
+            coefficients[positive] = np.column_stack((np.exp(intercept), slope))
+        shifted = self.x + self.log_shift
+        for i in np.flatnonzero(~positive):
+            try:
+                coefficients[i], _ = curve_fit(lambda x, a, b: a * x ** b, shifted, rows[i], maxfev=10000)
+            except RuntimeError:
+                pass
+        return coefficients if y.ndim > 1 else coefficients[0]
@@ -0,0 +1,245 @@
+import csv
+import json
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+
+MAXIMIZE = "maximize"
+MINIMIZE = "minimize"
+
+_CONSTRAINT_TYPES = ("<=", ">=", "=")
+
+
+class LinearModel:
+    """
+    Задача ЛП в матричном виде:
+
+        sense  c @ x
+        A_ub @ x <= b_ub,  A_eq @ x == b_eq,  lower <= x <= upper
+
+    Ограничения вида >= хранятся в A_ub с обратным знаком (ub_signs = -1), имена строк
+    сохраняются в исходном порядке (ub_names / eq_names) для отчётов и анализа чувствительности.
+    """
+
+    def __init__(self, variables, objective, A_ub, b_ub, A_eq, b_eq, sense=MAXIMIZE,
+                 integer=None, lower=None, upper=None, ub_names=None, eq_names=None,
+                 ub_signs=None, build_time=0.0):
+        self.variables = list(variables)
+        self.objective = np.asarray(objective, dtype=float)
+        self.A_ub = A_ub
+        self.b_ub = np.asarray(b_ub, dtype=float)
+        self.A_eq = A_eq
+        self.b_eq = np.asarray(b_eq, dtype=float)
+        self.sense = sense
+        n = len(self.variables)
+        self.integer = np.zeros(n, dtype=bool) if integer is None else np.asarray(integer, dtype=bool)
+        self.lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+        self.upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+        self.ub_names = list(ub_names or [])
+        self.eq_names = list(eq_names or [])
+        # +1 для строк "<=", -1 для строк ">=", перевёрнутых при сборке
+        self.ub_signs = np.ones(len(self.b_ub)) if ub_signs is None else np.asarray(ub_signs, dtype=float)
+        self.build_time = build_time
+
+    @property
+    def is_integer(self):
+        return bool(self.integer.any())
+
+    def copy(self, **changes):
+        """Копия модели с заменой отдельных полей (матрицы переиспользуются, не копируются)."""
+        fields = dict(variables=self.variables, objective=self.objective, A_ub=self.A_ub, b_ub=self.b_ub,
+                      A_eq=self.A_eq, b_eq=self.b_eq, sense=self.sense, integer=self.integer,
+                      lower=self.lower, upper=self.upper, ub_names=self.ub_names, eq_names=self.eq_names,
+                      ub_signs=self.ub_signs, build_time=self.build_time)
+        fields.update(changes)
+        return LinearModel(**fields)
+
+
+class LinearSolution:
+    """Результат решения: статус, значения переменных, целевая функция, направление оптимизации и время этапов."""
+
+    def __init__(self, success, status, message, values, objective, build_time, solve_time, sense=MAXIMIZE):
+        self.success = success
+        self.status = status
+        self.message = message
+        self.values = values
+        self.objective = objective
+        self.build_time = build_time
+        self.solve_time = solve_time
+        self.sense = sense
+
+    def report(self):
+        result = f"Status: {self.status}\nOptimal production:\n"
+        result += "\n".join(f"{name}: {value}" for name, value in self.values.items())
+        label = "Maximum" if self.sense == MAXIMIZE else "Minimum"
+        result += f"\n{label} cost: {self.objective}" if self.objective is not None else ""
+        result += f"\nBuild time: {self.build_time * 1000:.3f} ms, solve time: {self.solve_time * 1000:.3f} ms"
+        return result
+
+
+class SparseModelBuilder:
+    """
+    Накопление коэффициентов в виде троек (строка, столбец, значение) с последующей
+    сборкой разреженных матриц одним вызовом — без построения выражений PuLP.
+    """
+
+    def __init__(self, variables, sense=MAXIMIZE):
+        if sense not in (MAXIMIZE, MINIMIZE):
+            raise ValueError(f"Неизвестное направление оптимизации: {sense}")
+        self.variables = list(variables)
+        self.index = {name: i for i, name in enumerate(self.variables)}
+        if len(self.index) != len(self.variables):
+            raise ValueError("Имена переменных должны быть уникальными")
+        self.sense = sense
+        self.objective = np.zeros(len(self.variables))
+        self.integer = np.zeros(len(self.variables), dtype=bool)
+        self.lower = np.zeros(len(self.variables))
+        self.upper = np.full(len(self.variables), np.inf)
+        self._rows = {"<=": [], "=": []}
+        self._triplets = {"<=": ([], [], []), "=": ([], [], [])}
+        self._rhs = {"<=": [], "=": []}
+        self._signs = []
+
+    def column(self, name):
+        try:
+            return self.index[name]
+        except KeyError:
+            raise ValueError(f"Неизвестная переменная: {name}")
+
+    def set_objective(self, coefficients):
+        for name, coefficient in coefficients.items():
+            self.objective[self.column(name)] = coefficient
+
+    def add_constraint(self, name, coefficients, bound, kind="<="):
+        if kind not in _CONSTRAINT_TYPES:
+            raise ValueError(f"Неизвестный тип ограничения '{kind}' у {name}")
+        sign = -1.0 if kind == ">=" else 1.0
+        target = "=" if kind == "=" else "<="
+        rows, columns, values = self._triplets[target]
+        row = len(self._rhs[target])
+        for variable, coefficient in coefficients.items():
+            rows.append(row)
+            columns.append(self.column(variable))
+            values.append(sign * coefficient)
+        self._rhs[target].append(sign * bound)
+        self._rows[target].append(name)
+        if target == "<=":
+            self._signs.append(sign)
+
+    def build(self, build_time=0.0):
+        matrices = {}
+        for target, (rows, columns, values) in self._triplets.items():
+            shape = (len(self._rhs[target]), len(self.variables))
+            matrices[target] = sparse.csr_matrix((values, (rows, columns)), shape=shape)
+        return LinearModel(self.variables, self.objective, matrices["<="], self._rhs["<="],
+                           matrices["="], self._rhs["="], self.sense, self.integer, self.lower, self.upper,
+                           self._rows["<="], self._rows["="], self._signs, build_time)
+
+
+def load_json_model(path_or_data):
+    """
+    Читает модель формата model_data.json:
+
+        {"variables": [...], "objective": {...},
+         "constraints": {"name": {"variables": {...}, "bound": b, "type": "<="}},
+         "sense": "maximize", "integer": true | [...], "bounds": {"x1": [0, 10]}}
+
+    Поля sense, integer, bounds и type необязательны (по умолчанию maximize, целочисленные
+    переменные, как в исходной модели PuLP, x >= 0 и ограничения "<="). Непрерывная модель
+    задаётся явно: "integer": false.
+    """
+    started = time.perf_counter()
+    if isinstance(path_or_data, dict):
+        data = path_or_data
+    else:
+        with open(path_or_data, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+    builder = SparseModelBuilder(data["variables"], data.get("sense", MAXIMIZE))
+    builder.set_objective(data["objective"])
+    for name, constraint in data.get("constraints", {}).items():
+        builder.add_constraint(name, constraint["variables"], constraint["bound"], constraint.get("type", "<="))
+
+    integer = data.get("integer", True)
+    if isinstance(integer, bool):
+        builder.integer[:] = integer
+    else:
+        for name in integer:
+            builder.integer[builder.column(name)] = True
+    for name, (lower, upper) in data.get("bounds", {}).items():
+        column = builder.column(name)
+        builder.lower[column] = -np.inf if lower is None else lower
+        builder.upper[column] = np.inf if upper is None else upper
+
+    return builder.build(time.perf_counter() - started)
+
+
+def load_csv_model(path, sense=MAXIMIZE, integer=True):
+    """
+    Читает модель в «столбцовом» CSV из троек row,variable,value.
+    Строка с именем objective задаёт целевую функцию, переменная rhs — правую часть ограничения,
+    переменная type (значение <=, >= или =) — его тип. Переменные берутся в порядке появления.
+    """
+    started = time.perf_counter()
+    objective, constraints, variables = {}, {}, {}
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for record in csv.DictReader(file):
+            row, variable, value = record["row"].strip(), record["variable"].strip(), record["value"].strip()
+            if row == "objective":
+                variables.setdefault(variable, None)
+                objective[variable] = float(value)
+                continue
+            constraint = constraints.setdefault(row, {"variables": {}, "bound": 0.0, "type": "<="})
+            if variable == "rhs":
+                constraint["bound"] = float(value)
+            elif variable == "type":
+                constraint["type"] = value
+            else:
+                variables.setdefault(variable, None)
+                constraint["variables"][variable] = float(value)
+
+    builder = SparseModelBuilder(list(variables), sense)
+    builder.set_objective(objective)
+    for name, constraint in constraints.items():
+        builder.add_constraint(name, constraint["variables"], constraint["bound"], constraint["type"])
+    builder.integer[:] = integer
+    return builder.build(time.perf_counter() - started)
+
+
+def solve_model(model):
+    """
+    Решает модель через HiGHS: linprog для непрерывной задачи, milp — если есть целые переменные.
+    Время сборки модели (model.build_time) и решения возвращаются раздельно.
+    """
+    sign = -1.0 if model.sense == MAXIMIZE else 1.0
+    started = time.perf_counter()
+    if model.is_integer:
+        constraints = []
+        if model.A_ub.shape[0]:
+            constraints.append(LinearConstraint(model.A_ub, -np.inf, model.b_ub))
+        if model.A_eq.shape[0]:
+            constraints.append(LinearConstraint(model.A_eq, model.b_eq, model.b_eq))
+        result = milp(sign * model.objective, constraints=constraints, integrality=model.integer.astype(int),
+                      bounds=Bounds(model.lower, model.upper))
+    else:
+        result = linprog(sign * model.objective,
+                         A_ub=model.A_ub if model.A_ub.shape[0] else None,
+                         b_ub=model.b_ub if model.A_ub.shape[0] else None,
+                         A_eq=model.A_eq if model.A_eq.shape[0] else None,
+                         b_eq=model.b_eq if model.A_eq.shape[0] else None,
+                         bounds=np.column_stack((model.lower, model.upper)), method="highs")
+    solve_time = time.perf_counter() - started
+
+    if result.x is None:
+        values, objective = {}, None
+    else:
+        # HiGHS возвращает целые переменные с погрешностью допуска (в т.ч. -0.0)
+        x = np.where(model.integer, np.round(result.x), result.x) + 0.0
+        values = dict(zip(model.variables, x.tolist()))
+        objective = sign * result.fun
+    status = "Optimal" if result.success else "Not Solved"
+    return LinearSolution(result.success, status, result.message, values, objective,
+                          model.build_time, solve_time, model.sense)
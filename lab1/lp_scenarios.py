@@ -0,0 +1,297 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from scipy.optimize import linprog
+
+from lp_model import MAXIMIZE, load_json_model, solve_model
+
+
+class Scenario:
+    """
+    Вариант базовой модели: новые правые части ограничений (rhs: {имя ограничения: значение})
+    и/или новые коэффициенты целевой функции (objective: {переменная: значение}).
+    Неуказанные значения берутся из базовой модели.
+    """
+
+    def __init__(self, name, rhs=None, objective=None):
+        self.name = name
+        self.rhs = dict(rhs or {})
+        self.objective = dict(objective or {})
+
+
+class ScenarioResult:
+    """
+    Решение одного сценария с данными чувствительности:
+    shadow_prices — теневые цены ограничений (прирост целевой функции на единицу ресурса),
+    reduced_costs — приведённые оценки переменных, warm_started — решение получено из базиса
+    базовой задачи без вызова решателя.
+    """
+
+    def __init__(self, name, status, objective, values, shadow_prices, reduced_costs,
+                 warm_started=False, solve_time=0.0, message=""):
+        self.name = name
+        self.status = status
+        self.objective = objective
+        self.values = values
+        self.shadow_prices = shadow_prices
+        self.reduced_costs = reduced_costs
+        self.warm_started = warm_started
+        self.solve_time = solve_time
+        self.message = message
+
+    def to_record(self):
+        record = {"scenario": self.name, "status": self.status, "objective": self.objective,
+                  "warm_started": self.warm_started, "solve_time": self.solve_time}
+        record.update({name: value for name, value in self.values.items()})
+        record.update({f"shadow[{name}]": value for name, value in self.shadow_prices.items()})
+        record.update({f"reduced[{name}]": value for name, value in self.reduced_costs.items()})
+        return record
+
+
+class ScenarioTable:
+    def __init__(self, results):
+        self.results = results
+
+    def to_records(self):
+        return [result.to_record() for result in self.results]
+
+    def warm_started_count(self):
+        return sum(result.warm_started for result in self.results)
+
+    def total_solve_time(self):
+        return sum(result.solve_time for result in self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __str__(self):
+        if not self.results:
+            return ""
+        first = next((result for result in self.results if result.values), self.results[0])
+        variables = list(first.values)
+        rows = list(first.shadow_prices)
+        header = f"{'Сценарий':<16} {'Статус':<11} {'Цель':>12} " + " ".join(f"{name:>9}" for name in variables)
+        header += " " + " ".join(f"{'y[' + name + ']':>14}" for name in rows) + f" {'warm':>5}"
+        lines = [header]
+        for result in self.results:
+            objective = f"{result.objective:12.6g}" if result.objective is not None else f"{'-':>12}"
+            values = " ".join(f"{result.values.get(name, float('nan')):9.4g}" for name in variables)
+            prices = " ".join(f"{result.shadow_prices.get(name, float('nan')):14.6g}" for name in rows)
+            lines.append(f"{result.name:<16} {result.status:<11} {objective} {values} {prices} "
+                         f"{'+' if result.warm_started else '':>5}")
+        return "\n".join(lines)
+
+
+def apply_scenario(model, scenario):
+    """Модель сценария: матрицы ограничений общие с базовой, копируются только векторы."""
+    changes = {}
+    if scenario.rhs:
+        b_ub, b_eq = model.b_ub.copy(), model.b_eq.copy()
+        ub_rows = {name: i for i, name in enumerate(model.ub_names)}
+        eq_rows = {name: i for i, name in enumerate(model.eq_names)}
+        for name, bound in scenario.rhs.items():
+            if name in ub_rows:
+                row = ub_rows[name]
+                b_ub[row] = model.ub_signs[row] * bound
+            elif name in eq_rows:
+                b_eq[eq_rows[name]] = bound
+            else:
+                raise ValueError(f"Неизвестное ограничение: {name}")
+        changes.update(b_ub=b_ub, b_eq=b_eq)
+    if scenario.objective:
+        objective = model.objective.copy()
+        columns = {name: i for i, name in enumerate(model.variables)}
+        for name, coefficient in scenario.objective.items():
+            if name not in columns:
+                raise ValueError(f"Неизвестная переменная: {name}")
+            objective[columns[name]] = coefficient
+        changes["objective"] = objective
+    return model.copy(**changes)
+
+
+def _sensitivity(model, ineq_marginals, eq_marginals, lower_marginals, upper_marginals):
+    # маргиналы HiGHS относятся к задаче минимизации с ограничениями в хранимом виде (>= перевёрнуты)
+    sign = -1.0 if model.sense == MAXIMIZE else 1.0
+    shadow_prices = dict(zip(model.ub_names, (sign * model.ub_signs * ineq_marginals + 0.0).tolist()))
+    shadow_prices.update(zip(model.eq_names, (sign * eq_marginals + 0.0).tolist()))
+    reduced_costs = dict(zip(model.variables, (sign * (lower_marginals + upper_marginals) + 0.0).tolist()))
+    return shadow_prices, reduced_costs
+
+
+def _linprog(model, objective, lower, upper):
+    has_ub, has_eq = model.A_ub.shape[0] > 0, model.A_eq.shape[0] > 0
+    return linprog(objective,
+                   A_ub=model.A_ub if has_ub else None, b_ub=model.b_ub if has_ub else None,
+                   A_eq=model.A_eq if has_eq else None, b_eq=model.b_eq if has_eq else None,
+                   bounds=np.column_stack((lower, upper)), method="highs")
+
+
+def solve_scenario(model, name="base"):
+    """
+    Решение с анализом чувствительности. Для целочисленной модели значения переменных берутся
+    из milp, а двойственные оценки — из её непрерывной релаксации (как pi/dj у PuLP с CBC).
+    """
+    started = time.perf_counter()
+    sign = -1.0 if model.sense == MAXIMIZE else 1.0
+    result = _linprog(model, sign * model.objective, model.lower, model.upper)
+    if not result.success:
+        return ScenarioResult(name, "Not Solved", None, {}, {}, {},
+                              solve_time=time.perf_counter() - started, message=result.message)
+    shadow_prices, reduced_costs = _sensitivity(
+        model,
+        result.ineqlin.marginals if model.A_ub.shape[0] else np.zeros(0),
+        result.eqlin.marginals if model.A_eq.shape[0] else np.zeros(0),
+        result.lower.marginals, result.upper.marginals)
+    values, message = dict(zip(model.variables, result.x.tolist())), result.message
+    if model.is_integer:
+        solution = solve_model(model)
+        if not solution.success:
+            return ScenarioResult(name, solution.status, None, {}, shadow_prices, reduced_costs,
+                                  solve_time=time.perf_counter() - started, message=str(solution.message))
+        values, message = solution.values, str(solution.message)
+    objective = float(model.objective @ np.array([values[variable] for variable in model.variables]))
+    return ScenarioResult(name, "Optimal", objective, values, shadow_prices, reduced_costs,
+                          solve_time=time.perf_counter() - started, message=message)
+
+
+class BasisWarmStart:
+    """
+    Повторное использование оптимального базиса непрерывной задачи.
+
+    linprog/milp в scipy не принимают стартовый базис, поэтому «тёплый старт» делается вручную:
+    активные ограничения и переменные на границах фиксируются, остальные переменные находятся из
+    квадратной системы B·x_B = b_B. Если при новой правой части x_B остаётся допустимым (а при
+    новой целевой функции — двойственные оценки сохраняют знак), базис оптимален и решатель не
+    вызывается; иначе сценарий решается заново. Вырожденный базис (неквадратная система)
+    тёплый старт не поддерживает.
+    """
+
+    def __init__(self, model, tolerance=1e-9):
+        self.available = False
+        if model.is_integer:
+            return
+        sign = -1.0 if model.sense == MAXIMIZE else 1.0
+        result = _linprog(model, sign * model.objective, model.lower, model.upper)
+        if not result.success:
+            return
+        x = result.x
+        self.tolerance = tolerance
+        scale = tolerance * (1 + np.abs(model.b_ub))
+        slack = model.b_ub - model.A_ub @ x
+        binding_ub = np.flatnonzero(np.abs(slack) <= scale)
+        self.at_lower = np.isclose(x, model.lower, rtol=0, atol=tolerance)
+        self.at_upper = np.isclose(x, model.upper, rtol=0, atol=tolerance) & ~self.at_lower
+        self.free = ~(self.at_lower | self.at_upper)
+        self.binding_ub = binding_ub
+        self.rows = np.concatenate((model.A_ub[binding_ub].toarray(), model.A_eq.toarray()))
+        basis = self.rows[:, self.free]
+        if basis.shape[0] != basis.shape[1] or np.linalg.matrix_rank(basis) < basis.shape[0]:
+            return
+        self.basis = basis
+        self.x = x
+        self.available = True
+
+    def _rhs(self, model):
+        return np.concatenate((model.b_ub[self.binding_ub], model.b_eq))
+
+    def try_solve(self, model, name):
+        """ScenarioResult из базиса или None, если базис для сценария не оптимален."""
+        if not self.available or model.is_integer:
+            return None
+        started = time.perf_counter()
+        tolerance = self.tolerance
+        sign = -1.0 if model.sense == MAXIMIZE else 1.0
+        x = np.where(self.at_upper, model.upper, np.where(self.at_lower, model.lower, 0.0))
+        fixed_part = self.rows[:, ~self.free] @ x[~self.free]
+        x[self.free] = np.linalg.solve(self.basis, self._rhs(model) - fixed_part)
+        if np.any(x < model.lower - tolerance) or np.any(x > model.upper + tolerance):
+            return None
+        if np.any(model.A_ub @ x > model.b_ub + tolerance * (1 + np.abs(model.b_ub))):
+            return None
+        if model.A_eq.shape[0] and np.any(np.abs(model.A_eq @ x - model.b_eq) > tolerance * (1 + np.abs(model.b_eq))):
+            return None
+
+        # двойственные оценки задачи минимизации: c + Aᵀ·μ = r, r = 0 на базисных переменных
+        cost = sign * model.objective
+        multipliers = np.linalg.solve(self.basis.T, -cost[self.free])
+        n_ub = len(self.binding_ub)
+        if np.any(multipliers[:n_ub] < -tolerance):
+            return None
+        reduced = cost + self.rows.T @ multipliers
+        if np.any(reduced[self.at_lower] < -tolerance) or np.any(reduced[self.at_upper] > tolerance):
+            return None
+
+        ineq_marginals = np.zeros(model.A_ub.shape[0])
+        ineq_marginals[self.binding_ub] = -multipliers[:n_ub]
+        reduced[self.free] = 0.0
+        shadow_prices, reduced_costs = _sensitivity(
+            model, ineq_marginals, -multipliers[n_ub:],
+            np.where(self.at_lower, reduced, 0.0), np.where(self.at_upper, reduced, 0.0))
+        return ScenarioResult(name, "Optimal", float(model.objective @ x), dict(zip(model.variables, x.tolist())),
+                              shadow_prices, reduced_costs, warm_started=True,
+                              solve_time=time.perf_counter() - started)
+
+
+def _run_scenario(model, warm_start, scenario):
+    scenario_model = apply_scenario(model, scenario)
+    result = warm_start.try_solve(scenario_model, scenario.name) if warm_start is not None else None
+    return result if result is not None else solve_scenario(scenario_model, scenario.name)
+
+
+class ScenarioBatch:
+    """
+    Пакетное решение сценариев одной модели в пуле процессов.
+    Базовая модель разбирается один раз; для непрерывной модели сценарии сначала пробуются
+    на базисе базовой задачи (BasisWarmStart) и решаются HiGHS только при смене базиса.
+    """
+
+    def __init__(self, model, max_workers=None, use_processes=True, warm_start=True):
+        self.model = model
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.warm_start = BasisWarmStart(model) if warm_start else None
+
+    def _create_executor(self):
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def solve(self, scenarios):
+        scenarios = list(scenarios)
+        if not scenarios:
+            return ScenarioTable([])
+        with self._create_executor() as executor:
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(scenarios) // (4 * workers))
+            results = executor.map(_run_scenario,
+                                   [self.model] * len(scenarios),
+                                   [self.warm_start] * len(scenarios),
+                                   scenarios,
+                                   chunksize=chunksize)
+            return ScenarioTable(list(results))
+
+
+def fabric_scenarios(model, factors=(0.8, 0.9, 1.0, 1.1, 1.2)):
+    """Сценарии наличия ткани: каждое ограничение-ресурс по очереди масштабируется на factor."""
+    scenarios = []
+    for row, name in enumerate(model.ub_names):
+        base = model.ub_signs[row] * model.b_ub[row]
+        for factor in factors:
+            scenarios.append(Scenario(f"{name}*{factor:g}", rhs={name: base * factor}))
+    return scenarios
+
+
+if __name__ == "__main__":
+    base = load_json_model("model_data.json")
+    for integer in (True, False):
+        model = base if integer else base.copy(integer=None)
+        table = ScenarioBatch(model).solve(fabric_scenarios(model))
+        print("Целочисленная модель" if integer else "Непрерывная модель")
+        print(table)
+        print(f"Из базиса: {table.warm_started_count()} из {len(table)}, "
+              f"время решения: {table.total_solve_time() * 1000:.3f} ms\n")
@@ -0,0 +1,50 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# модули, которые не должны загружаться до первого нажатия кнопки
+HEAVY_MODULES = ("numpy", "scipy", "matplotlib", "pulp", "sklearn")
+
+
+def measure_import(module="main", runs=5):
+    """
+    Запускает `python -X importtime -c "import <module>"` runs раз и разбирает отчёт.
+
+    :return: (минимальное суммарное время импорта в мс, множество загруженных модулей верхнего уровня)
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best, loaded = None, set()
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=directory, capture_output=True, text=True, check=True)
+        total = 0
+        for line in completed.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not name.startswith("  "):
+                total += int(cumulative)
+            loaded.add(name.strip().split(".")[0])
+        best = total if best is None else min(best, total)
+    return best / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка времени запуска Task Manager (python -X importtime)")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="допустимое время импорта main, мс")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    elapsed, loaded = measure_import("main", args.runs)
+    heavy = sorted(loaded.intersection(HEAVY_MODULES))
+    print(f"Импорт main: {elapsed:.1f} ms (бюджет {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"Загружены при старте: {', '.join(heavy)}")
+    if heavy or elapsed > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
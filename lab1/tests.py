@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from scipy.optimize import curve_fit
+from batch_fitting import fit_series_batch
+from fitting import CurveFitter
+
+
+class TestFitSeriesBatch(unittest.TestCase):
+    def setUp(self):
+        x = np.arange(40)
+        self.series = 3.0 + 0.5 * x - 0.01 * x ** 2
+
+    def test_one_dimensional_array_is_one_series(self):
+        """
+        Одномерный массив — один ряд из 40 точек, а не 40 рядов длины 1.
+        """
+        summary = fit_series_batch(self.series, degrees=(1, 2))
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary.lengths.tolist(), [40])
+        self.assertEqual(summary.best_models(), [summary.model_names[1]])
+        np.testing.assert_allclose(summary.coefficients[0, 1], [3.0, 0.5, -0.01], atol=1e-9)
+
+    def test_one_dimensional_array_matches_list_of_one_series(self):
+        from_array = fit_series_batch(self.series, degrees=(1, 2))
+        from_list = fit_series_batch([self.series], degrees=(1, 2))
+        np.testing.assert_allclose(from_array.r2, from_list.r2)
+
+
+class TestCurveFitter(unittest.TestCase):
+    def setUp(self):
+        self.x = np.linspace(0, 10, 50)
+        self.fitter = CurveFitter(self.x)
+
+    def test_polynomials_match_polyfit(self):
+        """
+        Одно QR-разложение на все степени даёт те же коэффициенты и R², что np.polyfit для каждой степени.
+        """
+        y = np.sin(self.x) + 0.1 * self.x ** 2 + np.random.default_rng(0).normal(0, 0.1, len(self.x))
+        result = self.fitter.fit(y)
+        for degree in self.fitter.degrees:
+            with self.subTest(degree=degree):
+                model = result[CurveFitter.polynomial_name(degree)]
+                expected = np.polyfit(self.x, y, degree)
+                self.assertEqual(model.degree, degree)
+                np.testing.assert_allclose(model.coefficients, expected[::-1], rtol=1e-7, atol=1e-10)
+                np.testing.assert_allclose(model.fitted, np.polyval(expected, self.x), rtol=1e-10, atol=1e-10)
+                np.testing.assert_allclose(model.predict([12.5]), np.polyval(expected, [12.5]), rtol=1e-9)
+
+    def test_log_fit_is_exact(self):
+        y = 2.5 * np.log(self.x + 1) - 1.2
+        model = self.fitter.fit(y)["log"]
+        np.testing.assert_allclose(model.coefficients, [2.5, -1.2], rtol=1e-12)
+        self.assertAlmostEqual(model.r2, 1.0, places=12)
+        self.assertEqual(self.fitter.fit(y).best().name, "log")
+
+    def test_power_fit_falls_back_to_curve_fit(self):
+        """
+        Положительный ряд линеаризуется логарифмом, а ряд с y <= 0 подбирается curve_fit — и в пакете тоже.
+        """
+        positive = 3.0 * (self.x + 1) ** 0.7
+        shifted = positive - 3.0
+        self.assertEqual(shifted[0], 0)
+        expected, _ = curve_fit(lambda x, a, b: a * x ** b, self.x + 1, shifted, maxfev=10000)
+
+        np.testing.assert_allclose(self.fitter.fit(positive)["power"].coefficients, [3.0, 0.7], rtol=1e-12)
+        np.testing.assert_allclose(self.fitter.fit(shifted)["power"].coefficients, expected, rtol=1e-9)
+        batch = self.fitter.fit(np.vstack([positive, shifted]))["power"]
+        np.testing.assert_allclose(batch.coefficients, [[3.0, 0.7], expected], rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
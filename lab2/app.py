@@ -1,22 +1,138 @@
 import sys
 import numpy as np
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QWidget, QGridLayout, QMessageBox
+    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QTableView, QHeaderView, QWidget, QGridLayout, QMessageBox, QFileDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Signal
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas  
 from matplotlib.figure import Figure
 from solver import RealisticViscousFallSimulator  
 
 
+def decimate_minmax(x, y, buckets):
+    """
+    Прореживание ряда для отрисовки: в каждой из buckets корзин остаются точки минимума и максимума,
+    поэтому пики не теряются. Остаток от деления на корзины — ещё одна, неполная корзина.
+    Если точек и так не больше 2 * buckets, ряд возвращается как есть.
+    """
+    n = len(x)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, y
+    bucket_size = n // buckets
+    usable = bucket_size * buckets
+    grouped = y[:usable].reshape(buckets, bucket_size)
+    offsets = np.arange(buckets) * bucket_size
+    tail = y[usable:]
+    remainder = [usable + tail.argmin(), usable + tail.argmax()] if len(tail) else []
+    indices = np.unique(np.concatenate((
+        [0, n - 1], offsets + grouped.argmin(axis=1), offsets + grouped.argmax(axis=1), remainder
+    )).astype(int))
+    return x[indices], y[indices]
+
+
+class SimulationSignals(QObject):
+    """
+    Сигналы фоновой симуляции (QRunnable сам сигналы объявлять не может).
+    """
+    finished = Signal(int, object, object, object)
+    failed = Signal(int, str)
+
+
+class SimulationWorker(QRunnable):
+    """
+    Решение задачи в пуле потоков; результат возвращается в GUI-поток сигналом.
+    """
+
+    def __init__(self, run_id, params, viscosity):
+        super().__init__()
+        self.run_id = run_id
+        self.params = params
+        self.viscosity = viscosity
+        self.signals = SimulationSignals()
+
+    def run(self):
+        try:
+            simulator = RealisticViscousFallSimulator(**self.params)
+            time, velocity, height = simulator.solve(self.viscosity)
+        except Exception as e:
+            # любая ошибка уходит в GUI-поток: иначе окно так и осталось бы в состоянии «Simulating...»
+            message = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+            self.signals.failed.emit(self.run_id, message)
+            return
+        self.signals.finished.emit(self.run_id, time, velocity, height)
+
+
+class SimulationTableModel(QAbstractTableModel):
+    """
+    Модель таблицы поверх массивов NumPy: строки не копируются и форматируются
+    только при запросе представлением, то есть только для видимых ячеек.
+    """
+
+    HEADERS = ["Time (s)", "Velocity (m/s)", "Height (m)"]
+    FORMATS = ["{:.2f}", "{:.4f}", "{:.4f}"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = (np.empty(0), np.empty(0), np.empty(0))
+
+    def set_results(self, time, velocity, height):
+        """
+        Подменяет данные таблицы без копирования массивов.
+        """
+        self.beginResetModel()
+        self._columns = (time, velocity, height)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns[0])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        column = index.column()
+        return self.FORMATS[column].format(self._columns[column][index.row()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def export_csv(self, path, chunk_size=100_000):
+        """
+        Запись в CSV кусками по chunk_size строк, без промежуточной копии всей таблицы.
+        """
+        rows = self.rowCount()
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(",".join(self.HEADERS) + "\n")
+            for start in range(0, rows, chunk_size):
+                chunk = np.column_stack([column[start:start + chunk_size] for column in self._columns])
+                np.savetxt(file, chunk, delimiter=",", fmt="%.10g")
+
+    def export_npy(self, path, chunk_size=100_000):
+        """
+        Запись в .npy (массив rows × 3) через memmap: столбцы копируются в файл кусками.
+        """
+        rows = self.rowCount()
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(rows, len(self._columns)))
+        for start in range(0, rows, chunk_size):
+            for i, column in enumerate(self._columns):
+                output[start:start + chunk_size, i] = column[start:start + chunk_size]
+        output.flush()
+        del output
+
+
 class FallSimulatorApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Simulate Viscous Fall")
         self.setGeometry(100, 100, 1200, 800)
 
-        self.simulator = None 
+        self.thread_pool = QThreadPool.globalInstance()
+        self.run_id = 0
 
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -36,17 +152,52 @@ class FallSimulatorApp(QMainWindow):
         self.run_button.clicked.connect(self.run_simulation)
         left_layout.addWidget(self.run_button)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Time (s)", "Velocity (m/s)", "Height (m)"])
+        self.table_model = SimulationTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        # фиксированная высота строк: представлению не нужно измерять каждую строку
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         left_layout.addWidget(self.table)
 
+        export_layout = QHBoxLayout()
+        self.export_csv_button = QPushButton("Export CSV")
+        self.export_csv_button.clicked.connect(self.export_csv)
+        export_layout.addWidget(self.export_csv_button)
+        self.export_npy_button = QPushButton("Export NPY")
+        self.export_npy_button.clicked.connect(self.export_npy)
+        export_layout.addWidget(self.export_npy_button)
+        left_layout.addLayout(export_layout)
+
         right_layout = QVBoxLayout()
         main_layout.addLayout(right_layout, 3) 
 
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
         right_layout.addWidget(self.canvas)
+        self.create_plots()
+
+    def create_plots(self):
+        """
+        Оси и линии создаются один раз; при новых результатах меняются только данные линий.
+        """
+        ax1 = self.figure.add_subplot(211)
+        ax2 = self.figure.add_subplot(212)
+
+        self.velocity_line, = ax1.plot([], [], label="Velocity", color="blue")
+        ax1.set_title("Velocity vs Time")
+        ax1.set_xlabel("Time (s)")
+        ax1.set_ylabel("Velocity (m/s)")
+        ax1.legend()
+        ax1.grid()
+
+        self.height_line, = ax2.plot([], [], label="Height", color="green")
+        ax2.set_title("Height vs Time")
+        ax2.set_xlabel("Time (s)")
+        ax2.set_ylabel("Height (m)")
+        ax2.legend()
+        ax2.grid()
+
+        self.figure.subplots_adjust(hspace=0.4)
 
     def create_input_fields(self):
         """
@@ -77,19 +228,40 @@ class FallSimulatorApp(QMainWindow):
             g = self.get_input_value("Gravity (m/s²):")
             t_max = self.get_input_value("Max Time (s):")
             dt = self.get_input_value("Time Step (s):")
+        except ValueError as e:
+            self.show_error_message(str(e))
+            return
 
-            self.simulator = RealisticViscousFallSimulator(
-                radius, object_density, medium_density, g, t_max, dt
-            )
-
-            time, velocity, height = self.simulator.solve(viscosity)
-
-            self.update_plots(time, velocity, height)
+        # у каждого запуска свой номер: результаты устаревших запусков отбрасываются
+        self.run_id += 1
+        params = {
+            'radius': radius, 'object_density': object_density, 'medium_density': medium_density,
+            'g': g, 't_max': t_max, 'dt': dt
+        }
+        worker = SimulationWorker(self.run_id, params, viscosity)
+        worker.signals.finished.connect(self.on_simulation_finished)
+        worker.signals.failed.connect(self.on_simulation_failed)
+        self.statusBar().showMessage("Simulating...")
+        self.thread_pool.start(worker)
 
-            self.update_table(time, velocity, height)
+    def on_simulation_finished(self, run_id, time, velocity, height):
+        """
+        Приём результатов фоновой симуляции (GUI-поток).
+        """
+        if run_id != self.run_id:
+            return
+        self.update_plots(time, velocity, height)
+        self.update_table(time, velocity, height)
+        self.statusBar().showMessage(f"Done: {len(time)} points", 3000)
 
-        except ValueError as e:
-            self.show_error_message(str(e))
+    def on_simulation_failed(self, run_id, message):
+        """
+        Ошибка фоновой симуляции (GUI-поток).
+        """
+        if run_id != self.run_id:
+            return
+        self.statusBar().clearMessage()
+        self.show_error_message(message)
 
     def get_input_value(self, label):
         """
@@ -112,39 +284,49 @@ class FallSimulatorApp(QMainWindow):
 
     def update_plots(self, time, velocity, height):
         """
-        Обновление графиков.
+        Обновление графиков: данные прореживаются до ширины холста в пикселях.
         """
-        self.figure.clear()
-        ax1 = self.figure.add_subplot(211)
-        ax2 = self.figure.add_subplot(212)
+        buckets = max(self.canvas.width(), 1)
+        for line, values in ((self.velocity_line, velocity), (self.height_line, height)):
+            line.set_data(*decimate_minmax(time, values, buckets))
+            line.axes.relim()
+            line.axes.autoscale_view()
 
-        ax1.plot(time, velocity, label="Velocity", color="blue")
-        ax1.set_title("Velocity vs Time")
-        ax1.set_xlabel("Time (s)")
-        ax1.set_ylabel("Velocity (m/s)")
-        ax1.legend()
-        ax1.grid()
+        self.canvas.draw_idle()
 
-        ax2.plot(time, height, label="Height", color="green")
-        ax2.set_title("Height vs Time")
-        ax2.set_xlabel("Time (s)")
-        ax2.set_ylabel("Height (m)")
-        ax2.legend()
-        ax2.grid()
+    def update_table(self, time, velocity, height):
+        """
+        Обновление таблицы.
+        """
+        self.table_model.set_results(time, velocity, height)
 
-        self.figure.subplots_adjust(hspace=0.4)
+    def export_csv(self):
+        """
+        Экспорт результатов в CSV.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "simulation.csv", "CSV (*.csv)")
+        if path:
+            self.export_results(self.table_model.export_csv, path)
 
-        self.canvas.draw()
+    def export_npy(self):
+        """
+        Экспорт результатов в NPY.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Export NPY", "simulation.npy", "NumPy (*.npy)")
+        if path:
+            self.export_results(self.table_model.export_npy, path)
 
-    def update_table(self, time, velocity, height):
+    def export_results(self, exporter, path):
         """
-        Обновление таблицы.
+        Запускает экспорт и сообщает об ошибке записи.
         """
-        self.table.setRowCount(len(time))
-        for i in range(len(time)):
-            self.table.setItem(i, 0, QTableWidgetItem(f"{time[i]:.2f}"))
-            self.table.setItem(i, 1, QTableWidgetItem(f"{velocity[i]:.4f}"))
-            self.table.setItem(i, 2, QTableWidgetItem(f"{height[i]:.4f}"))
+        if self.table_model.rowCount() == 0:
+            self.show_error_message("Нет результатов для экспорта. Сначала запустите симуляцию.")
+            return
+        try:
+            exporter(path)
+        except OSError as e:
+            self.show_error_message(f"Не удалось сохранить файл: {e}")
 
 
 if __name__ == "__main__":
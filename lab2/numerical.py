@@ -0,0 +1,303 @@
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class DragModel(ABC):
+    """
+    Модель силы сопротивления среды для шара.
+
+    Все методы работают с массивами: по одному элементу на частицу.
+    uses_viscosity — зависит ли сила от вязкости (иначе вязкость не проверяется и может быть любой).
+    """
+
+    uses_viscosity: bool = True
+
+    @abstractmethod
+    def force(self, velocity: np.ndarray, radius: np.ndarray, viscosity: np.ndarray,
+              medium_density: np.ndarray) -> np.ndarray:
+        """
+        Сила сопротивления со знаком скорости; в уравнении движения она вычитается.
+
+        :param velocity: скорости частиц (м/с)
+        :param radius: радиусы шаров (м)
+        :param viscosity: вязкости среды (Па·с)
+        :param medium_density: плотности среды (кг/м³)
+        :return: модули сил со знаком скорости (Н)
+        """
+        pass
+
+
+class StokesDrag(DragModel):
+    """Линейное сопротивление Стокса: F = 6πηrv (малые числа Рейнольдса)."""
+
+    def force(self, velocity, radius, viscosity, medium_density):
+        return 6 * np.pi * viscosity * radius * velocity
+
+
+class QuadraticDrag(DragModel):
+    """
+    Линейное + квадратичное сопротивление: F = 6πηrv + ½ρ·C_d·πr²·v|v|.
+
+    :param drag_coefficient: коэффициент лобового сопротивления (для шара ≈ 0.47)
+    :param include_linear: учитывать ли стоксову составляющую
+    """
+
+    def __init__(self, drag_coefficient: float = 0.47, include_linear: bool = True) -> None:
+        if drag_coefficient < 0:
+            raise ValueError("Коэффициент сопротивления должен быть неотрицательным.")
+        self.drag_coefficient = drag_coefficient
+        self.include_linear = include_linear
+
+    @property
+    def uses_viscosity(self) -> bool:
+        return self.include_linear
+
+    def force(self, velocity, radius, viscosity, medium_density):
+        quadratic = 0.5 * medium_density * self.drag_coefficient * np.pi * radius**2 * velocity * np.abs(velocity)
+        if self.include_linear:
+            return quadratic + 6 * np.pi * viscosity * radius * velocity
+        return quadratic
+
+
+class ReynoldsDrag(DragModel):
+    """
+    Сопротивление с коэффициентом, зависящим от числа Рейнольдса (Шиллер–Науманн):
+    C_d = 24/Re · (1 + 0.15·Re^0.687) при Re < 1000 и C_d = 0.44 выше.
+    При Re → 0 переходит в закон Стокса.
+    """
+
+    def force(self, velocity, radius, viscosity, medium_density):
+        speed = np.abs(velocity)
+        reynolds = medium_density * speed * 2 * radius / viscosity
+        # 24/Re · ½ρπr²v|v| = 6πηrv, поэтому стоксову часть выписываем явно и избегаем деления на Re = 0
+        stokes = 6 * np.pi * viscosity * radius * velocity
+        correction = 1 + 0.15 * reynolds**0.687
+        newton = 0.5 * medium_density * 0.44 * np.pi * radius**2 * velocity * speed
+        return np.where(reynolds < 1000, stokes * correction, newton)
+
+
+class FallIntegrationResult:
+    """
+    Результат численного интегрирования для набора частиц.
+
+    time — сетка вывода (n_time,); velocity и height — массивы (n_particles, n_time);
+    impact_time и impact_velocity — момент и скорость удара о дно (NaN, если удара не было).
+    """
+
+    def __init__(self, time, velocity, height, impact_time, impact_velocity, steps, rejected_steps, rhs_evaluations):
+        self.time = time
+        self.velocity = velocity
+        self.height = height
+        self.impact_time = impact_time
+        self.impact_velocity = impact_velocity
+        self.steps = steps
+        self.rejected_steps = rejected_steps
+        self.rhs_evaluations = rhs_evaluations
+
+
+class FallIntegrator:
+    """
+    Адаптивный метод Дормана–Принса 5(4) для уравнений падения шара
+
+        dh/dt = v,  m·dv/dt = (ρ_obj − ρ_med)·V·g − F_drag(v),
+
+    где все частицы интегрируются одновременно, а шаг выбирается для каждой частицы отдельно.
+    Шаг задаёт только контроль ошибки; значения в точках сетки вывода внутри принятого шага
+    берутся из плотного вывода метода (интерполянт 4-го порядка по тем же стадиям, как в solve_ivp),
+    поэтому густая сетка вывода не дробит шаг.
+    Метод явный: при времени релаксации m/k много меньше шага вывода (очень вязкая среда
+    и лёгкий шар) задача жёсткая и шагов требуется много — там лучше аналитический solve.
+
+    :param drag: модель сопротивления
+    :param inertia: 'effective' — масса (ρ_obj − ρ_med)·V, как в аналитическом решении;
+                    'object' — масса шара ρ_obj·V;
+                    'added_mass' — ρ_obj·V + ½ρ_med·V (присоединённая масса)
+    :param rtol: относительная точность
+    :param atol: абсолютная точность
+    """
+
+    _a = [
+        [],
+        [1 / 5],
+        [3 / 40, 9 / 40],
+        [44 / 45, -56 / 15, 32 / 9],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+        [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+    ]
+    _b = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+    _error = _b - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+    # плотный вывод: y(t + θh) = y + h·Σ_s k_s·(_dense[s] @ (θ, θ², θ³, θ⁴))
+    _dense = np.array([
+        [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+        [0, 0, 0, 0],
+        [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+        [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+        [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+        [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+        [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+    ])
+
+    def __init__(self, drag: DragModel = None, inertia: str = 'effective',
+                 rtol: float = 1e-6, atol: float = 1e-9) -> None:
+        if inertia not in ('effective', 'object', 'added_mass'):
+            raise ValueError("inertia должен быть 'effective', 'object' или 'added_mass'.")
+        if rtol <= 0 or atol <= 0:
+            raise ValueError("Точности rtol и atol должны быть положительными.")
+        self.drag = drag if drag is not None else StokesDrag()
+        self.inertia = inertia
+        self.rtol = rtol
+        self.atol = atol
+
+    def _inertial_mass(self, volume, object_density, medium_density):
+        if self.inertia == 'effective':
+            mass = np.abs(object_density - medium_density) * volume
+            if np.any(mass == 0):
+                raise ValueError("Для inertia='effective' плотности шара и среды не должны совпадать.")
+            return mass
+        if self.inertia == 'object':
+            return object_density * volume
+        return (object_density + 0.5 * medium_density) * volume
+
+    def integrate(self, time: np.ndarray, radius, object_density, medium_density, viscosity,
+                  g: float = 9.81, drop_height: float = None) -> FallIntegrationResult:
+        """
+        Интегрирует движение всех частиц на сетке time.
+
+        :param time: возрастающая сетка вывода, начинается с момента старта (с)
+        :param radius, object_density, medium_density, viscosity: одномерные массивы параметров частиц
+        :param g: ускорение свободного падения (м/с²)
+        :param drop_height: высота падения до дна (м); None — без события удара
+        :return: FallIntegrationResult
+        """
+        radius, object_density, medium_density, viscosity = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(value, dtype=float))
+              for value in (radius, object_density, medium_density, viscosity)))
+        n = len(radius)
+        volume = (4 / 3) * np.pi * radius**3
+        gravity_force = (object_density - medium_density) * volume * g
+        mass = self._inertial_mass(volume, object_density, medium_density)
+        drag = self.drag
+
+        def rhs(state, lanes):
+            velocity = state[:, 1]
+            acceleration = (gravity_force[lanes] - drag.force(velocity, radius[lanes], viscosity[lanes],
+                                                              medium_density[lanes])) / mass[lanes]
+            return np.stack((velocity, acceleration), axis=1)
+
+        time = np.asarray(time, dtype=float)
+        t_end = time[-1]
+        state = np.zeros((n, 2))
+        t_lane = np.full(n, time[0])
+        output_step = (t_end - time[0]) / max(len(time) - 1, 1)
+        step = np.full(n, output_step / 10 if output_step > 0 else 1e-3)
+        active = np.ones(n, dtype=bool)
+        impact_time = np.full(n, np.nan)
+        impact_velocity = np.full(n, np.nan)
+        velocity_out = np.empty((n, len(time)))
+        height_out = np.empty((n, len(time)))
+        velocity_out[:, 0], height_out[:, 0] = state[:, 1], state[:, 0]
+        next_output = np.ones(n, dtype=int)
+        # k7 принятого шага (FSAL) — это k1 следующего
+        derivative = rhs(state, np.arange(n))
+        steps = rejected = 0
+        evaluations = n
+
+        while True:
+            lanes = np.flatnonzero(active & (t_lane < t_end))
+            if len(lanes) == 0:
+                break
+            remaining = t_end - t_lane[lanes]
+            h = np.minimum(step[lanes], remaining)
+            min_step = 1e-12 * np.maximum(1.0, np.abs(t_lane[lanes]))
+            h = np.maximum(h, np.minimum(min_step, remaining))
+
+            y = state[lanes]
+            stages = [derivative[lanes]]
+            for s in range(1, 7):
+                increment = sum(coefficient * stages[j] for j, coefficient in enumerate(self._a[s]) if coefficient)
+                stages.append(rhs(y + h[:, None] * increment, lanes))
+            evaluations += 6 * len(lanes)
+            # шестая строка _a совпадает с _b, поэтому седьмая стадия вычислена в новой точке
+            y_new = y + h[:, None] * sum(coefficient * stages[j] for j, coefficient in enumerate(self._b) if coefficient)
+            error = h[:, None] * sum(coefficient * stages[j] for j, coefficient in enumerate(self._error) if coefficient)
+
+            scale = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error_norm = np.sqrt(np.mean((error / scale)**2, axis=1))
+            accept = (error_norm <= 1) | (h <= min_step)
+            factor = np.clip(0.9 * np.where(error_norm > 0, error_norm, 1e-10)**-0.2, 0.2, 5.0)
+            step[lanes] = h * factor
+            steps += int(accept.sum())
+            rejected += int((~accept).sum())
+
+            accepted = lanes[accept]
+            h_accepted = h[accept]
+            y_old, y_next = y[accept], y_new[accept]
+            t_old = t_lane[accepted]
+            # последний шаг попадает в t_end точно, без ошибки округления t + h
+            t_lane[accepted] = np.where(h_accepted >= remaining[accept], t_end, t_old + h_accepted)
+            state[accepted] = y_next
+            derivative[accepted] = stages[6][accept]
+
+            self._fill_outputs(time, next_output, accepted, t_old, h_accepted, y_old,
+                               np.stack(stages)[:, accept], velocity_out, height_out)
+
+            if drop_height is not None:
+                hit = (y_old[:, 0] < drop_height) & (y_next[:, 0] >= drop_height)
+                if np.any(hit):
+                    theta = self._crossing(y_old[hit], y_next[hit], h_accepted[hit], drop_height)
+                    hit_lanes = accepted[hit]
+                    impact_time[hit_lanes] = t_old[hit] + h_accepted[hit] * theta
+                    impact_velocity[hit_lanes] = y_old[hit, 1] + theta * (y_next[hit, 1] - y_old[hit, 1])
+                    state[hit_lanes] = (drop_height, 0.0)
+                    active[hit_lanes] = False
+
+        # после удара шар покоится на дне
+        resting = time >= impact_time[:, None]
+        height_out[resting] = drop_height if drop_height is not None else 0.0
+        velocity_out[resting] = 0.0
+
+        return FallIntegrationResult(time, velocity_out, height_out,
+                                     impact_time, impact_velocity, steps, rejected, evaluations)
+
+    def _fill_outputs(self, time, next_output, lanes, t_old, h, y_old, stages, velocity_out, height_out):
+        """
+        Записывает точки сетки вывода из (t_old, t_old + h] каждого принятого шага по плотному выводу.
+
+        :param stages: стадии принятых шагов (7, число шагов, 2)
+        """
+        stop = np.searchsorted(time, t_old + h, side="right")
+        stop = np.where(t_old + h >= time[-1], len(time), stop)
+        counts = np.maximum(stop - next_output[lanes], 0)
+        total = int(counts.sum())
+        if total == 0:
+            return
+        owner = np.repeat(np.arange(len(lanes)), counts)
+        index = next_output[lanes][owner] + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        theta = (time[index] - t_old[owner]) / h[owner]
+        powers = np.stack((theta, theta**2, theta**3, theta**4), axis=1)
+        # коэффициенты многочлена по θ для каждого шага: (число шагов, 2, 4)
+        polynomial = np.einsum('smd,sp->mdp', stages, self._dense)
+        values = y_old[owner] + h[owner, None] * np.einsum('kdp,kp->kd', polynomial[owner], powers)
+        height_out[lanes[owner], index] = values[:, 0]
+        velocity_out[lanes[owner], index] = values[:, 1]
+        next_output[lanes] += counts
+
+    @staticmethod
+    def _crossing(y_old, y_new, h, level, iterations: int = 40):
+        """Доля шага θ ∈ (0, 1], на которой кубический эрмитов сплайн высоты достигает level."""
+        h0, h1 = y_old[:, 0], y_new[:, 0]
+        d0, d1 = y_old[:, 1] * h, y_new[:, 1] * h
+
+        def hermite(theta):
+            t2, t3 = theta**2, theta**3
+            return ((2 * t3 - 3 * t2 + 1) * h0 + (t3 - 2 * t2 + theta) * d0
+                    + (-2 * t3 + 3 * t2) * h1 + (t3 - t2) * d1)
+
+        low, high = np.zeros(len(h)), np.ones(len(h))
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            below = hermite(middle) < level
+            low = np.where(below, middle, low)
+            high = np.where(below, high, middle)
+        return high
@@ -1,12 +1,130 @@
+import logging
+from time import perf_counter
 import numpy as np
 import matplotlib.pyplot as plt
 from typing import Tuple
 import numpy as np
+from numerical import DragModel, FallIntegrationResult, FallIntegrator, StokesDrag
+
+
+logger = logging.getLogger(__name__)
+
+
+class SolverTrace:
+    """
+    Сбор скалярной диагностики решателя (k, терминальная скорость, время счёта и т.п.).
+    
+    Массивы решений никогда не форматируются: в записи попадают только числа.
+    Каждая запись сохраняется в records и, если задан logger с уровнем DEBUG, пишется в лог.
+    """
+
+    def __init__(self, log: logging.Logger = None, keep_records: bool = True) -> None:
+        self.log = log
+        self.keep_records = keep_records
+        self.records = []
+
+    def record(self, event: str, **diagnostics) -> None:
+        """
+        Сохраняет одну запись диагностики.
+        
+        :param event: имя события (например, 'solve')
+        :param diagnostics: скалярные значения
+        """
+        if self.keep_records:
+            self.records.append({'event': event, **diagnostics})
+        if self.log is not None and self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("%s: %s", event, diagnostics)
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+class FallSolution:
+    """
+    Замкнутое решение v(t) = v_т·(1 − e^(−t/τ)), h(t) = v_т·(t − τ·(1 − e^(−t/τ))).
+    
+    Хранит только два числа (терминальную скорость v_т и время релаксации τ = m/k),
+    поэтому скорость и высоту можно получить в любые моменты времени без общего массива.
+    """
+
+    def __init__(self, v_terminal: float, relaxation_time: float, t_max: float, dt: float,
+                 point_count: int = None) -> None:
+        """
+        :param v_terminal: терминальная скорость (м/с)
+        :param relaxation_time: время релаксации τ = m/k (с)
+        :param t_max: максимальное время моделирования (с)
+        :param dt: шаг времени исходной сетки (с)
+        :param point_count: число точек исходной сетки (по умолчанию как у np.arange(0, t_max + dt, dt))
+        """
+        self.v_terminal = v_terminal
+        self.relaxation_time = relaxation_time
+        self.t_max = t_max
+        self.dt = dt
+        self.point_count = point_count if point_count is not None else int(np.ceil((t_max + dt) / dt))
+
+    def velocity_at(self, t):
+        """Скорость (м/с) в момент(ы) t."""
+        return self.v_terminal * -np.expm1(-np.asarray(t, dtype=float) / self.relaxation_time)
+
+    def height_at(self, t):
+        """Пройденная высота (м) в момент(ы) t."""
+        t = np.asarray(t, dtype=float)
+        return self.v_terminal * (t + self.relaxation_time * np.expm1(-t / self.relaxation_time))
+
+    def sample(self, points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Равномерная выборка из points точек на [0, t_max], например под разрешение графика.
+        
+        :return: массивы времени, скорости и высоты
+        """
+        t = np.linspace(0, self.t_max, points)
+        return t, self.velocity_at(t), self.height_at(t)
+
+    def iter_chunks(self, chunk_size: int = 65536):
+        """
+        Перебирает исходную сетку с шагом dt кусками не длиннее chunk_size,
+        не создавая массив на всю длину моделирования.
+        
+        :return: генератор троек (время, скорость, высота)
+        """
+        if chunk_size <= 0:
+            raise ValueError("Размер куска должен быть положительным.")
+        for start in range(0, self.point_count, chunk_size):
+            t = np.arange(start, min(start + chunk_size, self.point_count)) * self.dt
+            yield t, self.velocity_at(t), self.height_at(t)
+
+    def time_to_fraction(self, fraction: float) -> float:
+        """
+        Время достижения доли fraction от терминальной скорости: t = −τ·ln(1 − fraction).
+        
+        :param fraction: доля от терминальной скорости, 0 ≤ fraction < 1 (например, 0.99)
+        """
+        if not 0 <= fraction < 1:
+            raise ValueError("Доля терминальной скорости должна лежать в [0, 1).")
+        return -self.relaxation_time * np.log1p(-fraction)
+
+    def time_to_height(self, height: float, iterations: int = 50) -> float:
+        """
+        Время прохождения высоты height. В безразмерном виде u = t/τ уравнение
+        u − 1 + e^(−u) = h/(v_т·τ) решается методом Ньютона (выпуклая функция, сходится за несколько шагов).
+        
+        :param height: высота (м), неотрицательная
+        """
+        if height < 0:
+            raise ValueError("Высота должна быть неотрицательной.")
+        target = height / (self.v_terminal * self.relaxation_time)
+        u = target + 1
+        for _ in range(iterations):
+            correction = (u - 1 + np.exp(-u) - target) / -np.expm1(-u)
+            u -= correction
+            if abs(correction) <= 1e-15 * max(u, 1.0):
+                break
+        return u * self.relaxation_time if height > 0 else 0.0
 
 
 class RealisticViscousFallSimulator:
     def __init__(self, radius: float, object_density: float, medium_density: float, 
-                 g: float = 9.81, t_max: float = 20, dt: float = 0.1) -> None:
+                 g: float = 9.81, t_max: float = 20, dt: float = 0.1, trace: SolverTrace = None) -> None:
         """
         Инициализация модели с учетом плотности среды.
         
@@ -16,6 +134,7 @@ class RealisticViscousFallSimulator:
         :param g: ускорение свободного падения (м/с²)
         :param t_max: максимальное время моделирования (с)
         :param dt: шаг времени (с)
+        :param trace: необязательный сборщик диагностики; без него решатель ничего не пишет
         """
         if radius < 0 or object_density < 0 or medium_density < 0 or g < 0 or t_max < 0 or dt <= 0:
             raise ValueError("Все параметры должны быть неотрицательными, а dt должен быть положительным.")
@@ -26,18 +145,38 @@ class RealisticViscousFallSimulator:
         self.g = g
         self.t_max = t_max
         self.dt = dt
+        self.trace = trace
         
-        self.time = None
+        self._time = None
         self.velocity = None
         self.height = None
         
         self._precalculate()
 
     def _precalculate(self) -> None:
-        """Предварительные расчеты."""
+        """Предварительные расчеты (сетка времени строится лениво, при первом обращении)."""
         self.volume = (4 / 3) * np.pi * self.r**3
         self.mass = (self.rho_obj - self.rho_med) * self.volume 
-        self.time = np.arange(0, self.t_max + self.dt, self.dt)
+        self.point_count = int(np.ceil((self.t_max + self.dt) / self.dt))
+
+    @property
+    def time(self) -> np.ndarray:
+        """Сетка времени 0, dt, 2dt, ... до t_max включительно."""
+        if self._time is None:
+            self._time = np.arange(0, self.t_max + self.dt, self.dt)
+        return self._time
+
+    def solution(self, viscosity: float) -> 'FallSolution':
+        """
+        Аналитическое решение без сетки времени: значения считаются в запрошенные моменты.
+        
+        :param viscosity: вязкость среды (Па·с)
+        :return: FallSolution
+        """
+        if viscosity < 0:
+            raise ValueError("Вязкость среды должна быть положительной.")
+        k = 6 * np.pi * viscosity * self.r
+        return FallSolution(self.mass * self.g / k, self.mass / k, self.t_max, self.dt, self.point_count)
 
     def solve(self, viscosity: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
@@ -49,22 +188,125 @@ class RealisticViscousFallSimulator:
         if viscosity < 0:
             raise ValueError("Вязкость среды должна быть положительной.")
         
-        k = 6 * np.pi * viscosity * self.r
-        print(f"Коэффициент сопротивления (k): {k}")  # трейс k
+        if self.trace is not None:
+            started = perf_counter()
         
+        k = 6 * np.pi * viscosity * self.r
         v_terminal = (self.mass * self.g) / k
-        print(f"Терминальная скорость (v_terminal): {v_terminal}")  # трейс v_terminal
         
         t = self.time
+        relaxation = 1 - np.exp(-k * t / self.mass)
         
-        self.velocity = v_terminal * (1 - np.exp(-k * t / self.mass))
-        print(f"Скорость (velocity): {self.velocity}")  # трейс velocity
+        self.velocity = v_terminal * relaxation
+        self.height = v_terminal * t - (self.mass * v_terminal / k) * relaxation
         
-        self.height = v_terminal * t - (self.mass * v_terminal / k) * (1 - np.exp(-k * t / self.mass))
-        print(f"Высота (height): {self.height}")  # трейс height
+        if self.trace is not None:
+            self.trace.record('solve', viscosity=viscosity, k=k, v_terminal=v_terminal,
+                              points=len(t), elapsed=perf_counter() - started)
+        
+        return self.time, self.velocity, self.height
+
+    def solve_many(self, viscosities, radii=None, object_densities=None,
+                   medium_densities=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Решение задачи сразу для набора параметров (векторизованно, без цикла Python).
+        
+        Все аргументы — числа или одномерные массивы, приводимые друг к другу по правилам
+        broadcasting; не заданные параметры берутся из симулятора.
+        
+        :param viscosities: вязкости среды (Па·с)
+        :param radii: радиусы шаров (м)
+        :param object_densities: плотности материала шаров (кг/м³)
+        :param medium_densities: плотности среды (кг/м³)
+        :return: массив времени (n_time,), скорости и высоты формы (n_params, n_time)
+        """
+        if self.trace is not None:
+            started = perf_counter()
+
+        viscosities = np.atleast_1d(np.asarray(viscosities, dtype=float))
+        radii = np.atleast_1d(np.asarray(self.r if radii is None else radii, dtype=float))
+        object_densities = np.atleast_1d(np.asarray(self.rho_obj if object_densities is None else object_densities, dtype=float))
+        medium_densities = np.atleast_1d(np.asarray(self.rho_med if medium_densities is None else medium_densities, dtype=float))
+        viscosities, radii, object_densities, medium_densities = np.broadcast_arrays(
+            viscosities, radii, object_densities, medium_densities)
+        if viscosities.ndim != 1:
+            raise ValueError("Параметры должны быть числами или одномерными массивами.")
+        if np.any(viscosities < 0):
+            raise ValueError("Вязкость среды должна быть положительной.")
+        if np.any(radii < 0) or np.any(object_densities < 0) or np.any(medium_densities < 0):
+            raise ValueError("Все параметры должны быть неотрицательными, а dt должен быть положительным.")
+
+        mass = (object_densities - medium_densities) * (4 / 3) * np.pi * radii**3
+        k = 6 * np.pi * viscosities * radii
+        v_terminal = (mass * self.g / k)[:, np.newaxis]
+        relaxation_time = (mass / k)[:, np.newaxis]
+        t = self.time
+
+        # общая экспонента считается один раз и дальше переиспользует тот же буфер
+        relaxation = np.exp(-t / relaxation_time)
+        np.subtract(1, relaxation, out=relaxation)
+
+        velocity = v_terminal * relaxation
+        relaxation *= relaxation_time
+        height = v_terminal * (t - relaxation)
+
+        if self.trace is not None:
+            self.trace.record('solve_many', parameters=len(viscosities), points=len(t),
+                              v_terminal_min=float(v_terminal.min()), v_terminal_max=float(v_terminal.max()),
+                              elapsed=perf_counter() - started)
+        return t, velocity, height
+
+    def integrate(self, viscosity: float, drag: DragModel = None, inertia: str = 'effective',
+                  drop_height: float = None, rtol: float = 1e-6,
+                  atol: float = 1e-9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Численное решение задачи падения (адаптивный Дорман–Принс) с произвольной моделью сопротивления.
         
+        :param viscosity: вязкость среды (Па·с)
+        :param drag: модель сопротивления (по умолчанию StokesDrag — совпадает с solve)
+        :param inertia: 'effective', 'object' или 'added_mass' (см. FallIntegrator)
+        :param drop_height: высота до дна (м); после удара шар покоится на дне
+        :param rtol: относительная точность
+        :param atol: абсолютная точность
+        :return: массивы времени, скорости и высоты
+        """
+        result = self.integrate_many(viscosity, drag=drag, inertia=inertia, drop_height=drop_height,
+                                     rtol=rtol, atol=atol)
+        self.velocity = result.velocity[0]
+        self.height = result.height[0]
         return self.time, self.velocity, self.height
 
+    def integrate_many(self, viscosities, radii=None, object_densities=None, medium_densities=None,
+                       drag: DragModel = None, inertia: str = 'effective', drop_height: float = None,
+                       rtol: float = 1e-6, atol: float = 1e-9) -> FallIntegrationResult:
+        """
+        Численное решение сразу для набора частиц; параметры задаются как в solve_many.
+        
+        :return: FallIntegrationResult с массивами (n_params, n_time) и моментами удара о дно
+        """
+        if self.trace is not None:
+            started = perf_counter()
+
+        viscosities = np.atleast_1d(np.asarray(viscosities, dtype=float))
+        drag = drag if drag is not None else StokesDrag()
+        # вязкость проверяется только для моделей, в которые она входит
+        if drag.uses_viscosity and np.any(viscosities <= 0):
+            raise ValueError("Вязкость среды должна быть положительной.")
+        if drop_height is not None and drop_height <= 0:
+            raise ValueError("Высота падения должна быть положительной.")
+        integrator = FallIntegrator(drag, inertia, rtol, atol)
+        result = integrator.integrate(self.time,
+                                      self.r if radii is None else radii,
+                                      self.rho_obj if object_densities is None else object_densities,
+                                      self.rho_med if medium_densities is None else medium_densities,
+                                      viscosities, self.g, drop_height)
+
+        if self.trace is not None:
+            self.trace.record('integrate', parameters=len(result.velocity), points=len(result.time),
+                              steps=result.steps, rejected_steps=result.rejected_steps,
+                              rhs_evaluations=result.rhs_evaluations, elapsed=perf_counter() - started)
+        return result
+
     def get_terminal_velocity(self, viscosity: float) -> float:
         """
         Возвращает терминальную скорость.
@@ -91,9 +333,8 @@ if __name__ == '__main__':
 
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
 
-    for eta in viscosities:
-        time, velocity, height = simulator.solve(eta)
-        
+    time, velocities, heights = simulator.solve_many(viscosities)
+    for eta, velocity, height in zip(viscosities, velocities, heights):
         ax1.plot(time, velocity, label=f'η = {eta} Па·с')
         ax2.plot(time, height, label=f'η = {eta} Па·с')
 
@@ -1,6 +1,9 @@
+import contextlib
+import io
 import unittest
 import numpy as np
-from solver import RealisticViscousFallSimulator 
+from solver import RealisticViscousFallSimulator, SolverTrace
+from numerical import StokesDrag, QuadraticDrag, ReynoldsDrag
 
 
 class TestRealisticViscousFallSimulator(unittest.TestCase):
@@ -54,5 +57,160 @@ class TestRealisticViscousFallSimulator(unittest.TestCase):
         np.testing.assert_allclose(expected_heights, calculated_heights, rtol=0.05,
                                    err_msg="Height does not grow linearly with terminal velocity.")
 
+    def test_solve_many_matches_solve(self):
+        """
+        Пакетное решение совпадает с поштучным вызовом solve.
+        """
+        viscosities = [0.001, 0.01, 0.1]
+        time, velocities, heights = self.simulator.solve_many(viscosities)
+        self.assertEqual(velocities.shape, (len(viscosities), len(self.simulator.time)))
+        for i, viscosity in enumerate(viscosities):
+            _, velocity, height = self.simulator.solve(viscosity)
+            np.testing.assert_allclose(velocities[i], velocity, rtol=1e-12)
+            np.testing.assert_allclose(heights[i], height, rtol=1e-12)
+
+    def test_solve_many_broadcasts_parameters(self):
+        """
+        Вязкости, радиусы и плотности приводятся друг к другу по правилам broadcasting.
+        """
+        radii = np.array([0.005, 0.01, 0.02])
+        _, velocities, _ = self.simulator.solve_many(self.viscosity, radii=radii,
+                                                     object_densities=[1000, 1100, 1200])
+        self.assertEqual(velocities.shape, (3, len(self.simulator.time)))
+        expected = (2 / 9) * ((1100 - self.medium_density) * self.g * radii[1]**2) / self.viscosity
+        self.assertAlmostEqual(velocities[1, -1], expected, delta=0.01)
+
+    def test_solve_many_rejects_negative_viscosity(self):
+        with self.assertRaises(ValueError):
+            self.simulator.solve_many([0.001, -1])
+
+    def test_solve_is_silent_without_trace(self):
+        """
+        Без трейса решатель ничего не печатает.
+        """
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.simulator.solve(self.viscosity)
+            self.simulator.solve_many([self.viscosity, 0.01])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_trace_records_scalar_diagnostics(self):
+        """
+        Трейс получает только скалярную диагностику решения.
+        """
+        trace = SolverTrace()
+        simulator = RealisticViscousFallSimulator(self.radius, self.object_density, self.medium_density,
+                                                  self.g, self.t_max, self.dt, trace=trace)
+        simulator.solve(self.viscosity)
+        simulator.solve_many([self.viscosity, 0.01])
+        self.assertEqual([record['event'] for record in trace.records], ['solve', 'solve_many'])
+        self.assertAlmostEqual(trace.records[0]['v_terminal'], simulator.get_terminal_velocity(self.viscosity))
+        self.assertEqual(trace.records[1]['parameters'], 2)
+        for record in trace.records:
+            self.assertGreaterEqual(record['elapsed'], 0)
+            for value in record.values():
+                self.assertNotIsInstance(value, np.ndarray)
+
+    def test_integrate_matches_analytic_in_stokes_limit(self):
+        """
+        Численное решение со стоксовым сопротивлением совпадает с аналитическим.
+        """
+        _, velocity, height = self.simulator.solve(self.viscosity)
+        velocity, height = velocity.copy(), height.copy()
+        _, numeric_velocity, numeric_height = self.simulator.integrate(self.viscosity, drag=StokesDrag())
+        np.testing.assert_allclose(numeric_velocity, velocity, rtol=1e-5, atol=1e-8)
+        np.testing.assert_allclose(numeric_height, height, rtol=1e-5, atol=1e-8)
+
+    def test_integrate_many_detects_impact(self):
+        """
+        Момент удара о дно совпадает с аналитическим, после удара шар покоится.
+        """
+        drop_height = 0.5
+        result = self.simulator.integrate_many([self.viscosity, 0.05], drop_height=drop_height)
+        self.assertEqual(result.velocity.shape, (2, len(self.simulator.time)))
+
+        _, velocity, height = self.simulator.solve(self.viscosity)
+        crossing = np.argmax(height >= drop_height)
+        self.assertTrue(self.simulator.time[crossing - 1] <= result.impact_time[0] <= self.simulator.time[crossing])
+        self.assertEqual(result.height[0, -1], drop_height)
+        self.assertEqual(result.velocity[0, -1], 0)
+        self.assertTrue(np.isnan(result.impact_time[1]))
+
+    def test_quadratic_drag_lowers_terminal_velocity(self):
+        """
+        Квадратичное сопротивление и сопротивление по числу Рейнольдса тормозят сильнее стоксова.
+        """
+        simulator = RealisticViscousFallSimulator(0.015, 7300, 900, t_max=10, dt=0.1)
+        stokes = simulator.integrate_many(1.0, inertia='object').velocity[0, -1]
+        quadratic = simulator.integrate_many(1.0, drag=QuadraticDrag(), inertia='object').velocity[0, -1]
+        reynolds = simulator.integrate_many(1.0, drag=ReynoldsDrag(), inertia='object').velocity[0, -1]
+        self.assertAlmostEqual(stokes, simulator.get_terminal_velocity(1.0), places=3)
+        self.assertLess(quadratic, stokes)
+        self.assertLess(reynolds, stokes)
+
+    def test_integrate_steps_do_not_depend_on_output_grid(self):
+        """
+        Шаг выбирается контролем ошибки: в 100 раз более густая сетка вывода почти не меняет
+        число шагов, а её точки берутся из плотного вывода с прежней точностью.
+        """
+        coarse = RealisticViscousFallSimulator(self.radius, 1200, self.medium_density, t_max=20, dt=0.1)
+        dense = RealisticViscousFallSimulator(self.radius, 1200, self.medium_density, t_max=20, dt=1e-3)
+        coarse_result = coarse.integrate_many([0.5, 1.0, 2.0])
+        dense_result = dense.integrate_many([0.5, 1.0, 2.0])
+        self.assertLess(dense_result.steps, 1.1 * coarse_result.steps)
+        self.assertLess(dense_result.steps, len(dense.time))
+
+        _, velocity, height = dense.solve_many([0.5, 1.0, 2.0])
+        np.testing.assert_allclose(dense_result.velocity, velocity, rtol=1e-5, atol=1e-8)
+        np.testing.assert_allclose(dense_result.height, height, rtol=1e-5, atol=1e-8)
+
+    def test_viscosity_is_checked_only_when_drag_uses_it(self):
+        simulator = RealisticViscousFallSimulator(0.015, 7300, 900, t_max=2, dt=0.1)
+        result = simulator.integrate_many(0.0, drag=QuadraticDrag(include_linear=False))
+        self.assertGreater(result.velocity[0, -1], 0)
+        with self.assertRaises(ValueError):
+            simulator.integrate_many(0.0, drag=QuadraticDrag())
+
+    def test_solution_matches_solve(self):
+        """
+        Ленивое решение совпадает с массивами solve, в том числе по кускам.
+        """
+        _, velocity, height = self.simulator.solve(self.viscosity)
+        solution = self.simulator.solution(self.viscosity)
+        np.testing.assert_allclose(solution.velocity_at(self.simulator.time), velocity, rtol=1e-9)
+        np.testing.assert_allclose(solution.height_at(self.simulator.time), height, rtol=1e-9, atol=1e-12)
+
+        chunks = list(solution.iter_chunks(chunk_size=64))
+        self.assertEqual(len(chunks), int(np.ceil(len(velocity) / 64)))
+        np.testing.assert_allclose(np.concatenate([chunk[0] for chunk in chunks]), self.simulator.time)
+        np.testing.assert_allclose(np.concatenate([chunk[1] for chunk in chunks]), velocity, rtol=1e-9)
+
+    def test_solution_closed_form_queries(self):
+        """
+        Время достижения 99% терминальной скорости и заданной высоты.
+        """
+        solution = self.simulator.solution(self.viscosity)
+        t99 = solution.time_to_fraction(0.99)
+        self.assertAlmostEqual(solution.velocity_at(t99), 0.99 * solution.v_terminal, places=10)
+        self.assertAlmostEqual(solution.time_to_fraction(0), 0)
+
+        t_height = solution.time_to_height(0.5)
+        self.assertAlmostEqual(solution.height_at(t_height), 0.5, places=9)
+        self.assertEqual(solution.time_to_height(0), 0)
+        with self.assertRaises(ValueError):
+            solution.time_to_fraction(1)
+
+    def test_time_grid_is_lazy(self):
+        """
+        Сетка времени не строится, пока к ней не обратились.
+        """
+        simulator = RealisticViscousFallSimulator(self.radius, self.object_density, self.medium_density,
+                                                  t_max=1000, dt=0.001)
+        self.assertIsNone(simulator._time)
+        t, velocity, _ = simulator.solution(self.viscosity).sample(500)
+        self.assertEqual(len(t), 500)
+        self.assertIsNone(simulator._time)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,12 @@
 import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 from abc import ABC, abstractmethod
 from typing import List, Optional, Tuple, Callable, override
@@ -9,6 +16,16 @@ class Function(ABC, Callable[[float], float]):
     def value_at(self, x: float) -> float:
         pass
 
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        """Значения функции на массиве точек; подклассы переопределяют векторизованной версией."""
+        values = np.empty(len(xs), dtype=float)
+        for i, x in enumerate(xs):
+            try:
+                values[i] = self.value_at(float(x))
+            except (OverflowError, ValueError, ZeroDivisionError):
+                values[i] = np.nan
+        return values
+
     def __call__(self, x: float) -> float:
         return self.value_at(x)
 
@@ -25,9 +42,22 @@ class LaboratoryFunction(Function):
     def __str__(self) -> str:
         return "f(x) = x * e^x * (sin x)^2"
 
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        return xs * np.exp(xs) * np.sin(xs)**2
+
     def derivative(self) -> 'Function':
-        return CustomStringAndLambdaFunction("f'(x) = e^x * (sin x)^2 + 2x * sin x * cos x + x * (sin x)^2", 
-                                             lambda x: math.exp(x) * (math.sin(x)**2 + 2*x*math.sin(x)*math.cos(x) + x*math.sin(x)**2))
+        return LaboratoryFunctionDerivative()
+
+class LaboratoryFunctionDerivative(Function):
+    def value_at(self, x: float) -> float:
+        return math.exp(x) * (math.sin(x)**2 + 2*x*math.sin(x)*math.cos(x) + x*math.sin(x)**2)
+
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        sin_x = np.sin(xs)
+        return np.exp(xs) * (sin_x**2 + 2*xs*sin_x*np.cos(xs) + xs*sin_x**2)
+
+    def __str__(self) -> str:
+        return "f'(x) = e^x * (sin x)^2 + 2x * sin x * cos x + x * (sin x)^2"
 
 class CustomLambdaFunction(Function):
     def __init__(self, func: Callable[[float], float]) -> None:
@@ -43,6 +73,15 @@ class CustomStringFunction(Function):
     def value_at(self, x: float) -> float:
         return eval(self.expression, {"x": x, "math": math})
 
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        # numpy повторяет имена из math (sin, exp, pi...), поэтому выражение можно посчитать сразу на массиве
+        try:
+            values = eval(self.expression, {"x": xs, "math": np})
+            return np.broadcast_to(np.asarray(values, dtype=float), np.shape(xs)).copy()
+        except (AttributeError, TypeError, ValueError):
+            # ValueError — условия над массивом, например «x if x > 0 else -x»
+            return super().values_at(xs)
+
     def __str__(self) -> str:
         return f"f(x) = {self.expression}"
     
@@ -67,6 +106,11 @@ class NumericalDerivative(Function):
         h = max(self.h, abs(x) * 1e-5)
         return (self.function.value_at(x + h) - self.function.value_at(x - h)) / (2 * h)
 
+    @override
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        h = np.maximum(self.h, np.abs(xs) * 1e-5)
+        return (self.function.values_at(xs + h) - self.function.values_at(xs - h)) / (2 * h)
+
     def __str__(self) -> str:
         return f"d({self.function})/dx"
 
@@ -80,12 +124,87 @@ class AnotherNumericalDerivative(NumericalDerivative):
     def value_at(self, x: float) -> float:
         return (self.function.value_at(x) - self.function.value_at(x - self.h)) / self.h
 
+    @override
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        return (self.function.values_at(xs) - self.function.values_at(xs - self.h)) / self.h
+
+
+class CachedFunction(Function):
+    def __init__(self, function: Function, max_size: int = 128) -> None:
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+        self.function = function
+        self.max_size = max_size
+        self._cache: OrderedDict[float, float] = OrderedDict()
+        self.call_count = 0
+        self.evaluation_count = 0
+        self._derivative: CachedFunction = None
+
+    @override
+    def value_at(self, x: float) -> float:
+        self.call_count += 1
+        value = self._cache.get(x)
+        if value is not None:
+            self._cache.move_to_end(x)
+            return value
+        value = self.function.value_at(x)
+        self.evaluation_count += 1
+        self._cache[x] = value
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return value
+
+    @override
+    def values_at(self, xs: np.ndarray) -> np.ndarray:
+        self.call_count += len(xs)
+        self.evaluation_count += len(xs)
+        return self.function.values_at(xs)
+
+    def get_call_count(self) -> int:
+        return self.call_count
+
+    def get_evaluation_count(self) -> int:
+        return self.evaluation_count
+
+    def get_total_evaluation_count(self) -> int:
+        """Вычисления самой функции и всех её производных, запрошенных через derivative()."""
+        if self._derivative is None:
+            return self.evaluation_count
+        return self.evaluation_count + self._derivative.get_total_evaluation_count()
+
+    def get_hit_count(self) -> int:
+        return self.call_count - self.evaluation_count
+
+    def drop_evaluations(self) -> None:
+        self.call_count = 0
+        self.evaluation_count = 0
+        if self._derivative is not None:
+            self._derivative.drop_evaluations()
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.drop_evaluations()
+        if self._derivative is not None:
+            self._derivative.clear()
+
+    def __str__(self) -> str:
+        return str(self.function)
+
+    def derivative(self) -> 'CachedFunction':
+        if self._derivative is None:
+            self._derivative = CachedFunction(self.function.derivative(), self.max_size)
+        return self._derivative
+
 
 class Functions:
     @staticmethod
     def lab_function() -> Function:
         return LaboratoryFunction()
 
+    @staticmethod
+    def cached(function: Function, max_size: int = 128) -> CachedFunction:
+        return CachedFunction(function, max_size)
+
     @staticmethod
     def new_from_lambda(lambda_func: Callable[[float], float]) -> Function:
         return CustomLambdaFunction(lambda_func)
@@ -116,22 +235,118 @@ class Interval:
             x += step
         return results
 
+class AdaptiveSampler:
+    """
+    Адаптивная выборка точек для графика: начинает с равномерной сетки и делит пополам
+    только те отрезки, где значение в середине отличается от линейной интерполяции
+    больше чем на tolerance от локального масштаба — наибольшего из |f| и размаха f на самом отрезке.
+    Критерий не зависит от размаха функции на всём интервале, поэтому крутые функции (x·e^x)
+    прорабатываются и там, где их значения малы. Отрезок делится не более max_depth раз,
+    общее число вычислений ограничено max_evaluations.
+    """
+
+    def __init__(self, function: Function, interval: Interval, initial_points: int = 129,
+                 max_evaluations: int = 4096, tolerance: float = 1e-3, max_depth: int = 10) -> None:
+        if initial_points < 2:
+            raise ValueError("initial_points must be at least 2")
+        if max_evaluations < initial_points:
+            raise ValueError("max_evaluations must not be less than initial_points")
+        self.function = function
+        self.interval = interval
+        self.initial_points = initial_points
+        self.max_evaluations = max_evaluations
+        self.tolerance = tolerance
+        self.max_depth = max_depth
+
+    def sample(self) -> Tuple[np.ndarray, np.ndarray]:
+        a, b = self.interval.from_(), self.interval.to()
+        # у двойного нуля (sin²) относительная ошибка не убывает при делении, поэтому глубина ограничена
+        min_width = abs(b - a) / (self.initial_points - 1) / 2 ** self.max_depth * (1 - 1e-9)
+        x = np.linspace(a, b, self.initial_points)
+        with np.errstate(all="ignore"):
+            y = self.function.values_at(x)
+        evaluations = len(x)
+        candidates = np.arange(len(x) - 1)
+        priority = np.zeros(len(candidates))
+
+        while len(candidates) > 0 and evaluations < self.max_evaluations:
+            keep = x[candidates + 1] - x[candidates] >= min_width
+            candidates, priority = candidates[keep], priority[keep]
+            budget = self.max_evaluations - evaluations
+            if len(candidates) > budget:
+                # не хватает вычислений — сначала дробятся отрезки с наибольшей ошибкой
+                chosen = np.sort(np.argsort(-priority, kind="stable")[:budget])
+                candidates, priority = candidates[chosen], priority[chosen]
+            if len(candidates) == 0:
+                break
+            middle = (x[candidates] + x[candidates + 1]) / 2
+            with np.errstate(all="ignore"):
+                y_middle = self.function.values_at(middle)
+                evaluations += len(middle)
+                left_y, right_y = y[candidates], y[candidates + 1]
+                local = np.stack((left_y, y_middle, right_y))
+                scale = np.maximum(np.max(np.abs(local), axis=0), np.ptp(local, axis=0))
+                error = np.abs(y_middle - (left_y + right_y) / 2) / np.maximum(scale, np.finfo(float).tiny)
+            refine = ~(error <= self.tolerance)
+
+            # все вычисленные середины попадают в выборку; дробятся дальше только плохие отрезки
+            x = np.insert(x, candidates + 1, middle)
+            y = np.insert(y, candidates + 1, y_middle)
+            shift = np.arange(len(candidates))
+            left = candidates[refine] + shift[refine]
+            order = np.argsort(np.concatenate((left, left + 1)))
+            candidates = np.concatenate((left, left + 1))[order]
+            priority = np.nan_to_num(np.tile(error[refine], 2)[order], nan=np.inf)
+
+        return x, y
+
+
 class GraphBuilder:
-    def __init__(self, function: Function, interval: Interval, step: float = 0.01) -> None:
+    def __init__(self, function: Function, interval: Interval, step: float = 0.01, adaptive: bool = False,
+                 tolerance: float = 1e-3, max_evaluations: int = 4096) -> None:
         self.function = function
         self.interval = interval
         self.step = step
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.max_evaluations = max_evaluations
+        self._samples: Tuple[np.ndarray, np.ndarray] = None
+
+    def sample(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Точки графика считаются один раз и переиспользуются при повторных build/save."""
+        if self._samples is None:
+            if self.adaptive:
+                initial_points = min(129, self.max_evaluations)
+                sampler = AdaptiveSampler(self.function, self.interval, initial_points,
+                                          self.max_evaluations, self.tolerance)
+                self._samples = sampler.sample()
+            else:
+                start, end = self.interval.from_(), self.interval.to()
+                count = int(math.floor((end - start) / self.step + 1e-9)) + 1
+                x = start + self.step * np.arange(count)
+                with np.errstate(all="ignore"):
+                    self._samples = (x, self.function.values_at(x))
+        return self._samples
+
+    def draw(self, axes) -> None:
+        x, y = self.sample()
+        axes.plot(x, y)
+        axes.set_xlabel('x')
+        axes.set_ylabel('f(x)')
+        axes.set_title(f'График функции {self.function}')
+        axes.grid()
 
     def build(self) -> None:
-        x = self.interval.traverse(mapper=None, step=self.step)
-        y = self.interval.traverse(self.function, self.step)
-        plt.plot(x, y)
-        plt.xlabel('x')
-        plt.ylabel('f(x)')
-        plt.title(f'График функции {self.function}')
-        plt.grid()
+        self.draw(plt.gca())
         plt.show()
 
+    def save(self, path: str, dpi: int = 100) -> None:
+        """Рисует график без окна (Agg) прямо в файл — подходит для пакетной генерации."""
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        self.draw(figure.add_subplot())
+        figure.savefig(path, dpi=dpi)
+
 
 class Extremum:
     def __init__(self, point: float, value: float) -> None:
@@ -162,33 +377,111 @@ class ExtremumFinder(ABC):
     def find_extremum(self, function: Function, interval: Interval, epsilon: float = 1e-7) -> Optional[Extremum]:
         pass
 
+class IterationBudgetExceeded(Exception):
+    pass
+
+class IterationLimitExceeded(IterationBudgetExceeded):
+    pass
+
+class TimeBudgetExceeded(IterationBudgetExceeded):
+    pass
+
 class IterationalContext(ABC):
-    def __init__(self):
+    """
+    Счётчик итераций метода. Дополнительно (по запросу) считает вычисления функции — по CachedFunction,
+    то есть без попаданий в кэш, как и отчёт пакетного поиска, — замеряет время таймером timer
+    и ограничивает работу по времени time_budget (с).
+    Если ни таймер, ни счёт вычислений не включены, накладные расходы — одна проверка на итерацию.
+    """
+
+    def __init__(self, timer: Callable[[], float] = None, time_budget: float = None,
+                 count_evaluations: bool = False):
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
         self.iteration_count = 0
+        self.evaluation_count = 0
+        self.elapsed_time = 0.0
+        self.timer = timer if timer is not None or time_budget is None else time.perf_counter
+        self.time_budget = time_budget
+        self.count_evaluations = count_evaluations
+        self._started_at: float = None
 
     @abstractmethod
     def count_iteration(self):
         pass
 
+    def count_evaluation(self, count: int = 1):
+        self.evaluation_count += count
+
+    def check_time_budget(self):
+        now = self.timer()
+        if self._started_at is None:
+            self._started_at = now
+        elif self.time_budget is not None and now - self._started_at > self.time_budget:
+            raise TimeBudgetExceeded("Time budget exceeded")
+
+    def instrument(self, function: Function) -> Function:
+        """Функция для метода: при count_evaluations — CachedFunction (уже обёрнутая не оборачивается повторно)."""
+        if not self.count_evaluations or isinstance(function, CachedFunction):
+            return function
+        return CachedFunction(function)
+
+    @contextmanager
+    def measure(self):
+        if self.timer is None:
+            yield self
+            return
+        self._started_at = self.timer()
+        try:
+            yield self
+        finally:
+            self.elapsed_time += self.timer() - self._started_at
+            self._started_at = None
+
     def drop_iterations(self):
         self.iteration_count = 0
+        self.evaluation_count = 0
+        self.elapsed_time = 0.0
+        self._started_at = None
 
     def get_iteration_count(self) -> int:
         return self.iteration_count
 
+    def get_evaluation_count(self) -> int:
+        return self.evaluation_count
+
+    def get_elapsed_time(self) -> float:
+        return self.elapsed_time
+
+    def get_time_per_iteration(self) -> float:
+        return self.elapsed_time / self.iteration_count if self.iteration_count else 0.0
+
+    def to_record(self) -> dict:
+        return {
+            "iterations": self.iteration_count,
+            "evaluations": self.evaluation_count,
+            "elapsed_time": self.elapsed_time,
+            "time_per_iteration": self.get_time_per_iteration(),
+        }
+
 class UnlimitedIterationalContext(IterationalContext):
     def count_iteration(self):
         self.iteration_count += 1
+        if self.timer is not None:
+            self.check_time_budget()
 
 class LimitedIterationalContext(IterationalContext):
-    def __init__(self, max_iterations: int):
-        super().__init__()
+    def __init__(self, max_iterations: int, timer: Callable[[], float] = None, time_budget: float = None,
+                 count_evaluations: bool = False):
+        super().__init__(timer, time_budget, count_evaluations)
         self.max_iterations = max_iterations
 
     def count_iteration(self):
         if self.iteration_count >= self.max_iterations:
-            raise Exception("Maximum number of iterations exceeded")
+            raise IterationLimitExceeded("Maximum number of iterations exceeded")
         self.iteration_count += 1
+        if self.timer is not None:
+            self.check_time_budget()
 
 class IterationalExtremumFinder(ExtremumFinder):
     def __init__(self, context: IterationalContext):
@@ -200,6 +493,18 @@ class IterationalExtremumFinder(ExtremumFinder):
     def drop_iterations(self):
         self.context.drop_iterations()
 
+    def run(self, function: Function, interval: Interval, epsilon: float = 1e-7) -> Optional[Extremum]:
+        """find_extremum под профилированием контекста: время, бюджет и счёт вычислений."""
+        function = self.context.instrument(function)
+        counted = self.context.count_evaluations and isinstance(function, CachedFunction)
+        before = function.get_total_evaluation_count() if counted else 0
+        try:
+            with self.context.measure():
+                return self.find_extremum(function, interval, epsilon)
+        finally:
+            if counted:
+                self.context.count_evaluation(function.get_total_evaluation_count() - before)
+
 class DichotomyMethod(IterationalExtremumFinder):
 
     def __init__(self, context: IterationalContext):
@@ -213,22 +518,29 @@ class DichotomyMethod(IterationalExtremumFinder):
             raise Exception("No extremum in the interval")
         
         is_minimum = True
+        point, value = None, None
         while (b - a) / 2 > epsilon:
             self.count_iteration()
             x1 = (b + a - epsilon) / 2
             x2 = (b + a + epsilon) / 2
-            if function.value_at(x1) <= function.value_at(x2):
+            f_x1, f_x2 = function.value_at(x1), function.value_at(x2)
+            if f_x1 <= f_x2:
                 b = x2
+                point, value = x1, f_x1
                 is_minimum = True
             else:
                 a = x1
+                point, value = x2, f_x2
                 is_minimum = False
-            
-        point = (a + b) / 2
+
+        # последняя пробная точка лежит в итоговом отрезке, её значение уже посчитано
+        if point is None:
+            point = (a + b) / 2
+            value = function.value_at(point)
         if is_minimum:
-            return Minimum(point, function.value_at(point))
+            return Minimum(point, value)
         else:
-            return Maximum(point, function.value_at(point))
+            return Maximum(point, value)
 
 class GoldenSectionMethod(IterationalExtremumFinder):
     golden_section_tau: float = (math.sqrt(5) - 1) / 2
@@ -245,25 +557,366 @@ class GoldenSectionMethod(IterationalExtremumFinder):
 
         lambda1 = a + (1 - self.golden_section_tau) * (b - a)
         mu1 = a + self.golden_section_tau * (b - a)
+        f_lambda1 = function.value_at(lambda1)
+        f_mu1 = function.value_at(mu1)
         is_minimum = True
         while abs(b - a)> epsilon:
             self.count_iteration()
-            if function.value_at(lambda1) < function.value_at(mu1):
+            if f_lambda1 < f_mu1:
                 b = mu1
-                mu1 = lambda1
+                mu1, f_mu1 = lambda1, f_lambda1
                 lambda1 = a + (1 - self.golden_section_tau) * (b - a)
+                f_lambda1 = function.value_at(lambda1)
                 is_minimum = True
             else:
                 a = lambda1
-                lambda1 = mu1
+                lambda1, f_lambda1 = mu1, f_mu1
                 mu1 = a + self.golden_section_tau * (b - a)
+                f_mu1 = function.value_at(mu1)
                 is_minimum = False
 
-        point = (a + b) / 2
+        # обе внутренние точки уже вычислены, берём лучшую вместо середины отрезка
+        point, value = (lambda1, f_lambda1) if f_lambda1 < f_mu1 else (mu1, f_mu1)
         if is_minimum:
-            return Minimum(point, function.value_at(point))
+            return Minimum(point, value)
         else:
-            return Maximum(point, function.value_at(point))
+            return Maximum(point, value)
+
+class BracketingExtremumFinder(IterationalExtremumFinder):
+    """
+    Основа для методов, которые сами определяют тип экстремума по знакам f' на концах
+    отрезка и дальше ищут минимум функции direction * f(x).
+    """
+
+    def extremum_direction(self, derivative: Function, a: float, b: float) -> float:
+        derivative_a, derivative_b = derivative.value_at(a), derivative.value_at(b)
+        if derivative_a * derivative_b > 0:
+            raise Exception("No extremum in the interval")
+        if derivative_a < 0 or derivative_b > 0:
+            return 1.0
+        return -1.0
+
+    @staticmethod
+    def create_extremum(point: float, value: float, direction: float) -> Extremum:
+        if direction > 0:
+            return Minimum(point, value)
+        return Maximum(point, value)
+
+
+class BrentMethod(BracketingExtremumFinder):
+    golden_section_ratio: float = (3 - math.sqrt(5)) / 2
+    machine_epsilon: float = np.finfo(float).eps
+
+    def __init__(self, context: IterationalContext):
+        super().__init__(context)
+
+    def find_extremum(self, function: Function, interval: Interval, epsilon: float = 1e-7) -> Optional[Extremum]:
+        a, b = interval.from_(), interval.to()
+        direction = self.extremum_direction(function.derivative(), a, b)
+
+        def g(x: float) -> float:
+            return direction * function.value_at(x)
+
+        x = w = v = a + self.golden_section_ratio * (b - a)
+        fx = fw = fv = g(x)
+        d = e = 0.0
+        while True:
+            middle = (a + b) / 2
+            tol1 = epsilon / 4 + self.machine_epsilon * abs(x)
+            tol2 = 2 * tol1
+            if abs(x - middle) <= tol2 - (b - a) / 2:
+                break
+            self.count_iteration()
+
+            use_golden = True
+            if abs(e) > tol1:
+                # парабола через x, w, v
+                r = (x - w) * (fx - fv)
+                q = (x - v) * (fx - fw)
+                p = (x - v) * q - (x - w) * r
+                q = 2 * (q - r)
+                if q > 0:
+                    p = -p
+                q = abs(q)
+                previous_e, e = e, d
+                if abs(p) < abs(q * previous_e / 2) and q * (a - x) < p < q * (b - x):
+                    d = p / q
+                    u = x + d
+                    if u - a < tol2 or b - u < tol2:
+                        d = math.copysign(tol1, middle - x)
+                    use_golden = False
+            if use_golden:
+                e = (a - x) if x >= middle else (b - x)
+                d = self.golden_section_ratio * e
+
+            u = x + d if abs(d) >= tol1 else x + math.copysign(tol1, d)
+            fu = g(u)
+            if fu <= fx:
+                if u >= x:
+                    a = x
+                else:
+                    b = x
+                v, fv = w, fw
+                w, fw = x, fx
+                x, fx = u, fu
+            else:
+                if u < x:
+                    a = u
+                else:
+                    b = u
+                if fu <= fw or w == x:
+                    v, fv = w, fw
+                    w, fw = u, fu
+                elif fu <= fv or v == x or v == w:
+                    v, fv = u, fu
+
+        return self.create_extremum(x, direction * fx, direction)
+
+
+class SafeguardedNewtonMethod(BracketingExtremumFinder):
+    """
+    Метод Ньютона для уравнения f'(x) = 0 с аналитической производной функции
+    (если она задана) и страховкой бисекцией: шаг, выходящий из текущей вилки
+    по знаку f', заменяется делением вилки пополам.
+    """
+
+    def __init__(self, context: IterationalContext):
+        super().__init__(context)
+
+    def find_extremum(self, function: Function, interval: Interval, epsilon: float = 1e-7) -> Optional[Extremum]:
+        a, b = interval.from_(), interval.to()
+        derivative = function.derivative()
+        second_derivative = derivative.derivative()
+        direction = self.extremum_direction(derivative, a, b)
+
+        # direction * f' отрицательна слева от экстремума и положительна справа
+        x = (a + b) / 2
+        while b - a > epsilon:
+            self.count_iteration()
+            slope = direction * derivative.value_at(x)
+            if slope == 0:
+                break
+            if slope < 0:
+                a = x
+            else:
+                b = x
+
+            curvature = direction * second_derivative.value_at(x)
+            x_next = (a + b) / 2
+            if curvature != 0 and math.isfinite(curvature):
+                newton_x = x - slope / curvature
+                if a < newton_x < b:
+                    x_next = newton_x
+            step = abs(x_next - x)
+            x = x_next
+            if step < epsilon / 2:
+                break
+
+        return self.create_extremum(x, function.value_at(x), direction)
+
+
+class FibonacciMethod(BracketingExtremumFinder):
+    """
+    Метод Фибоначчи: ровно evaluation_budget вычислений функции. Если бюджет не задан,
+    он подбирается по epsilon как наименьшее n, для которого F_n >= (b - a) / epsilon.
+    """
+
+    def __init__(self, context: IterationalContext, evaluation_budget: int = None):
+        super().__init__(context)
+        if evaluation_budget is not None and evaluation_budget < 3:
+            raise ValueError("Fibonacci search needs at least 3 evaluations")
+        self.evaluation_budget = evaluation_budget
+
+    @staticmethod
+    def fibonacci_numbers(count: int) -> List[int]:
+        numbers = [1, 1]
+        while len(numbers) <= count:
+            numbers.append(numbers[-1] + numbers[-2])
+        return numbers
+
+    @staticmethod
+    def evaluations_for(length: float, epsilon: float) -> int:
+        numbers = [1, 1, 2, 3]
+        while numbers[-1] < length / epsilon:
+            numbers.append(numbers[-1] + numbers[-2])
+        return len(numbers) - 1
+
+    def find_extremum(self, function: Function, interval: Interval, epsilon: float = 1e-7) -> Optional[Extremum]:
+        a, b = interval.from_(), interval.to()
+        direction = self.extremum_direction(function.derivative(), a, b)
+
+        def g(x: float) -> float:
+            return direction * function.value_at(x)
+
+        n = self.evaluation_budget if self.evaluation_budget is not None else self.evaluations_for(b - a, epsilon)
+        fibonacci = self.fibonacci_numbers(n)
+        delta = min(epsilon, (b - a) / fibonacci[n]) / 2
+
+        x1 = a + fibonacci[n - 2] / fibonacci[n] * (b - a)
+        x2 = a + fibonacci[n - 1] / fibonacci[n] * (b - a)
+        f1, f2 = g(x1), g(x2)
+        k = n
+        while k > 2:
+            self.count_iteration()
+            k -= 1
+            if f1 < f2:
+                b = x2
+                x2, f2 = x1, f1
+                x1 = a + fibonacci[k - 2] / fibonacci[k] * (b - a)
+                if k == 2:
+                    # на последнем шаге точки совпадают, сдвигаем новую на delta
+                    x1 = x2 - delta
+                f1 = g(x1)
+            else:
+                a = x1
+                x1, f1 = x2, f2
+                x2 = a + fibonacci[k - 1] / fibonacci[k] * (b - a)
+                if k == 2:
+                    x2 = x1 + delta
+                f2 = g(x2)
+
+        point, value = (x1, f1) if f1 < f2 else (x2, f2)
+        return self.create_extremum(point, direction * value, direction)
+
+
+class ExtremumTask:
+    def __init__(self, interval: Interval, epsilon: float) -> None:
+        self.interval = interval
+        self.epsilon = epsilon
+
+
+class ExtremumTaskResult:
+    def __init__(self, task: ExtremumTask, extremum: Extremum = None, iterations: int = 0,
+                 evaluations: int = 0, error: str = None, method: str = None, elapsed_time: float = 0.0) -> None:
+        self.task = task
+        self.extremum = extremum
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.error = error
+        self.method = method
+        self.elapsed_time = elapsed_time
+
+    def is_found(self) -> bool:
+        return self.extremum is not None
+
+    def to_record(self) -> dict:
+        return {
+            "method": self.method,
+            "from": self.task.interval.from_(),
+            "to": self.task.interval.to(),
+            "epsilon": self.task.epsilon,
+            "kind": type(self.extremum).__name__ if self.is_found() else None,
+            "point": self.extremum.point if self.is_found() else None,
+            "value": self.extremum.value if self.is_found() else None,
+            "iterations": self.iterations,
+            "evaluations": self.evaluations,
+            "elapsed_time": self.elapsed_time,
+            "error": self.error,
+        }
+
+    def __str__(self) -> str:
+        interval = self.task.interval
+        outcome = str(self.extremum) if self.is_found() else self.error
+        return (f"[{interval.from_()}, {interval.to()}] eps={self.task.epsilon}: {outcome} "
+                f"(iterations = {self.iterations}, evaluations = {self.evaluations})")
+
+
+class ExtremumBatchResult:
+    def __init__(self, results: List[ExtremumTaskResult]) -> None:
+        self.results = results
+
+    def extrema(self) -> List[Extremum]:
+        return [result.extremum for result in self.results if result.is_found()]
+
+    def for_epsilon(self, epsilon: float) -> 'ExtremumBatchResult':
+        return ExtremumBatchResult([result for result in self.results if result.task.epsilon == epsilon])
+
+    def total_iterations(self) -> int:
+        return sum(result.iterations for result in self.results)
+
+    def total_evaluations(self) -> int:
+        return sum(result.evaluations for result in self.results)
+
+    def total_elapsed_time(self) -> float:
+        return sum(result.elapsed_time for result in self.results)
+
+    def to_records(self) -> List[dict]:
+        return [result.to_record() for result in self.results]
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __str__(self) -> str:
+        lines = [f"{'Отрезок':<36} {'Точность':<10} {'Точка':<24} {'Значение':<24} {'Итераций':<10} {'Вычислений':<10}"]
+        for result in self.results:
+            interval = f"[{result.task.interval.from_():.6g}, {result.task.interval.to():.6g}]"
+            if result.is_found():
+                point, value = f"{result.extremum.point:.15g}", f"{result.extremum.value:.15g}"
+            else:
+                point, value = "-", "-"
+            lines.append(f"{interval:<36} {result.task.epsilon:<10} {point:<24} {value:<24} "
+                         f"{result.iterations:<10} {result.evaluations:<10}")
+        return "\n".join(lines)
+
+
+def _run_extremum_task(finder_class: type, context_factory: Callable[[], IterationalContext],
+                       function: Function, task: ExtremumTask) -> ExtremumTaskResult:
+    context = context_factory()
+    counted_function = CachedFunction(function)
+    finder = finder_class(context)
+    try:
+        extremum = finder.run(counted_function, task.interval, task.epsilon)
+        error = None
+    except Exception as e:
+        extremum, error = None, str(e)
+    return ExtremumTaskResult(task, extremum, context.get_iteration_count(),
+                              counted_function.get_total_evaluation_count(), error,
+                              finder_class.__name__, context.get_elapsed_time())
+
+
+class BatchExtremumFinder:
+    """
+    Запускает поиск экстремума на наборе (отрезок, точность) в пуле воркеров.
+    Каждая задача получает собственный контекст итераций и счётчик вычислений.
+    Для пула процессов функция, класс метода и фабрика контекстов должны сериализоваться
+    через pickle (лямбды не подходят, используйте use_processes=False).
+    """
+
+    def __init__(self, finder_class: type,
+                 context_factory: Callable[[], IterationalContext] = UnlimitedIterationalContext,
+                 max_workers: int = None, use_processes: bool = True) -> None:
+        if not issubclass(finder_class, IterationalExtremumFinder):
+            raise ValueError("finder_class must be an IterationalExtremumFinder subclass")
+        self.finder_class = finder_class
+        self.context_factory = context_factory
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def find_extrema(self, function: Function, intervals: List[Interval],
+                     epsilons: List[float]) -> ExtremumBatchResult:
+        tasks = [ExtremumTask(interval, epsilon) for epsilon in epsilons for interval in intervals]
+        if not tasks:
+            return ExtremumBatchResult([])
+
+        with self._create_executor() as executor:
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(tasks) // (4 * workers))
+            results = executor.map(_run_extremum_task,
+                                   [self.finder_class] * len(tasks),
+                                   [self.context_factory] * len(tasks),
+                                   [function] * len(tasks),
+                                   tasks,
+                                   chunksize=chunksize)
+            return ExtremumBatchResult(list(results))
+
 
 class Optional[T]:
     def __init__(self, value: T = None):
@@ -285,7 +938,9 @@ class Optional[T]:
     
 
 class ExtremumIntervalDetector(ABC):
-    def __init__(self, function: Function, step: float = None, search_interval: Interval = Interval(-1000, 1000)):
+    def __init__(self, function: Function, step: float = None, search_interval: Interval = Interval(-1000, 1000),
+                 prescan: bool = True, prescan_refinement: int = 8, cluster_tolerance: float = None,
+                 minimum_refinement: int = 3):
         self.function = function
         self.search_interval = search_interval
         if step is None:
@@ -295,18 +950,87 @@ class ExtremumIntervalDetector(ABC):
                 self.step = 0.1
         else:
             self.step = step
+        if prescan_refinement < 1:
+            raise ValueError("prescan_refinement must be at least 1")
+        if minimum_refinement < 0:
+            raise ValueError("minimum_refinement must be non-negative")
+        self.prescan = prescan
+        self.prescan_refinement = prescan_refinement
+        self.minimum_refinement = minimum_refinement
+        self.cluster_tolerance = cluster_tolerance if cluster_tolerance is not None else self.step * 1e-3
 
     def find_extremum_intervals(self) -> List[Interval]:
         derivative = self.function.derivative()
         x_values = np.arange(self.search_interval.from_(), self.search_interval.to(), self.step)
-        potential_intervals = []
+        with np.errstate(all="ignore"):
+            initial_guesses = self.prescan_initial_guesses(derivative, x_values) if self.prescan else x_values
+            roots = self.find_roots(derivative, initial_guesses)
+        roots = self.deduplicate_roots(roots)
+
+        return [Interval(root - self.step, root + self.step) for root in roots]
+
+    def prescan_initial_guesses(self, derivative: Function, x_values: np.ndarray) -> np.ndarray:
+        """
+        Оставляет только стартовые точки в ячейках сетки, где f' меняет знак.
+        Каждая ячейка шага дополнительно дробится на prescan_refinement частей,
+        стартом служит конец ячейки с меньшим |f'|.
+
+        Два корня в одной ячейке знака на её концах не меняют, но дают локальный минимум |f'|
+        без смены знака. Окрестность каждого такого минимума ещё до minimum_refinement раз дробится
+        в prescan_refinement раз. Корни, которые ближе друг к другу, чем шаг самой мелкой сетки,
+        всё равно пропускаются, как и касание нуля без смены знака (это не экстремум).
+        """
+        if len(x_values) == 0:
+            return x_values
+        grid = np.linspace(x_values[0], x_values[-1] + self.step,
+                           len(x_values) * self.prescan_refinement + 1)[np.newaxis]
+        values = derivative.values_at(grid.ravel()).reshape(grid.shape)
+        starts = [self._bracketing_starts(grid, values)]
+        for _ in range(self.minimum_refinement):
+            rows, nodes = self._minimum_nodes(values)
+            if len(rows) == 0:
+                break
+            fractions = np.linspace(-1, 1, 2 * self.prescan_refinement + 1)
+            width = grid[rows, nodes + 1] - grid[rows, nodes]
+            grid = grid[rows, nodes][:, np.newaxis] + fractions * width[:, np.newaxis]
+            values = derivative.values_at(grid.ravel()).reshape(grid.shape)
+            starts.append(self._bracketing_starts(grid, values))
+        return np.concatenate(starts)
 
-        for x in x_values:
-            root = self.find_root(derivative, x)
-            if root is not None:
-                potential_intervals.append(Interval(root - self.step, root + self.step))
+    @staticmethod
+    def _bracketing_starts(grid: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Стартовые точки в ячейках со сменой знака; grid и values — строки независимых сеток."""
+        signs = np.sign(values)
+        finite = np.isfinite(values[:, :-1]) & np.isfinite(values[:, 1:])
+        bracketing = finite & ((signs[:, :-1] * signs[:, 1:] < 0) | (values[:, :-1] == 0))
+        rows, cells = np.nonzero(bracketing)
+        left_is_closer = np.abs(values[rows, cells]) <= np.abs(values[rows, cells + 1])
+        return np.where(left_is_closer, grid[rows, cells], grid[rows, cells + 1])
 
-        return potential_intervals
+    @staticmethod
+    def _minimum_nodes(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Внутренние узлы, где |f'| имеет локальный минимум, а знак f' на обеих соседних ячейках не меняется."""
+        magnitude = np.abs(values)
+        signs = np.sign(values)
+        inner = np.isfinite(values[:, :-2]) & np.isfinite(values[:, 1:-1]) & np.isfinite(values[:, 2:])
+        dips = (inner & (values[:, 1:-1] != 0)
+                & (magnitude[:, 1:-1] < magnitude[:, :-2]) & (magnitude[:, 1:-1] < magnitude[:, 2:])
+                & (signs[:, :-2] == signs[:, 1:-1]) & (signs[:, 1:-1] == signs[:, 2:]))
+        rows, nodes = np.nonzero(dips)
+        return rows, nodes + 1
+
+    def find_roots(self, derivative: Function, initial_guesses: np.ndarray) -> np.ndarray:
+        roots = [self.find_root(derivative, x) for x in initial_guesses]
+        return np.array([root for root in roots if root is not None], dtype=float)
+
+    def deduplicate_roots(self, roots: np.ndarray) -> np.ndarray:
+        """Сливает корни, найденные из разных стартовых точек, в кластеры шириной cluster_tolerance."""
+        if len(roots) == 0:
+            return roots
+        roots = np.sort(roots)
+        cluster_ids = np.concatenate(([0], np.cumsum(np.diff(roots) > self.cluster_tolerance)))
+        counts = np.bincount(cluster_ids)
+        return np.bincount(cluster_ids, weights=roots) / counts
 
     @abstractmethod
     def find_root(self, derivative: Function, initial_guess: float) -> Optional[float]:
@@ -326,3 +1050,37 @@ class NewtonExtremumIntervalDetector(ExtremumIntervalDetector):
             x -= f_prime_x / f_double_prime_x
         return None
 
+    @override
+    def find_roots(self, derivative: Function, initial_guesses: np.ndarray, tolerance: float = 1e-5,
+                   max_iterations: int = 1000) -> np.ndarray:
+        """
+        Метод Ньютона сразу для всех стартовых точек: каждая точка — отдельная «дорожка»
+        со своей маской сходимости. Дорожки, ушедшие за пределы области поиска
+        (с запасом в один шаг) или получившие f'' = 0 / нечисловое значение, отбрасываются.
+        """
+        second_derivative = derivative.derivative()
+        x = np.array(initial_guesses, dtype=float)
+        active = np.ones(len(x), dtype=bool)
+        converged = np.zeros(len(x), dtype=bool)
+        lower = self.search_interval.from_() - self.step
+        upper = self.search_interval.to() + self.step
+
+        for _ in range(max_iterations):
+            lanes = np.flatnonzero(active)
+            if len(lanes) == 0:
+                break
+            x_lanes = x[lanes]
+            f_prime = derivative.values_at(x_lanes)
+            done = np.abs(f_prime) < tolerance
+            converged[lanes[done]] = True
+
+            f_double_prime = second_derivative.values_at(x_lanes)
+            stepping = ~done & np.isfinite(f_prime) & np.isfinite(f_double_prime) & (f_double_prime != 0)
+            x_next = x_lanes[stepping] - f_prime[stepping] / f_double_prime[stepping]
+            x[lanes[stepping]] = x_next
+
+            inside = (x_next >= lower) & (x_next <= upper)
+            active[lanes[~stepping]] = False
+            active[lanes[stepping][~inside]] = False
+
+        return x[converged]
@@ -1,4 +1,8 @@
+import argparse
+import json
+import time
 import matplotlib.pyplot as plt
+from functools import partial
 from core import *
 
 
@@ -53,41 +57,53 @@ def script_four():
         except Exception as e:
             print(e)
 
-def main():
+def script_five():
+    functions = [Functions.lab_function(), Functions.lab_function().derivative(),
+                 Functions.new_from_string("math.sin(x**2)"), Functions.new_from_string("x * math.exp(x)")]
+    interval = Interval(-10, 20)
+
+    for i, function in enumerate(functions):
+        GraphBuilder(function, interval, adaptive=True, max_evaluations=2048).save(f"graph_{i}.png")
+
+def main(records_path: str = None):
     function = Functions.lab_function()
     # function = Functions.new_from_lambda(lambda x: x ** 3)
     search_interval = Interval(-10, 20)
     finder = NewtonExtremumIntervalDetector(function, search_interval=search_interval)
     intervals = finder.find_extremum_intervals()
-    graph_function = GraphBuilder(function, search_interval, 0.01)
+    graph_function = GraphBuilder(function, search_interval, adaptive=True)
     graph_function.build()
 
     epsilons = [1e-2, 1e-3, 1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10, 1e-11, 1e-12, 1e-13, 1e-14, 1e-15]
 
-    golden_context = LimitedIterationalContext(max_iterations=200_000)
-    dichotomy_context = LimitedIterationalContext(max_iterations=200_000)
-
-    golden_method = GoldenSectionMethod(golden_context)
-    dichotomy_method = DichotomyMethod(dichotomy_context)
-
-    print(f"{'Точность':<10} {'Золотое сечение':<20} {'Дихотомия':<10}")
+    context_factory = partial(LimitedIterationalContext, max_iterations=200_000, timer=time.perf_counter)
+    methods = {
+        "Золотое сечение": GoldenSectionMethod,
+        "Дихотомия": DichotomyMethod,
+        "Брент": BrentMethod,
+        "Ньютон": SafeguardedNewtonMethod,
+        "Фибоначчи": FibonacciMethod,
+    }
+    results = {name: BatchExtremumFinder(method, context_factory).find_extrema(function, intervals, epsilons)
+               for name, method in methods.items()}
+
+    print(results["Брент"].for_epsilon(epsilons[-1]))
+
+    # в ячейке: итераций / вычислений (f и её производных)
+    print(f"{'Точность':<10} " + " ".join(f"{name:<18}" for name in methods))
     for epsilon in epsilons:
-        golden_context.drop_iterations()
-        dichotomy_context.drop_iterations()
-        
-        for interval in intervals:
-            try:
-                golden_method.find_extremum(function, interval, epsilon)
-            except Exception as e:
-                pass
-            
-            try:
-                dichotomy_method.find_extremum(function, interval, epsilon)
-            except Exception as e:
-                pass
-        
-        print(f"{epsilon:<10} {golden_context.get_iteration_count():<20} {dichotomy_context.get_iteration_count():<10}")
+        cells = []
+        for name in methods:
+            batch = results[name].for_epsilon(epsilon)
+            cells.append(f"{f'{batch.total_iterations()} / {batch.total_evaluations()}':<18}")
+        print(f"{epsilon:<10} " + " ".join(cells))
 
+    if records_path is not None:
+        records = [record for batch in results.values() for record in batch.to_records()]
+        with open(records_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False, indent=2)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Поиск экстремумов лабораторной функции разными методами")
+    parser.add_argument("--records", help="JSON-файл для записей пакетного поиска по всем методам")
+    main(parser.parse_args().records)
@@ -0,0 +1,211 @@
+import unittest
+import numpy as np
+from core import (AdaptiveSampler, BatchExtremumFinder, BrentMethod, CachedFunction, DichotomyMethod, FibonacciMethod,
+                  Functions, GoldenSectionMethod, Interval, Maximum, Minimum, NewtonExtremumIntervalDetector, SafeguardedNewtonMethod,
+                  UnlimitedIterationalContext)
+
+
+class TestAdaptiveSampler(unittest.TestCase):
+    def test_steep_function_is_refined_where_values_are_small(self):
+        """
+        У x·e^x на [-10, 20] размах ~1e10, но при x < 15 точки всё равно добавляются,
+        и линейная интерполяция по выборке близка к функции в относительной мере.
+        """
+        function = Functions.new_from_string("x * math.exp(x)")
+        x, y = AdaptiveSampler(function, Interval(-10, 20)).sample()
+        uniform = np.linspace(-10, 20, 129)
+        self.assertGreater(np.sum(x < 0), 2 * np.sum(uniform < 0))
+
+        xs = np.linspace(-10, 0, 2001)
+        expected = function.values_at(xs)
+        error = np.max(np.abs(np.interp(xs, x, y) - expected)) / np.max(np.abs(expected))
+        self.assertLess(error, 1e-3)
+
+    def test_linear_function_is_not_refined(self):
+        """
+        Прямая не дробится: выборка остаётся равномерной сеткой плюс одна проверочная середина на отрезок.
+        """
+        x, _ = AdaptiveSampler(Functions.new_from_string("2 * x + 1"), Interval(0, 1), initial_points=17).sample()
+        self.assertEqual(len(x), 33)
+
+
+class TestCachedFunction(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.function = CachedFunction(Functions.new_from_lambda(lambda x: self.calls.append(x) or x * x), max_size=2)
+
+    def test_cache_is_bounded_and_evicts_least_recently_used(self):
+        """
+        Кэш на две точки: повторный запрос точки 1 освежает её, поэтому точка 3 вытесняет 2, а не 1.
+        """
+        for x in (1.0, 2.0, 1.0, 3.0, 1.0, 2.0):
+            self.function.value_at(x)
+        self.assertEqual(self.calls, [1.0, 2.0, 3.0, 2.0])
+        self.assertEqual(self.function.get_call_count(), 6)
+        self.assertEqual(self.function.get_evaluation_count(), 4)
+        self.assertEqual(self.function.get_hit_count(), 2)
+        self.assertLessEqual(len(self.function._cache), 2)
+
+    def test_clear_drops_cache_and_counters(self):
+        self.function.value_at(1.0)
+        self.function.clear()
+        self.assertEqual(self.function.get_call_count(), 0)
+        self.function.value_at(1.0)
+        self.assertEqual(self.function.get_evaluation_count(), 1)
+        self.assertEqual(self.calls, [1.0, 1.0])
+
+    def test_derivative_is_memoized(self):
+        """
+        derivative() возвращает один и тот же кэш, и его вычисления входят в общий счёт.
+        """
+        function = CachedFunction(Functions.new_from_string("x**3"))
+        derivative = function.derivative()
+        self.assertIs(function.derivative(), derivative)
+        self.assertIsInstance(derivative, CachedFunction)
+        self.assertAlmostEqual(derivative.value_at(2.0), 12.0, places=5)
+        derivative.value_at(2.0)
+        self.assertEqual(derivative.get_hit_count(), 1)
+        self.assertEqual(function.get_total_evaluation_count(), derivative.get_evaluation_count())
+
+    def test_invalid_size_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CachedFunction(Functions.lab_function(), max_size=0)
+
+
+class TestProbeReuse(unittest.TestCase):
+    def setUp(self):
+        self.function = CachedFunction(Functions.new_from_string("(x - 1.3)**2 + 2"))
+        self.context = UnlimitedIterationalContext()
+
+    def test_golden_section_evaluates_one_new_point_per_iteration(self):
+        """
+        Золотое сечение: две начальные точки, затем одна новая на итерацию — без попаданий в кэш,
+        то есть вторая внутренняя точка переносится, а не пересчитывается.
+        """
+        extremum = GoldenSectionMethod(self.context).run(self.function, Interval(0, 3), 1e-6)
+        self.assertAlmostEqual(extremum.point, 1.3, delta=1e-6)
+        self.assertEqual(self.function.get_call_count(), self.context.get_iteration_count() + 2)
+        self.assertEqual(self.function.get_hit_count(), 0)
+
+    def test_dichotomy_does_not_evaluate_after_last_iteration(self):
+        """
+        Дихотомия: две пробные точки на итерацию, результат — последняя из них без лишнего value_at.
+        """
+        extremum = DichotomyMethod(self.context).run(self.function, Interval(0, 3), 1e-6)
+        self.assertAlmostEqual(extremum.point, 1.3, delta=1e-5)
+        self.assertEqual(self.function.get_call_count(), 2 * self.context.get_iteration_count())
+        self.assertEqual(extremum.value, self.function.function.value_at(extremum.point))
+
+
+class TestBracketingMethods(unittest.TestCase):
+    METHODS = (BrentMethod, FibonacciMethod, SafeguardedNewtonMethod)
+
+    def test_minimum_of_lab_function(self):
+        """
+        Минимум x·e^x·sin²x на [-2.5, -0.5] в x ≈ -1.4231988, где f'(x) = 0.
+        """
+        function = Functions.lab_function()
+        for method in self.METHODS:
+            with self.subTest(method=method.__name__):
+                extremum = method(UnlimitedIterationalContext()).run(function, Interval(-2.5, -0.5), 1e-9)
+                self.assertIsInstance(extremum, Minimum)
+                self.assertAlmostEqual(extremum.point, -1.4231988, places=6)
+                self.assertAlmostEqual(extremum.value, function.value_at(extremum.point), places=12)
+                self.assertLess(abs(function.derivative().value_at(extremum.point)), 1e-6)
+
+    def test_maximum_is_detected_by_derivative_signs(self):
+        function = Functions.new_from_string("2 - (x - 1.3)**2")
+        for method in self.METHODS:
+            with self.subTest(method=method.__name__):
+                extremum = method(UnlimitedIterationalContext()).run(function, Interval(0, 3), 1e-8)
+                self.assertIsInstance(extremum, Maximum)
+                self.assertAlmostEqual(extremum.point, 1.3, places=6)
+                self.assertAlmostEqual(extremum.value, 2.0, places=10)
+
+    def test_monotonic_interval_has_no_extremum(self):
+        function = Functions.new_from_string("x**3 + x")
+        for method in self.METHODS:
+            with self.subTest(method=method.__name__):
+                with self.assertRaises(Exception):
+                    method(UnlimitedIterationalContext()).run(function, Interval(0, 3), 1e-8)
+
+    def test_fibonacci_spends_exactly_its_budget(self):
+        """
+        Метод Фибоначчи вычисляет функцию ровно n раз, где F_n — первое число не меньше (b - a) / epsilon.
+        """
+        function = CachedFunction(Functions.new_from_string("(x - 1.3)**2 + 2"))
+        extremum = FibonacciMethod(UnlimitedIterationalContext()).run(function, Interval(0, 3), 1e-6)
+        self.assertAlmostEqual(extremum.point, 1.3, delta=1e-6)
+        self.assertEqual(function.get_evaluation_count(), FibonacciMethod.evaluations_for(3, 1e-6))
+
+        function.clear()
+        FibonacciMethod(UnlimitedIterationalContext(), evaluation_budget=10).run(function, Interval(0, 3))
+        self.assertEqual(function.get_evaluation_count(), 10)
+
+
+class TestIterationalContext(unittest.TestCase):
+    def test_context_counts_real_evaluations_like_cached_function(self):
+        """
+        Счёт вычислений контекста совпадает с CachedFunction: попадания в кэш не считаются.
+        """
+        function = CachedFunction(Functions.lab_function())
+        context = UnlimitedIterationalContext(count_evaluations=True)
+        extremum = GoldenSectionMethod(context).run(function, Interval(-2, 0), 1e-8)
+        self.assertIsNotNone(extremum)
+        self.assertGreater(context.get_evaluation_count(), 0)
+        self.assertEqual(context.get_evaluation_count(), function.get_total_evaluation_count())
+
+    def test_context_wraps_plain_function(self):
+        context = UnlimitedIterationalContext(count_evaluations=True)
+        GoldenSectionMethod(context).run(Functions.lab_function(), Interval(-2, 0), 1e-8)
+        self.assertGreater(context.get_evaluation_count(), 0)
+
+
+class TestBatchExtremumFinder(unittest.TestCase):
+    def test_pool_matches_sequential_runs(self):
+        """
+        Таблица пула процессов совпадает с поштучными вызовами: точка, значение, число итераций и вычислений
+        каждой задачи; отрезок без экстремума даёт строку с ошибкой, а не прерывает пакет.
+        """
+        function = Functions.lab_function()
+        intervals = [Interval(-2.5, -0.5), Interval(-5, -3.5), Interval(0.5, 1.5)]
+        epsilons = [1e-3, 1e-6]
+        batch = BatchExtremumFinder(GoldenSectionMethod, max_workers=2).find_extrema(function, intervals, epsilons)
+        self.assertEqual(len(batch), len(intervals) * len(epsilons))
+
+        for result in batch:
+            with self.subTest(interval=str(result.task.interval), epsilon=result.task.epsilon):
+                context = UnlimitedIterationalContext()
+                cached = CachedFunction(function)
+                try:
+                    extremum = GoldenSectionMethod(context).run(cached, result.task.interval, result.task.epsilon)
+                except Exception as e:
+                    self.assertFalse(result.is_found())
+                    self.assertEqual(result.error, str(e))
+                    continue
+                self.assertIs(type(result.extremum), type(extremum))
+                self.assertEqual(result.extremum.point, extremum.point)
+                self.assertEqual(result.extremum.value, extremum.value)
+                self.assertEqual(result.iterations, context.get_iteration_count())
+                self.assertEqual(result.evaluations, cached.get_total_evaluation_count())
+        self.assertEqual(len(batch.extrema()), 4)
+
+
+class TestExtremumIntervalDetector(unittest.TestCase):
+    def test_two_roots_in_one_prescan_cell_are_found(self):
+        """
+        f'(x) = (x − 1.1)² − 0.05² имеет корни 1.05 и 1.15 в одной ячейке предварительной сетки
+        (шаг 3 / 8): знак на концах ячейки одинаков, корни находятся дроблением у минимума |f'|.
+        """
+        function = Functions.new_from_string("(x - 1.1)**3 / 3 - 0.0025 * x")
+        detector = NewtonExtremumIntervalDetector(function, search_interval=Interval(-10, 20))
+        centers = [interval.from_() + detector.step for interval in detector.find_extremum_intervals()]
+        np.testing.assert_allclose(centers, [1.05, 1.15], atol=1e-4)
+
+    def test_conditional_expression_falls_back_to_scalar_evaluation(self):
+        function = Functions.new_from_string("x if x > 0 else -x")
+        np.testing.assert_allclose(function.values_at(np.array([-1.0, 2.0])), [1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.integrate import DOP853, LSODA, RK45, Radau
+
+from task2 import system_ode
+from task4 import predator_prey_system
+
+SOLVERS = {"RK45": RK45, "DOP853": DOP853, "LSODA": LSODA, "Radau": Radau}
+
+
+class EnsembleSummary:
+    """
+    Итоги интегрирования ансамбля, по строке на набор параметров.
+
+    Статистики считаются по равномерным отсчётам после переходного процесса:
+    mean, minimum, maximum, amplitude ((max − min) / 2) — массивы (n_members, dim);
+    period — средний интервал между максимумами первой компоненты (NaN, если максимумов < 2);
+    converged — колебания затухли (амплитуда < equilibrium_tolerance), тогда equilibrium — конечное
+    состояние, иначе NaN; diverged — решение вышло за blowup_limit или стало нечисловым.
+    """
+
+    def __init__(self, params, final_state, mean, minimum, maximum, period, peak_count, converged,
+                 diverged, nfev=0):
+        self.params = params
+        self.final_state = final_state
+        self.mean = mean
+        self.minimum = minimum
+        self.maximum = maximum
+        self.period = period
+        self.peak_count = peak_count
+        self.converged = converged
+        self.diverged = diverged
+        self.nfev = nfev
+
+    @property
+    def amplitude(self):
+        return (self.maximum - self.minimum) / 2
+
+    @property
+    def equilibrium(self):
+        return np.where(self.converged[:, None], self.final_state, np.nan)
+
+    def __len__(self):
+        return len(self.params)
+
+    @staticmethod
+    def concatenate(parts):
+        fields = ("params", "final_state", "mean", "minimum", "maximum", "period", "peak_count",
+                  "converged", "diverged")
+        merged = {field: np.concatenate([getattr(part, field) for part in parts]) for field in fields}
+        return EnsembleSummary(nfev=sum(part.nfev for part in parts), **merged)
+
+    def to_records(self, param_names=None, state_names=None):
+        param_names = param_names or [f"p{i}" for i in range(self.params.shape[1])]
+        state_names = state_names or [f"y{i}" for i in range(self.mean.shape[1])]
+        records = []
+        for i in range(len(self)):
+            record = dict(zip(param_names, self.params[i].tolist()))
+            record.update(period=float(self.period[i]), converged=bool(self.converged[i]),
+                          diverged=bool(self.diverged[i]))
+            for j, name in enumerate(state_names):
+                record[f"mean_{name}"] = float(self.mean[i, j])
+                record[f"amplitude_{name}"] = float(self.amplitude[i, j])
+                record[f"equilibrium_{name}"] = float(self.equilibrium[i, j])
+            records.append(record)
+        return records
+
+
+class _OnlineStatistics:
+    """Накопление статистик по отсчётам (dim, n) без хранения траекторий."""
+
+    def __init__(self, dim, n):
+        self.count = 0
+        self.total = np.zeros((dim, n))
+        self.minimum = np.full((dim, n), np.inf)
+        self.maximum = np.full((dim, n), -np.inf)
+        self.peak_count = np.zeros(n, dtype=int)
+        self.first_peak = np.full(n, np.nan)
+        self.last_peak = np.full(n, np.nan)
+        self._previous = None     # (t, значения первой компоненты) двух предыдущих отсчётов
+
+    def add(self, t, values):
+        self.count += 1
+        self.total += values
+        np.minimum(self.minimum, values, out=self.minimum)
+        np.maximum(self.maximum, values, out=self.maximum)
+        current = values[0]
+        if self._previous is not None and len(self._previous) == 2:
+            (t0, v0), (t1, v1) = self._previous
+            peak = (v1 > v0) & (v1 >= current)
+            if np.any(peak):
+                # вершина параболы через три отсчёта
+                denominator = v0 - 2 * v1 + current
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    shift = np.where(denominator != 0, 0.5 * (v0 - current) / denominator, 0.0)
+                peak_time = t1 + np.clip(shift, -1, 1) * (t - t1)
+                self.first_peak = np.where(peak & np.isnan(self.first_peak), peak_time, self.first_peak)
+                self.last_peak = np.where(peak, peak_time, self.last_peak)
+                self.peak_count += peak
+            self._previous = [self._previous[1], (t, current.copy())]
+        else:
+            self._previous = (self._previous or []) + [(t, current.copy())]
+
+
+def _integrate_chunk(ode_func, t_span, y0, params, method, rtol, atol, sample_count, transient,
+                     equilibrium_tolerance, blowup_limit):
+    n, dim = y0.shape
+    columns = [params[:, k] for k in range(params.shape[1])]
+    active = np.ones(n, dtype=bool)
+    # последнее состояние каждого члена в пределах blowup_limit; для разошедшихся — их замороженное значение
+    frozen = np.ascontiguousarray(y0.T, dtype=float)
+
+    def fun(t, flat):
+        state = flat.reshape(dim, n)
+        # член, вышедший за предел (в том числе на промежуточной стадии шага), не двигается и
+        # считается в конечной точке: inf и NaN не попадают в общую норму ошибки блока
+        within = active & np.all(np.isfinite(state), axis=0) & np.all(np.abs(state) <= blowup_limit, axis=0)
+        with np.errstate(all="ignore"):
+            derivative = np.asarray(ode_func(t, np.where(within, state, frozen), *columns), dtype=float)
+        derivative = derivative.reshape(dim, n)
+        within &= np.all(np.isfinite(derivative), axis=0)
+        return np.where(within, derivative, 0.0).ravel()
+
+    def start(t, state, first_step=None):
+        options = {} if first_step is None else {"first_step": first_step}
+        return SOLVERS[method](fun, t, state.ravel().copy(), t_span[1], rtol=rtol, atol=atol, **options)
+
+    solver = start(t_span[0], frozen)
+    t_start = t_span[0] + transient * (t_span[1] - t_span[0])
+    samples = np.linspace(t_start, t_span[1], sample_count)
+    statistics = _OnlineStatistics(dim, n)
+    diverged = np.zeros(n, dtype=bool)
+    next_sample = 0
+    nfev = 0
+
+    while solver.status == "running":
+        previous = solver.y.reshape(dim, n).copy()
+        solver.step()
+        if solver.status == "failed":
+            raise RuntimeError(f"Интегрирование ансамбля прервано: t = {solver.t}")
+        state = solver.y.reshape(dim, n)
+        stop = np.searchsorted(samples, solver.t, side="right")
+        if stop > next_sample:
+            interpolant = solver.dense_output()
+            for t in samples[next_sample:stop]:
+                statistics.add(t, np.where(active, interpolant(t).reshape(dim, n), frozen))
+            next_sample = stop
+        bad = active & (~np.all(np.isfinite(state), axis=0) | np.any(np.abs(state) > blowup_limit, axis=0))
+        if np.any(bad):
+            # разошедшиеся члены замораживаются в последнем состоянии до выхода за предел, а решатель
+            # перезапускается с того же момента: иначе их inf/NaN остаются в solver.y и портят шаг остальным
+            diverged |= bad
+            active &= ~bad
+            frozen[:, bad] = previous[:, bad]
+            if solver.status == "running":
+                nfev += solver.nfev
+                solver = start(solver.t, np.where(active, state, frozen), solver.step_size)
+            else:
+                solver.y = np.where(active, state, frozen).ravel()
+        frozen[:, active] = solver.y.reshape(dim, n)[:, active]
+
+    mean = (statistics.total / max(statistics.count, 1)).T
+    minimum, maximum = statistics.minimum.T, statistics.maximum.T
+    spread = np.max((maximum - minimum) / (1 + np.abs(mean)), axis=1)
+    converged = (spread < equilibrium_tolerance) & ~diverged
+    with np.errstate(invalid="ignore", divide="ignore"):
+        period = np.where(statistics.peak_count >= 2,
+                          (statistics.last_peak - statistics.first_peak) / (statistics.peak_count - 1), np.nan)
+    period = np.where(converged | diverged, np.nan, period)
+    final_state = solver.y.reshape(dim, n).T.copy()
+    return EnsembleSummary(params, final_state, mean, minimum, maximum, period, statistics.peak_count,
+                           converged, diverged, nfev + solver.nfev)
+
+
+def integrate_ensemble(ode_func, t_span, y0, param_sets, method="RK45", rtol=1e-6, atol=1e-9,
+                       sample_count=2000, transient=0.5, chunk_size=256, use_processes=True, max_workers=None,
+                       equilibrium_tolerance=1e-4, blowup_limit=1e8):
+    """
+    Интегрирует систему для N наборов параметров и возвращает сводку по каждому.
+
+    Члены ансамбля складываются в один вектор состояния формы (dim, chunk): ode_func вызывается
+    один раз на шаг для всего блока, поэтому она должна работать поэлементно — как
+    task2.system_ode и task4.predator_prey_system (Y[k] и параметры — массивы длины chunk).
+    Блоки по chunk_size членов интегрируются независимо в пуле процессов (общий шаг внутри блока
+    выбирается по самому «трудному» члену, поэтому большие блоки выгодны для похожих параметров).
+    Плотный вывод не хранится: статистики копятся по отсчётам на [t0 + transient·T, t_end].
+
+    :param y0: начальное состояние (dim,) для всех членов или (N, dim)
+    :param param_sets: массив (N, p) — параметры в порядке аргументов ode_func после (t, Y)
+    :return: EnsembleSummary
+    """
+    param_sets = np.atleast_2d(np.asarray(param_sets, dtype=float))
+    n = len(param_sets)
+    y0 = np.asarray(y0, dtype=float)
+    y0 = np.broadcast_to(y0, (n, y0.shape[-1])) if y0.ndim == 1 else y0
+    if len(y0) != n:
+        raise ValueError("Число начальных условий не совпадает с числом наборов параметров")
+    if method not in SOLVERS:
+        raise ValueError(f"Неизвестный метод {method}; доступны {', '.join(SOLVERS)}")
+
+    bounds = range(0, n, chunk_size)
+    arguments = [(ode_func, t_span, np.ascontiguousarray(y0[i:i + chunk_size]), param_sets[i:i + chunk_size],
+                  method, rtol, atol, sample_count, transient, equilibrium_tolerance, blowup_limit)
+                 for i in bounds]
+    if use_processes and len(arguments) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            parts = list(executor.map(_integrate_chunk, *zip(*arguments)))
+    else:
+        parts = [_integrate_chunk(*chunk) for chunk in arguments]
+    return EnsembleSummary.concatenate(parts)
+
+
+def predator_prey_equilibrium(r1, lambda1, lambda2, beta2, g1):
+    """Точка сосуществования хищника и жертвы: x* = β2/λ2, y* = (r1 − g1·x*)/λ1."""
+    x = beta2 / lambda2
+    return np.stack((np.broadcast_to(x, np.shape(r1 - g1 * x)), (r1 - g1 * x) / lambda1), axis=-1)
+
+
+def main():
+    # хищник-жертва (task4): сетка по конкуренции g1 и скорости поедания lambda1
+    g1, lambda1 = np.meshgrid(np.linspace(0, 0.01, 25), np.linspace(0.005, 0.02, 40))
+    count = g1.size
+    params = np.column_stack((np.full(count, 0.5), lambda1.ravel(), np.full(count, 0.01),
+                              np.full(count, 0.2), g1.ravel()))
+    summary = integrate_ensemble(predator_prey_system, (0, 1000), [25, 5], params)
+    analytic = predator_prey_equilibrium(*params.T)
+    converged = summary.converged
+    print(f"Хищник-жертва: {count} наборов, вычислений f: {summary.nfev}")
+    print(f"  сошлись к равновесию: {converged.sum()}, "
+          f"макс. отклонение от x*, y*: {np.nanmax(np.abs(summary.equilibrium[converged] - analytic[converged]), initial=0):.3g}")
+    oscillating = ~converged & ~summary.diverged
+    print(f"  колеблются: {oscillating.sum()}, период от {np.nanmin(summary.period[oscillating], initial=np.nan):.4g} "
+          f"до {np.nanmax(summary.period[oscillating], initial=np.nan):.4g}")
+
+    # система task2: сетка по (a, c) при b = 0.2; её решения уходят на амплитуды ~1e6,
+    # поэтому такие члены останавливаются раньше по blowup_limit
+    a, c = np.meshgrid(np.linspace(0.1, 0.3, 10), np.linspace(2, 6, 10))
+    params = np.column_stack((a.ravel(), np.full(a.size, 0.2), c.ravel()))
+    summary = integrate_ensemble(system_ode, (0, 100), [1, 1, 1], params, chunk_size=25, blowup_limit=1e3)
+    print(f"Система task2: {len(summary)} наборов, вычислений f: {summary.nfev}, "
+          f"разошлись: {summary.diverged.sum()}, сошлись: {summary.converged.sum()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import logging
+
+import numpy as np
+from scipy.integrate import RK45, OdeSolution, solve_ivp
+from scipy.optimize import OptimizeResult
+
+logger = logging.getLogger(__name__)
+
+# rtol ниже 100·eps solve_ivp всё равно поднимает до этого значения; atol ниже ~1e-14 для
+# величин порядка единицы недостижим в double и лишь дробит шаг
+MIN_RTOL = 100 * np.finfo(float).eps
+MIN_ATOL = 1e-14
+
+# область устойчивости RK45 на отрицательной полуоси: |h·λ| <= ~3.3
+RK45_STABILITY_LIMIT = 3.3
+
+
+def clamp_tolerances(rtol, atol):
+    """
+    Приводит допуски к достижимым в двойной точности значениям.
+
+    :return: (rtol, atol, были ли изменения)
+    """
+    clamped_rtol = max(rtol, MIN_RTOL)
+    clamped_atol = np.maximum(atol, MIN_ATOL)
+    changed = clamped_rtol != rtol or np.any(clamped_atol != atol)
+    return clamped_rtol, clamped_atol, bool(changed)
+
+
+class SolverChoice:
+    """
+    Выбранный метод и причина выбора.
+
+    :param method: имя метода solve_ivp
+    :param stiffness: оценка жёсткости — max(−Re λ)·(t_end − t0) по якобиану или
+                      отношение «шагов по устойчивости» к длине интервала по пробному RK45
+    :param reason: текстовое пояснение
+    :param trial: пробный прогон RK45 (TrialRun) или None; его вычисления входят в nfev итогового решения
+    """
+
+    def __init__(self, method, rtol, atol, jac, stiffness, reason, tolerances_clamped=False, trial=None,
+                 trial_njev=0):
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.jac = jac
+        self.stiffness = stiffness
+        self.reason = reason
+        self.tolerances_clamped = tolerances_clamped
+        self.trial = trial
+        self.trial_njev = trial_njev
+
+    def __str__(self):
+        clamped = ", допуски ограничены" if self.tolerances_clamped else ""
+        return (f"{self.method} (rtol={self.rtol:g}, atol={np.max(self.atol):g}, "
+                f"жёсткость≈{self.stiffness:.3g}{clamped}): {self.reason}")
+
+
+def jacobian_stiffness(jac, t_span, y0, probes=None):
+    """
+    Жёсткость по спектру якобиана: max(−Re λ)·(t_end − t0) по точкам probes (по умолчанию — y0).
+    Величина порядка числа шагов, которые явному методу придётся сделать только ради устойчивости.
+    """
+    probes = [(t_span[0], y0)] if probes is None else probes
+    decay = 0.0
+    for t, y in probes:
+        eigenvalues = np.linalg.eigvals(np.atleast_2d(jac(t, np.asarray(y, dtype=float))))
+        decay = max(decay, float(np.max(-eigenvalues.real, initial=0.0)))
+    return decay * abs(t_span[1] - t_span[0])
+
+
+class TrialRun:
+    """
+    Шаги пробного RK45: моменты, состояния и локальные интерполянты (не больше max_steps).
+    Если прогон дошёл до конца интервала, из него собирается готовый результат solve_ivp.
+    """
+
+    def __init__(self, solver, ts, ys, interpolants):
+        self.solver = solver
+        self.ts = ts
+        self.ys = ys
+        self.interpolants = interpolants
+
+    @property
+    def nfev(self):
+        return self.solver.nfev
+
+    @property
+    def finished(self):
+        return self.solver.status == "finished"
+
+    def to_result(self, t_eval=None, dense_output=False):
+        """Результат в формате solve_ivp (для законченного прогона)."""
+        solution = OdeSolution(np.array(self.ts), self.interpolants) if len(self.interpolants) else None
+        if t_eval is None:
+            t, y = np.array(self.ts), np.column_stack(self.ys)
+        else:
+            t = np.asarray(t_eval, dtype=float)
+            y = solution(t) if solution is not None else np.repeat(self.ys[0][:, None], len(t), axis=1)
+        return OptimizeResult(t=t, y=y, sol=solution if dense_output else None, t_events=None, y_events=None,
+                              nfev=self.nfev, njev=0, nlu=0, status=0,
+                              message="The solver successfully reached the end of the integration interval.",
+                              success=True)
+
+
+def trial_stiffness(fun, t_span, y0, rtol, atol, max_steps=200):
+    """
+    Жёсткость по поведению шага пробного RK45 на max_steps шагах.
+
+    На жёсткой задаче RK45 упирается в область устойчивости: шаг почти не растёт, а часть
+    шагов отбрасывается. Возвращает (прогноз числа шагов на весь интервал, доля отброшенных шагов,
+    пробные точки (t, y) для оценки якобиана, TrialRun).
+    """
+    solver = RK45(fun, t_span[0], np.asarray(y0, dtype=float), t_span[1], rtol=rtol, atol=atol)
+    steps, probes = [], []
+    trial = TrialRun(solver, [solver.t], [solver.y.copy()], [])
+    while solver.status == "running" and len(steps) < max_steps:
+        t_old = solver.t
+        solver.step()
+        steps.append(solver.t - t_old)
+        probes.append((solver.t, solver.y.copy()))
+        trial.ts.append(solver.t)
+        trial.ys.append(solver.y.copy())
+        trial.interpolants.append(solver.dense_output())
+    # якобиан достаточно оценить в нескольких точках пробного прогона
+    probes = probes[::max(1, len(probes) // 5)]
+    if not steps or solver.status == "finished":
+        return float(len(steps)), 0.0, probes, trial
+    covered = abs(solver.t - t_span[0])
+    projected = len(steps) * abs(t_span[1] - t_span[0]) / max(covered, np.finfo(float).tiny)
+    # scipy RK45 тратит 2 вычисления на старт и 6 на каждую попытку шага: лишние — отказы
+    rejected = max(solver.nfev - 2 - 6 * len(steps), 0) / 6
+    return projected, rejected / (len(steps) + rejected), probes, trial
+
+
+def choose_solver(fun, t_span, y0, jac=None, rtol=1e-3, atol=1e-6, stiff_threshold=1e4, trial_steps=200):
+    """
+    Выбор метода solve_ivp:
+
+      - жёсткая задача (спектр якобиана или пробный RK45 показывают, что шаг ограничен
+        устойчивостью) — Radau (5-й порядок) при rtol <= 1e-8, иначе LSODA; якобиан, если задан,
+        передаётся обоим;
+      - нежёсткая — DOP853 при rtol <= 1e-8;
+      - пограничный случай (явному методу нужно много шагов, но жёсткость не подтверждена) —
+        LSODA, который сам переключается между Адамсом и BDF;
+      - иначе RK45.
+
+    :param stiff_threshold: порог оценки жёсткости (число «лишних» шагов явного метода)
+    """
+    rtol, atol, clamped = clamp_tolerances(rtol, atol)
+    projected, rejected_share, probes, trial = trial_stiffness(fun, t_span, y0, rtol, atol, trial_steps)
+    trial_njev = 0
+    if jac is not None:
+        stiffness = jacobian_stiffness(jac, t_span, y0, [(t_span[0], y0)] + probes)
+        trial_njev = 1 + len(probes)
+        # явный шаг не может превысить 3.3/max|Re λ|: отношение к прогнозу RK45 — доля «стабилизационных» шагов
+        stiff = stiffness / RK45_STABILITY_LIMIT > stiff_threshold and stiffness / RK45_STABILITY_LIMIT > 0.5 * projected
+        source = "спектр якобиана"
+    else:
+        stiffness = projected
+        stiff = projected > stiff_threshold and rejected_share > 0.1
+        source = "пробный RK45"
+
+    if stiff:
+        method = "Radau" if rtol <= 1e-8 else "LSODA"
+        reason = f"жёсткая задача ({source})"
+    elif rtol <= 1e-8:
+        method = "DOP853"
+        reason = "нежёсткая задача, высокая точность"
+    elif projected > stiff_threshold:
+        method = "LSODA"
+        reason = f"много шагов явного метода ({projected:.3g}), жёсткость не подтверждена"
+    else:
+        method = "RK45"
+        reason = "нежёсткая задача"
+    return SolverChoice(method, rtol, atol, jac, stiffness, reason, clamped, trial, trial_njev)
+
+
+def solve_auto(fun, t_span, y0, jac=None, rtol=1e-3, atol=1e-6, method=None, **kwargs):
+    """
+    solve_ivp с автоматическим выбором метода (choose_solver) или заданным method.
+    Допуски по умолчанию те же, что у solve_ivp, и ограничиваются всегда. Якобиан передаётся неявным методам.
+
+    Если пробный RK45 уже дошёл до конца интервала и выбран RK45, повторного решения нет — результат
+    собирается из пробного прогона (для kwargs, кроме t_eval и dense_output, решение всё же повторяется).
+    Возвращает результат solve_ivp с полями choice (SolverChoice) и report (текст format_report);
+    nfev и njev включают пробный прогон. Отчёт пишется в журнал ode_solver на уровне INFO.
+    """
+    if method is None:
+        choice = choose_solver(fun, t_span, y0, jac, rtol, atol)
+    else:
+        rtol, atol, clamped = clamp_tolerances(rtol, atol)
+        choice = SolverChoice(method, rtol, atol, jac, float("nan"), "задан явно", clamped)
+    trial = choice.trial
+    if (trial is not None and trial.finished and choice.method == "RK45"
+            and set(kwargs) <= {"t_eval", "dense_output"}):
+        result = trial.to_result(kwargs.get("t_eval"), kwargs.get("dense_output", False))
+    else:
+        if choice.method in ("Radau", "BDF", "LSODA") and jac is not None:
+            kwargs["jac"] = jac
+        result = solve_ivp(fun, t_span, y0, method=choice.method, rtol=choice.rtol, atol=choice.atol, **kwargs)
+        result.nfev += trial.nfev if trial is not None else 0
+    result.njev += choice.trial_njev
+    result.choice = choice
+    result.report = format_report(result)
+    logger.info(result.report)
+    return result
+
+
+def format_report(result):
+    return (f"{result.choice}\n  вычислений f: {result.nfev}, якобиана: {result.njev}, "
+            f"LU-разложений: {result.nlu}, точек: {len(result.t)}, статус: {result.message}")
@@ -0,0 +1,265 @@
+import hashlib
+import os
+
+import numpy as np
+from scipy.integrate import BDF, DOP853, LSODA, RK23, RK45, Radau
+from scipy.optimize import brentq
+
+SOLVERS = {"RK23": RK23, "RK45": RK45, "DOP853": DOP853, "Radau": Radau, "BDF": BDF, "LSODA": LSODA}
+
+
+class Sample:
+    """Отсчёт решения в заданный момент t_eval."""
+
+    kind = "sample"
+
+    def __init__(self, index, t, y):
+        self.index = index
+        self.t = t
+        self.y = y
+
+
+class Event:
+    """Срабатывание события: name — имя события, t и y — момент и состояние."""
+
+    kind = "event"
+
+    def __init__(self, name, t, y):
+        self.name = name
+        self.t = t
+        self.y = y
+
+
+class EventSpec:
+    """
+    Событие g(t, y) = 0 как в solve_ivp: direction > 0 — только рост g через ноль,
+    direction < 0 — только убывание, 0 — любое пересечение.
+    """
+
+    def __init__(self, name, function, direction=0):
+        self.name = name
+        self.function = function
+        self.direction = direction
+
+
+def zero_crossing(component, level=0.0, direction=0, name=None):
+    """Пересечение компонентой уровня level."""
+    return EventSpec(name or f"y{component}={level:g}", lambda t, y: y[component] - level, direction)
+
+
+def local_maximum(fun, component, name=None):
+    """Локальный максимум компоненты: производная fun(t, y)[component] меняет знак с + на −."""
+    return EventSpec(name or f"max y{component}", lambda t, y: np.asarray(fun(t, y))[component], -1)
+
+
+def local_minimum(fun, component, name=None):
+    return EventSpec(name or f"min y{component}", lambda t, y: np.asarray(fun(t, y))[component], 1)
+
+
+def checkpoint_key(t_span, y0, t_eval, method, rtol, atol, events, extra=None):
+    """
+    Отпечаток задачи для контрольной точки: интервал, начальное состояние, сетка отсчётов, метод,
+    допуски, имена событий и extra (например, параметры системы — сама fun не сравнивается).
+    """
+    digest = hashlib.sha256()
+    for part in (tuple(map(float, t_span)), method, float(rtol), np.asarray(atol, dtype=float).tolist(),
+                 [event.name for event in events], repr(extra)):
+        digest.update(repr(part).encode())
+    digest.update(np.asarray(y0, dtype=float).tobytes())
+    digest.update(np.asarray(t_eval, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Состояние потокового интегрирования, достаточное для продолжения: момент, вектор состояния,
+    последний шаг, число выданных отсчётов, значения функций событий на конце шага и все найденные
+    события. key — отпечаток задачи (checkpoint_key), по нему отвергается чужая контрольная точка.
+    Сохраняется в .npz атомарно (через временный файл).
+    """
+
+    def __init__(self, t, y, step, next_sample, event_values, nfev=0, key="", events=()):
+        self.t = float(t)
+        self.y = np.asarray(y, dtype=float)
+        self.step = float(step)
+        self.next_sample = int(next_sample)
+        self.event_values = np.asarray(event_values, dtype=float)
+        self.nfev = int(nfev)
+        self.key = str(key)
+        self.events = list(events)
+
+    def save(self, path):
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, t=self.t, y=self.y, step=self.step, next_sample=self.next_sample,
+                 event_values=self.event_values, nfev=self.nfev, key=self.key,
+                 event_names=np.array([event.name for event in self.events], dtype=str),
+                 event_t=np.array([event.t for event in self.events], dtype=float),
+                 event_y=np.array([event.y for event in self.events], dtype=float).reshape(len(self.events), len(self.y)))
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as data:
+            events = [Event(str(name), float(t), y.copy())
+                      for name, t, y in zip(data["event_names"], data["event_t"], data["event_y"])]
+            return Checkpoint(data["t"], data["y"], data["step"], data["next_sample"], data["event_values"],
+                              data["nfev"], data["key"], events)
+
+
+def stream_solution(fun, t_span, y0, t_eval=None, events=(), method="RK45", rtol=1e-3, atol=1e-6, jac=None,
+                    checkpoint_path=None, checkpoint_every=1000, resume=False, checkpoint_extra=None, initial_nfev=0):
+    """
+    Генератор решения ОДУ без dense_output: после каждого шага решателя его локальный
+    интерполянт используется для отсчётов t_eval и поиска событий, а затем отбрасывается.
+    Память не зависит от длины интервала.
+
+    :param t_eval: возрастающие моменты выдачи отсчётов (Sample); None — только события
+    :param events: список EventSpec; моменты уточняются brentq по интерполянту шага
+    :param method: метод scipy (RK45, DOP853, Radau, BDF, LSODA, RK23)
+    :param checkpoint_path: файл .npz для Checkpoint; пишется каждые checkpoint_every шагов и в конце
+    :param resume: продолжить с checkpoint_path, если файл есть. Для одношаговых методов (RK*, Radau)
+                   продолжение совпадает с непрерывным счётом с точностью до выбора первого шага;
+                   многошаговые BDF и LSODA начинают накопление истории заново. Контрольная точка другой
+                   задачи (см. checkpoint_key) отвергается с ValueError; события до неё заново не выдаются,
+                   но хранятся в ней (Checkpoint.load(path).events)
+    :param checkpoint_extra: то, что ещё определяет задачу, но не видно по аргументам (параметры fun)
+    :param initial_nfev: вычисления f, сделанные до счёта (например, пробным прогоном choose_solver);
+                         прибавляются к nfev контрольной точки и итогу
+    :yield: Sample и Event в порядке возрастания t
+    :return: число вычислений f с учётом initial_nfev и прошлых запусков до контрольной точки
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Неизвестный метод {method}; доступны {', '.join(SOLVERS)}")
+    t_eval = np.empty(0) if t_eval is None else np.asarray(t_eval, dtype=float)
+    events = list(events)
+    t0, y = t_span[0], np.asarray(y0, dtype=float)
+    next_sample, nfev_offset, first_step, event_values = 0, initial_nfev, None, None
+    key = checkpoint_key(t_span, y0, t_eval, method, rtol, atol, events, checkpoint_extra)
+    # найденные события хранятся только ради контрольных точек
+    history = []
+
+    if resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        state = Checkpoint.load(checkpoint_path)
+        if state.key != key:
+            raise ValueError(f"Контрольная точка {checkpoint_path} сохранена для другой задачи "
+                             f"(интервал, начальное состояние, параметры или настройки решателя)")
+        t0, y, next_sample = state.t, state.y, state.next_sample
+        nfev_offset += state.nfev
+        history = state.events
+        first_step = state.step or None
+        event_values = state.event_values if len(state.event_values) == len(events) else None
+
+    options = {"rtol": rtol, "atol": atol}
+    if jac is not None and method in ("Radau", "BDF", "LSODA"):
+        options["jac"] = jac
+    if first_step is not None:
+        options["first_step"] = min(first_step, abs(t_span[1] - t0)) if t_span[1] != t0 else None
+    solver = SOLVERS[method](fun, t0, y, t_span[1], **options)
+    if event_values is None:
+        event_values = np.array([event.function(t0, y) for event in events], dtype=float)
+
+    # отсчёт ровно в начальной точке выдаётся сразу
+    while next_sample < len(t_eval) and t_eval[next_sample] <= t0:
+        if t_eval[next_sample] == t0:
+            yield Sample(next_sample, t0, y.copy())
+        next_sample += 1
+
+    steps = 0
+    while solver.status == "running":
+        t_old = solver.t
+        solver.step()
+        if solver.status == "failed":
+            raise RuntimeError(f"Интегрирование прервано при t = {solver.t}")
+        steps += 1
+        interpolant = solver.dense_output()
+        t_new = solver.t
+
+        found = []
+        new_values = np.array([event.function(t_new, solver.y) for event in events], dtype=float)
+        for k, event in enumerate(events):
+            before, after = event_values[k], new_values[k]
+            if before == after or np.sign(before) == np.sign(after) or before == 0:
+                continue
+            if event.direction * (after - before) < 0:
+                continue
+            t_root = brentq(lambda t: event.function(t, interpolant(t)), t_old, t_new, xtol=1e-12)
+            found.append(Event(event.name, t_root, interpolant(t_root)))
+        event_values = new_values
+        if checkpoint_path is not None:
+            history.extend(found)
+
+        stop = np.searchsorted(t_eval, t_new, side="right")
+        samples = [Sample(i, t_eval[i], interpolant(t_eval[i])) for i in range(next_sample, stop)]
+        next_sample = max(next_sample, stop)
+        yield from sorted(samples + found, key=lambda item: item.t)
+
+        if checkpoint_path is not None and (steps % checkpoint_every == 0 or solver.status != "running"):
+            Checkpoint(solver.t, solver.y, solver.step_size or 0.0, next_sample, event_values,
+                       solver.nfev + nfev_offset, key, history).save(checkpoint_path)
+    return solver.nfev + nfev_offset
+
+
+class StreamResult:
+    """
+    Итог integrate_streaming: отсчёты t, y (dim, len(t_eval)) и список событий. Плотного
+    решения нет — память определяется только числом отсчётов и событий.
+    nfev — число вычислений f (см. stream_solution) или None, если счёт прервал callback.
+    """
+
+    def __init__(self, t, y, events, nfev=None):
+        self.t = t
+        self.y = y
+        self.events = events
+        self.nfev = nfev
+
+    def event_times(self, name):
+        return np.array([event.t for event in self.events if event.name == name])
+
+
+def open_samples(path, dim, count, resume=False):
+    """
+    Массив отсчётов (dim, count) в .npy-файле, отображённом в память: вместе с Checkpoint
+    позволяет продолжить счёт, не теряя уже выданных отсчётов.
+    """
+    if resume and os.path.exists(path):
+        samples = np.lib.format.open_memmap(path, mode="r+")
+        if samples.shape == (dim, count):
+            return samples
+    samples = np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(dim, count))
+    samples[:] = np.nan
+    return samples
+
+
+def integrate_streaming(fun, t_span, y0, t_eval, callback=None, out=None, **kwargs):
+    """
+    Собирает отсчёты stream_solution в заранее выделенный массив (или отдаёт их в callback).
+
+    :param callback: вызывается для каждого Sample и Event; если возвращает False — счёт прерывается
+    :param out: массив (dim, len(t_eval)) для отсчётов, например open_samples(...); при продолжении
+                с контрольной точки отсчёты до неё берутся из него, а события — из самой точки
+    :return: StreamResult
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    if out is None:
+        out = np.full((len(np.atleast_1d(y0)), len(t_eval)), np.nan)
+    events = []
+    checkpoint_path = kwargs.get("checkpoint_path")
+    if kwargs.get("resume") and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        # проверка ключа — в stream_solution; при чужой точке она поднимет ValueError до первого отсчёта
+        events = list(Checkpoint.load(checkpoint_path).events)
+    stream = stream_solution(fun, t_span, y0, t_eval=t_eval, **kwargs)
+    nfev = None
+    while True:
+        try:
+            item = next(stream)
+        except StopIteration as finished:
+            nfev = finished.value
+            break
+        if item.kind == "sample":
+            out[:, item.index] = item.y
+        else:
+            events.append(item)
+        if callback is not None and callback(item) is False:
+            stream.close()
+            break
+    return StreamResult(t_eval, out, events, nfev)
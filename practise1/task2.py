@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
+from ode_solver import solve_auto
 
 # ------------------------------
 # Функция правой части системы уравнений
@@ -20,26 +20,41 @@ def system_ode(t, Y, a, b, c):
     dy3_dt = b * y3 * (y1 - c)
     return [dy1_dt, dy2_dt, dy3_dt]
 
+
+def system_jacobian(t, Y, a, b, c):
+    """
+    Аналитический якобиан правой части system_ode.
+    """
+    y1, y2, y3 = Y
+    return np.array([
+        [0.0, -1.0, -1.0],
+        [1.0, a, 0.0],
+        [b * y3, 0.0, b * (y1 - c)],
+    ])
+
 # ------------------------------
 # Решение системы ОДУ с использованием solve_ivp
 # ------------------------------
-def solve_system_ode(ode_func, initial_conditions, time_interval, params):
+def solve_system_ode(ode_func, initial_conditions, time_interval, params, jac_func=system_jacobian):
     """
-    Решает систему ОДУ с помощью solve_ivp.
+    Решает систему ОДУ с помощью solve_ivp; метод выбирается по оценке жёсткости (ode_solver).
     
     :param ode_func: Функция правой части системы.
     :param initial_conditions: Начальные условия [y1(0), y2(0), y3(0)].
     :param time_interval: Интервал времени [t_start, t_end].
     :param params: Параметры системы (a, b, c).
+    :param jac_func: Аналитический якобиан (для неявных методов).
     :return: Результат solve_ivp (время и решение).
     """
-    result = solve_ivp(
-        fun=lambda t, Y: ode_func(t, Y, *params),
-        t_span=time_interval,
-        y0=initial_conditions,
-        method='BDF',
-        rtol=1e-25,
-        atol=1e-25,
+    # допуск 1e-25 ниже машинной точности недостижим, а решение растёт до ~1e6, поэтому
+    # используется предельная для этой задачи относительная точность 1e-10
+    result = solve_auto(
+        lambda t, Y: ode_func(t, Y, *params),
+        time_interval,
+        initial_conditions,
+        jac=(lambda t, Y: jac_func(t, Y, *params)) if jac_func else None,
+        rtol=1e-10,
+        atol=1e-12,
         dense_output=True
     )
     return result
@@ -113,6 +128,7 @@ def main():
         time_interval=time_interval,
         params=(a, b, c)
     )
+    print(solution.report)
 
     visualize_system_solution(time_interval, solution, (a, b, c))
 
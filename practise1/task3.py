@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
+from ode_solver import solve_auto
 
 # ------------------------------
 # Функция правой части для первого уравнения
@@ -16,6 +16,10 @@ def ode1(t, V):
     dv2_dt = np.cos(t) - 2 * v2 - 3 * v1
     return [dv1_dt, dv2_dt]
 
+
+def ode1_jacobian(t, V):
+    return np.array([[0.0, 1.0], [-3.0, -2.0]])
+
 # ------------------------------
 # Функция правой части для второго уравнения
 # ------------------------------
@@ -30,24 +34,31 @@ def ode2(t, W, a):
     dw2_dt = a * (1 - w1**2) * w2 - w1
     return [dw1_dt, dw2_dt]
 
+
+def ode2_jacobian(t, W, a):
+    w1, w2 = W
+    return np.array([[0.0, 1.0], [-2 * a * w1 * w2 - 1, a * (1 - w1**2)]])
+
 # ------------------------------
 # Решение системы ОДУ
 # ------------------------------
-def solve_ode(ode_func, initial_conditions, time_interval, params=None):
+def solve_ode(ode_func, initial_conditions, time_interval, params=None, jac_func=None):
     """
-    Решает систему ОДУ с помощью solve_ivp.
+    Решает систему ОДУ с помощью solve_ivp; метод выбирается по оценке жёсткости (ode_solver).
     
     :param ode_func: Функция правой части системы.
     :param initial_conditions: Начальные условия.
     :param time_interval: Интервал времени [t_start, t_end].
     :param params: Дополнительные параметры (например, a).
+    :param jac_func: Аналитический якобиан с той же сигнатурой, что у ode_func.
     :return: Результат solve_ivp.
     """
-    result = solve_ivp(
-        fun=lambda t, Y: ode_func(t, Y, *params) if params else ode_func(t, Y),
-        t_span=time_interval,
-        y0=initial_conditions,
-        method='RK45',
+    params = params or ()
+    result = solve_auto(
+        lambda t, Y: ode_func(t, Y, *params),
+        time_interval,
+        initial_conditions,
+        jac=(lambda t, Y: jac_func(t, Y, *params)) if jac_func else None,
         dense_output=True
     )
     return result
@@ -87,7 +98,8 @@ def main():
     # y'' + 2y' + 3y = cos(t), y(0) = 0, y'(0) = 0, t ∈ [0, 2π]
     ode1_initial_conditions = [0, 0]
     ode1_time_interval = (0, 2 * np.pi)
-    ode1_solution = solve_ode(ode1, ode1_initial_conditions, ode1_time_interval)
+    ode1_solution = solve_ode(ode1, ode1_initial_conditions, ode1_time_interval, jac_func=ode1_jacobian)
+    print(ode1_solution.report)
     visualize_solution(
         ode1_time_interval,
         ode1_solution,
@@ -99,7 +111,9 @@ def main():
     ode2_initial_conditions = [2, 0]
     ode2_time_interval = (0, 30)
     ode2_params = (1,)  
-    ode2_solution = solve_ode(ode2, ode2_initial_conditions, ode2_time_interval, params=ode2_params)
+    ode2_solution = solve_ode(ode2, ode2_initial_conditions, ode2_time_interval, params=ode2_params,
+                              jac_func=ode2_jacobian)
+    print(ode2_solution.report)
     visualize_solution(
         ode2_time_interval,
         ode2_solution,
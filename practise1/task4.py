@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
+from ode_solver import choose_solver
+from streaming import integrate_streaming, local_maximum, open_samples
 
 # ------------------------------
 # Функция правой части системы уравнений
@@ -14,26 +15,56 @@ def predator_prey_system(t, Z, r1, lambda1, lambda2, beta2, g1):
     dy_dt = lambda2 * x * y - beta2 * y
     return [dx_dt, dy_dt]
 
+
+def predator_prey_jacobian(t, Z, r1, lambda1, lambda2, beta2, g1):
+    x, y = Z
+    return np.array([
+        [r1 - lambda1 * y - 2 * g1 * x, -lambda1 * x],
+        [lambda2 * y, lambda2 * x - beta2],
+    ])
+
 # ------------------------------
 # Решение системы ОДУ
 # ------------------------------
-def solve_predator_prey(ode_func, initial_conditions, time_interval, params):
-    result = solve_ivp(
-        fun=lambda t, Z: ode_func(t, Z, *params),
-        t_span=time_interval,
-        y0=initial_conditions,
-        method='RK45',
-        dense_output=True
+def solve_predator_prey(ode_func, initial_conditions, time_interval, params, jac_func=predator_prey_jacobian,
+                        sample_count=1000, checkpoint_path=None):
+    """
+    Отсчёты решения в sample_count равноотстоящих точках и моменты максимумов обеих популяций.
+    Решение выдаётся потоком по шагам (streaming.integrate_streaming), без dense_output,
+    поэтому память не зависит от длины интервала; checkpoint_path позволяет продолжить прерванный счёт.
+    В result.nfev входит пробный прогон choose_solver — он повторяется при каждом продолжении счёта.
+    """
+    fun = lambda t, Z: ode_func(t, Z, *params)
+    jac = (lambda t, Z: jac_func(t, Z, *params)) if jac_func else None
+    choice = choose_solver(fun, time_interval, initial_conditions, jac)
+    t_eval = np.linspace(time_interval[0], time_interval[1], sample_count)
+    resume = checkpoint_path is not None
+    out = open_samples(f"{checkpoint_path}.samples.npy", 2, sample_count, resume) if resume else None
+    result = integrate_streaming(
+        fun,
+        time_interval,
+        initial_conditions,
+        t_eval,
+        out=out,
+        events=[local_maximum(fun, 0, "max x"), local_maximum(fun, 1, "max y")],
+        method=choice.method,
+        rtol=choice.rtol,
+        atol=choice.atol,
+        jac=jac,
+        checkpoint_path=checkpoint_path,
+        resume=resume,
+        checkpoint_extra=tuple(params),
+        initial_nfev=choice.trial.nfev
     )
+    result.choice = choice
     return result
 
 # ------------------------------
 # Визуализация решения
 # ------------------------------
 def visualize_predator_prey_solution(time_interval, solution, title):
-    t = np.linspace(time_interval[0], time_interval[1], 1000)
-    Z = solution.sol(t)
-    x, y = Z
+    t = solution.t
+    x, y = solution.y
 
     # Графики плотностей популяций
     plt.figure(figsize=(12, 5))
@@ -41,6 +72,10 @@ def visualize_predator_prey_solution(time_interval, solution, title):
     plt.plot(t, y, label='Хищник (y)', color='red')
     plt.xlabel('Время', fontsize=12)
     plt.ylabel('Плотность популяции', fontsize=12)
+    peaks = solution.event_times("max x")
+    if len(peaks) > 1:
+        plt.plot(peaks, [e.y[0] for e in solution.events if e.name == "max x"], 'o', color='blue', markersize=3)
+        title += f" (период ≈ {np.mean(np.diff(peaks)):.2f})"
     plt.title(title + "\nЗависимость плотности популяций от времени", fontsize=14)
     plt.legend()
     plt.grid(True)
@@ -74,6 +109,7 @@ def main():
         params['time_interval'],
         (params['r1'], params['lambda1'], params['lambda2'], params['beta2'], 0.0005)
     )
+    print(f"{solution_with_competition.choice}\n  вычислений f: {solution_with_competition.nfev}")
     visualize_predator_prey_solution(
         params['time_interval'],
         solution_with_competition,
@@ -86,6 +122,7 @@ def main():
         params['time_interval'],
         (params['r1'], params['lambda1'], params['lambda2'], params['beta2'], 0)  # g1=0
     )
+    print(f"{solution_without_competition.choice}\n  вычислений f: {solution_without_competition.nfev}")
     visualize_predator_prey_solution(
         params['time_interval'],
         solution_without_competition,
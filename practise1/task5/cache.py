@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+import sympy
+
+from parser import CompiledSystem, build_expressions, check_param_names, generate_source
+from utils import compute_orders
+
+# меняется при изменении формата записи или разбора в parser.py — старые файлы кэша перестают совпадать
+CACHE_FORMAT_VERSION = 2
+
+
+def default_cache_dir():
+    return os.environ.get("ODE_SYSTEM_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "ode_systems"))
+
+
+def system_key(equations, vars, param_names):
+    """
+    Ключ системы по содержимому: уравнения, список переменных и имена параметров.
+    Значения параметров в ключ не входят — они подставляются при компиляции.
+    """
+    payload = json.dumps({
+        "version": CACHE_FORMAT_VERSION,
+        "equations": [equation.strip() for equation in equations],
+        "vars": [var.strip() for var in vars],
+        "params": sorted(param_names),
+    }, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def expression_to_data(expression):
+    """
+    Выражение sympy как дерево из словарей и списков для JSON. В отличие от srepr и pickle,
+    обратное преобразование (expression_from_data) не выполняет кода из файла.
+    """
+    if isinstance(expression, sympy.Symbol):
+        return {"symbol": expression.name}
+    if isinstance(expression, sympy.Integer):
+        return {"integer": str(int(expression))}
+    if isinstance(expression, sympy.Rational):
+        return {"rational": [str(expression.p), str(expression.q)]}
+    if isinstance(expression, sympy.Float):
+        return {"float": str(expression), "precision": expression._prec}
+    if not expression.args:
+        name = type(expression).__name__
+        if getattr(sympy.S, name, None) is not expression:
+            raise ValueError(f"Неподдерживаемый атом {expression!r}")
+        return {"constant": name}
+    name = type(expression).__name__
+    if getattr(sympy, name, None) is not type(expression):
+        raise ValueError(f"Неподдерживаемая функция {name}")
+    return {"function": name, "args": [expression_to_data(argument) for argument in expression.args]}
+
+
+def expression_from_data(data):
+    """Обратное expression_to_data: допускаются только символы, числа, константы и классы sympy."""
+    if "symbol" in data:
+        return sympy.Symbol(data["symbol"])
+    if "integer" in data:
+        return sympy.Integer(int(data["integer"]))
+    if "rational" in data:
+        return sympy.Rational(int(data["rational"][0]), int(data["rational"][1]))
+    if "float" in data:
+        return sympy.Float(data["float"], precision=int(data["precision"]))
+    if "constant" in data:
+        value = getattr(sympy.S, data["constant"])
+        if not isinstance(value, sympy.Basic) or value.args:
+            raise ValueError(f"Неизвестная константа {data['constant']}")
+        return value
+    cls = getattr(sympy, data["function"], None)
+    if not (isinstance(cls, type) and issubclass(cls, sympy.Basic)):
+        raise ValueError(f"Неизвестная функция {data['function']}")
+    return cls(*[expression_from_data(argument) for argument in data["args"]])
+
+
+class SystemCache:
+    """
+    Двухуровневый кэш разобранных систем ОДУ.
+
+      - в памяти: LRU на max_entries скомпилированных систем;
+      - на диске: разобранные и решённые относительно старших производных выражения (JSON на систему
+        в cache_dir, см. expression_to_data), поэтому в новом сеансе для уже встречавшейся системы
+        sympify/solve не выполняются. Исходный код всегда генерируется заново из этих выражений:
+        код из файла кэша не исполняется, а испорченная запись считается промахом.
+
+    Одинаковая система с другими значениями параметров берётся из кэша и только
+    перекомпилируется (CompiledSystem.with_params).
+    """
+
+    def __init__(self, cache_dir=None, max_entries=64, persistent=True):
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key):
+        if not self.persistent:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def _store(self, key, entry):
+        if not self.persistent:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # запись через временный файл, чтобы параллельный процесс не прочитал половину
+            descriptor, temporary = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            pass  # кэш на диске необязателен: при ошибке записи работаем только с памятью
+
+    def _remember(self, key, system):
+        self._memory[key] = system
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, equations, vars, params, jacobian=False):
+        """Скомпилированная система с заданными значениями параметров (аналог parse_system)."""
+        check_param_names(params, vars)
+        key = system_key(equations, vars, params.keys())
+        system = self._memory.get(key)
+        if system is not None and (system.has_jacobian or not jacobian):
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return system if system.params == params else system.with_params(params)
+
+        expressions = self._load_expressions(key, equations, vars, params)
+        if expressions is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            expressions = build_expressions(equations, vars)
+            self._store_expressions(key, equations, vars, params, expressions)
+        t_sym, state_order, system_rhs = expressions
+        source = generate_source(t_sym, state_order, system_rhs, jacobian)
+        system = CompiledSystem(source, params, [str(state) for state in state_order], jacobian)
+        self._remember(key, system)
+        return system
+
+    def _load_expressions(self, key, equations, vars, params):
+        """
+        Выражения из файла кэша или None. Кроме формата проверяется, что имена символов — это ровно
+        переменные состояния этих уравнений, независимая переменная и параметры: только они попадают
+        в генерируемый код как идентификаторы.
+        """
+        entry = self._load(key)
+        if entry is None:
+            return None
+        try:
+            t_sym = expression_from_data(entry["t"])
+            state_order = [expression_from_data(state) for state in entry["states"]]
+            system_rhs = [sympy.sympify(expression_from_data(expression)) for expression in entry["rhs"]]
+        except (KeyError, TypeError, ValueError, AttributeError, RecursionError):
+            return None
+        orders = compute_orders(equations, vars[1:])
+        expected_states = [f"{var}_{i}" for var in vars[1:] for i in range(orders[var])]
+        allowed = {vars[0], *expected_states, *params}
+        if (t_sym != sympy.Symbol(vars[0]) or [str(state) for state in state_order] != expected_states
+                or len(system_rhs) != len(state_order)
+                or any(symbol.name not in allowed for expression in system_rhs
+                       for symbol in expression.atoms(sympy.Symbol))):
+            return None
+        return t_sym, state_order, system_rhs
+
+    def _store_expressions(self, key, equations, vars, params, expressions):
+        t_sym, state_order, system_rhs = expressions
+        try:
+            entry = {"version": CACHE_FORMAT_VERSION, "equations": list(equations), "vars": list(vars),
+                     "params": sorted(params), "t": expression_to_data(t_sym),
+                     "states": [expression_to_data(state) for state in state_order],
+                     "rhs": [expression_to_data(expression) for expression in system_rhs]}
+        except ValueError:
+            return  # выражение не представимо деревом — система кэшируется только в памяти
+        self._store(key, entry)
+
+    def clear(self, disk=False):
+        self._memory.clear()
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache = None
+
+
+def cached_parse_system(equations, vars, params, jacobian=False):
+    """parse_system через общий для процесса SystemCache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SystemCache()
+    return _default_cache.get(equations, vars, params, jacobian)
@@ -1,9 +1,17 @@
 import sys
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QLabel, QTextEdit, QLineEdit, 
-                              QPushButton, QMessageBox)
+                              QPushButton, QMessageBox, QProgressBar)
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg, NavigationToolbar2QT
+from matplotlib.figure import Figure
+
+from visualization import SolveCancelled, draw_solution, solve_system
 
-from visualization import plot_solution
+# шкала индикатора прогресса: доля пройденного интервала в тысячных
+PROGRESS_STEPS = 1000
 
 def parse_params(params_str):
     """
@@ -53,16 +61,77 @@ def parse_initial_conditions(ic_str):
                 return None
     return ic
 
+class SolveSignals(QObject):
+    """Сигналы задачи решения; создаются в потоке GUI, поэтому слоты вызываются в нём же."""
+    progress = Signal(int)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class SolveTask(QRunnable):
+    """
+    Разбор и интегрирование системы в пуле потоков. Прогресс — доля t / t_end в тысячных;
+    cancel() прерывает счёт после ближайшего шага (символьный разбор дорабатывает до конца).
+    """
+
+    def __init__(self, equations, vars_list, params, t_span, ic):
+        super().__init__()
+        self.equations = equations
+        self.vars_list = vars_list
+        self.params = params
+        self.t_span = t_span
+        self.ic = ic
+        self.signals = SolveSignals()
+        self._cancel = threading.Event()
+        self._reported = -1
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, fraction):
+        if self._cancel.is_set():
+            return False
+        value = int(fraction * PROGRESS_STEPS)
+        # сигнал только при смене деления шкалы, чтобы не засорять очередь событий
+        if value != self._reported:
+            self._reported = value
+            self.signals.progress.emit(value)
+        return True
+
+    def run(self):
+        try:
+            result = solve_system(self.equations, self.vars_list, self.params, self.t_span, self.ic,
+                                  progress=self._progress)
+        except SolveCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
 class ODESolverGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ODE Solver GUI")
-        self.setGeometry(100, 100, 600, 500)
+        self.setGeometry(100, 100, 1300, 700)
         
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         
-        self.layout = QVBoxLayout(self.central_widget)
+        # слева — поля ввода, справа — встроенный холст matplotlib
+        self.main_layout = QHBoxLayout(self.central_widget)
+        self.layout = QVBoxLayout()
+        self.plot_layout = QVBoxLayout()
+        self.main_layout.addLayout(self.layout, 1)
+        self.main_layout.addLayout(self.plot_layout, 3)
+
+        # решение идёт в отдельном потоке; один поток — задачи выполняются по очереди,
+        # и кэш разобранных систем не используется из двух потоков сразу
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.task = None
         
         # Уравнения
         self.eq_label = QLabel("Уравнения (каждое с новой строки):")
@@ -97,6 +166,22 @@ class ODESolverGUI(QMainWindow):
         # Кнопка построения графика
         self.btn_plot = QPushButton("Построить график")
         self.btn_plot.clicked.connect(self.on_plot)
+
+        # Прогресс и отмена
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, PROGRESS_STEPS)
+        self.progress_bar.setFormat("t / t_end: %p%")
+        self.btn_cancel = QPushButton("Отмена")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.on_cancel)
+        self.status_label = QLabel()
+
+        # Встроенный холст
+        self.figure = Figure()
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.plot_layout.addWidget(self.toolbar)
+        self.plot_layout.addWidget(self.canvas)
         
         # Добавление виджетов в основной layout
         self.layout.addWidget(self.eq_label)
@@ -110,6 +195,9 @@ class ODESolverGUI(QMainWindow):
         self.layout.addWidget(self.tspan_label)
         self.layout.addLayout(self.tspan_layout)
         self.layout.addWidget(self.btn_plot)
+        self.layout.addWidget(self.progress_bar)
+        self.layout.addWidget(self.btn_cancel)
+        self.layout.addWidget(self.status_label)
         self.layout.addStretch()
     
     def on_plot(self):
@@ -137,10 +225,61 @@ class ODESolverGUI(QMainWindow):
             return
         
         t_span = (t0, tf)
-        try:
-            plot_solution(equations, vars_list, params, t_span, ic)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"При построении графика произошла ошибка:\n{e}")
+        if self.task is not None:
+            self.task.cancel()
+        task = SolveTask(equations, vars_list, params, t_span, ic)
+        # сигналы устаревшей (отменённой) задачи игнорируются
+        task.signals.progress.connect(lambda value: self.on_progress(task, value))
+        task.signals.finished.connect(lambda result: self.on_finished(task, result))
+        task.signals.failed.connect(lambda message: self.on_failed(task, message))
+        task.signals.cancelled.connect(lambda: self.on_cancelled(task))
+        self.task = task
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Разбор уравнений и интегрирование...")
+        self.btn_cancel.setEnabled(True)
+        self.thread_pool.start(task)
+
+    def on_cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.setText("Отмена...")
+
+    def on_progress(self, task, value):
+        if task is self.task:
+            self.progress_bar.setValue(value)
+
+    def on_finished(self, task, result):
+        if task is not self.task:
+            return
+        sol, orders, offsets = result
+        if sol.success:
+            self._finish_task(f"Готово: {len(sol.t)} точек, вычислений f: {sol.nfev}")
+        else:
+            self._finish_task(f"{sol.message}. Построено точек: {len(sol.t)}, вычислений f: {sol.nfev}")
+        self.figure.clear()
+        draw_solution(self.figure, sol.t, sol.y, task.vars_list[1:], orders, offsets, resize=False)
+        self.canvas.draw_idle()
+
+    def on_failed(self, task, message):
+        if task is not self.task:
+            return
+        self._finish_task("Ошибка")
+        QMessageBox.critical(self, "Ошибка", f"При построении графика произошла ошибка:\n{message}")
+
+    def on_cancelled(self, task):
+        if task is self.task:
+            self._finish_task("Отменено")
+
+    def _finish_task(self, status):
+        self.task = None
+        self.btn_cancel.setEnabled(False)
+        self.status_label.setText(status)
+
+    def closeEvent(self, event):
+        if self.task is not None:
+            self.task.cancel()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
 
 def build_gui():
     app = QApplication(sys.argv)
@@ -1,21 +1,110 @@
+import keyword
+
 import numpy as np
 import sympy
-from sympy import symbols, sympify, solve, lambdify
+from sympy import symbols, sympify, solve, cse, numbered_symbols, Matrix
+from sympy.printing.numpy import NumPyPrinter
 import re
 
 from utils import compute_orders
 
-def parse_system(equations, vars, params):
+
+# имена модуля сгенерированного кода; имена на «_» (_Y_, _out_, _cse0...) зарезервированы целиком
+RESERVED_NAMES = {"numpy", "rhs", "jac"}
+
+
+def check_param_names(params, taken=()):
     """
-    Парсинг системы дифференциальных уравнений.
-    
-    Принимает:
-      - equations: список уравнений в виде строк, например, ["y'' + 2*y' + 3*y = cos(t)"].
-      - vars: список переменных, где первый элемент — независимая переменная (например, 't'),
-              а остальные — зависимые переменные.
-      - params: словарь параметров, например, {'a': 1.0}.
-    
-    Возвращает функцию f(t, Y) для передачи в scipy.integrate.solve_ivp.
+    Параметры подставляются в пространство имён сгенерированного кода, поэтому их имена должны быть
+    идентификаторами Python и не совпадать с именами самого кода, переменных состояния и taken.
+    """
+    for name in params:
+        if (not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name)
+                or name.startswith("_") or name in RESERVED_NAMES or name in taken):
+            raise ValueError(f"Недопустимое имя параметра '{name}': нужен идентификатор Python, "
+                             f"не начинающийся с '_' и не совпадающий с {', '.join(sorted(RESERVED_NAMES))}, "
+                             f"переменными и переменными состояния")
+
+
+class CompiledSystem:
+    """
+    Правая часть системы ОДУ, сгенерированная в исходный код Python один раз при разборе.
+
+    Параметры подставляются в пространство имён модуля при компиляции (не передаются при
+    каждом вызове), промежуточные подвыражения вычисляются один раз (CSE).
+    Поддерживаются обе сигнатуры solve_ivp: Y формы (n,) и Y формы (n, k) при vectorized=True.
+
+      - system(t, Y) — новый массив производных (solve_ivp хранит возвращённое значение между
+        шагами, поэтому общий буфер ему отдавать нельзя);
+      - system.rhs_into(t, Y, out) — запись в заранее выделенный буфер out той же формы, что Y;
+      - system.jac(t, Y) — аналитический якобиан (n, n) или None, если он не генерировался.
+    """
+
+    vectorized = True
+
+    def __init__(self, source, params, state_names, has_jacobian=False):
+        self.source = source
+        self.params = dict(params)
+        self.state_names = list(state_names)
+        self.size = len(self.state_names)
+        check_param_names(self.params, self.state_names)
+        namespace = {"numpy": np}
+        namespace.update(self.params)
+        exec(compile(source, "<parse_system>", "exec"), namespace)
+        self.rhs_into = namespace["rhs"]
+        self.jac = namespace["jac"] if has_jacobian else None
+        self.has_jacobian = has_jacobian
+
+    def __call__(self, t, Y):
+        Y = np.asarray(Y, dtype=float)
+        return self.rhs_into(t, Y, np.empty(Y.shape))
+
+    def with_params(self, params):
+        """Та же система с другими значениями параметров — без символьных вычислений."""
+        missing = set(self.params) - set(params)
+        if missing:
+            raise ValueError(f"Не заданы параметры: {', '.join(sorted(missing))}")
+        return CompiledSystem(self.source, params, self.state_names, self.has_jacobian)
+
+
+def _emit_assignments(printer, expressions, target, indent="    "):
+    """Строки кода с общими подвыражениями и присваиваниями target[i] = expression."""
+    replacements, reduced = cse(expressions, symbols=numbered_symbols("_cse"))
+    lines = [f"{indent}{symbol} = {printer.doprint(value)}" for symbol, value in replacements]
+    for key, expression in zip(target, reduced):
+        lines.append(f"{indent}{key} = {printer.doprint(expression)}")
+    return lines
+
+
+def generate_source(t_sym, state_order, system_rhs, jacobian=False):
+    """
+    Исходный код функций rhs(t, Y, out) и, при jacobian=True, jac(t, Y).
+    Параметры остаются свободными именами и берутся из глобального пространства имён модуля.
+    """
+    printer = NumPyPrinter()
+    t_name = printer.doprint(t_sym)
+    unpack = [f"    {printer.doprint(state)} = _Y_[{i}]" for i, state in enumerate(state_order)]
+    lines = [f"def rhs({t_name}, _Y_, _out_):"] + unpack
+    lines += _emit_assignments(printer, [sympify(expression) for expression in system_rhs],
+                               [f"_out_[{i}]" for i in range(len(system_rhs))])
+    lines.append("    return _out_")
+    if jacobian:
+        matrix = Matrix(system_rhs).jacobian(Matrix(state_order))
+        entries = [(i, j) for i in range(matrix.rows) for j in range(matrix.cols) if matrix[i, j] != 0]
+        lines += ["", "", f"def jac({t_name}, _Y_):"] + unpack
+        lines.append(f"    _J_ = numpy.zeros(({matrix.rows}, {matrix.cols}))")
+        lines += _emit_assignments(printer, [matrix[i, j] for i, j in entries],
+                                   [f"_J_[{i}, {j}]" for i, j in entries])
+        lines.append("    return _J_")
+    return "\n".join(lines) + "\n"
+
+
+def build_expressions(equations, vars):
+    """
+    Символьная часть parse_system: разбор уравнений и решение относительно старших производных.
+    Значения параметров здесь не нужны.
+
+    Возвращает (символ независимой переменной, символы состояния, правые части системы).
     """
     t_sym = symbols(vars[0])
     dep_vars = vars[1:]
@@ -93,14 +182,34 @@ def parse_system(equations, vars, params):
         else:
             system_rhs.append(0)
     
-    param_symbols = symbols(list(params.keys()))
-    
-    # формируем список символов для lambdify: сначала t, затем все состояния, затем параметры.
-    all_symbols = [t_sym] + state_order + list(param_symbols)
-    f_func = lambdify(all_symbols, system_rhs, modules="numpy")
+    return t_sym, state_order, [sympify(expression) for expression in system_rhs]
+
+
+def build_source(equations, vars, jacobian=False):
+    """
+    Разбор уравнений (build_expressions) и генерация исходного кода.
+
+    Возвращает (исходный код, имена переменных состояния).
+    """
+    t_sym, state_order, system_rhs = build_expressions(equations, vars)
+    source = generate_source(t_sym, state_order, system_rhs, jacobian)
+    return source, [str(state) for state in state_order]
+
+
+def parse_system(equations, vars, params, jacobian=False):
+    """
+    Парсинг системы дифференциальных уравнений.
     
-    def f(t, Y):
-        args = [t] + list(Y) + list(params.values())
-        return np.array(f_func(*args), dtype=float).flatten()
+    Принимает:
+      - equations: список уравнений в виде строк, например, ["y'' + 2*y' + 3*y = cos(t)"].
+      - vars: список переменных, где первый элемент — независимая переменная (например, 't'),
+              а остальные — зависимые переменные.
+      - params: словарь параметров, например, {'a': 1.0}.
+      - jacobian: сгенерировать также аналитический якобиан (для Radau, BDF, LSODA).
     
-    return f
+    Возвращает CompiledSystem — вызываемый объект f(t, Y) для передачи в scipy.integrate.solve_ivp
+    (jac=f.jac, vectorized=True поддерживаются).
+    """
+    check_param_names(params, vars)
+    source, state_names = build_source(equations, vars, jacobian)
+    return CompiledSystem(source, params, state_names, jacobian)
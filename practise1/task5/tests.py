@@ -0,0 +1,208 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import sympy
+
+# кэш разобранных систем — во временном каталоге, а не в домашнем
+os.environ.setdefault("ODE_SYSTEM_CACHE_DIR", tempfile.mkdtemp(prefix="ode_systems_"))
+
+from cache import SystemCache
+from parser import CompiledSystem, build_expressions, check_param_names, parse_system
+from visualization import phase_pairs, render_batch, solve_system, state_offsets
+
+
+def lambdify_system(equations, vars, params):
+    """Прежний путь parse_system: lambdify по t, состояниям и параметрам, вызов со списком аргументов."""
+    t_sym, state_order, system_rhs = build_expressions(equations, vars)
+    f_func = sympy.lambdify([t_sym] + state_order + [sympy.Symbol(name) for name in params], system_rhs,
+                            modules="numpy")
+    return lambda t, Y: np.array(f_func(t, *Y, *params.values()), dtype=float).flatten()
+
+
+class TestSolveSystem(unittest.TestCase):
+    def test_blow_up_returns_partial_solution(self):
+        """
+        y' = y² − t·y при y(0) = 1 уходит в бесконечность около t ≈ 1.28: как и solve_ivp,
+        решатель возвращает отсчёты до точки остановки вместе с причиной.
+        """
+        sol, _, _ = solve_system(["y' = y**2 - t*y"], ["t", "y"], {}, (0, 10), [1.0])
+        self.assertFalse(sol.success)
+        self.assertIn("t = 1.27", sol.message)
+        self.assertEqual(len(sol.t), 64)
+        self.assertEqual(sol.y.shape, (1, 64))
+        self.assertTrue(np.all(np.isfinite(sol.y)))
+
+    def test_regular_solution_is_successful(self):
+        sol, _, _ = solve_system(["y' = -y"], ["t", "y"], {}, (0, 2), [1.0], t_eval=np.linspace(0, 2, 21))
+        self.assertTrue(sol.success)
+        np.testing.assert_allclose(sol.y[0], np.exp(-sol.t), atol=1e-3)
+
+
+class TestCompiledSystem(unittest.TestCase):
+    def setUp(self):
+        self.equations = ["x'' + a*x' + b*sin(x) = cos(t)", "y' = -c*y*x + exp(-t)"]
+        self.vars = ["t", "x", "y"]
+        self.params = {"a": 0.3, "b": 2.0, "c": 0.7}
+        self.system = parse_system(self.equations, self.vars, self.params, jacobian=True)
+        self.states = np.random.default_rng(0).uniform(-2, 2, size=(3, 8))
+
+    def test_matches_lambdify_path(self):
+        """
+        Сгенерированный код даёт те же производные, что и прежний путь через lambdify.
+        """
+        reference = lambdify_system(self.equations, self.vars, self.params)
+        self.assertEqual(self.system.state_names, ["x_0", "x_1", "y_0"])
+        for k, t in enumerate(np.linspace(0, 3, self.states.shape[1])):
+            np.testing.assert_allclose(self.system(t, self.states[:, k]), reference(t, self.states[:, k]),
+                                       rtol=1e-13, atol=1e-15)
+
+    def test_rhs_into_writes_into_given_buffer(self):
+        out = np.empty(3)
+        result = self.system.rhs_into(1.5, self.states[:, 0], out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.system(1.5, self.states[:, 0]))
+
+    def test_vectorized_call_matches_columns(self):
+        self.assertTrue(CompiledSystem.vectorized)
+        values = self.system(0.5, self.states)
+        self.assertEqual(values.shape, self.states.shape)
+        for k in range(self.states.shape[1]):
+            np.testing.assert_allclose(values[:, k], self.system(0.5, self.states[:, k]), rtol=1e-15)
+
+    def test_jacobian_matches_finite_differences(self):
+        y, h = self.states[:, 0], 1e-6
+        expected = np.column_stack([(self.system(0.5, y + h * e) - self.system(0.5, y - h * e)) / (2 * h)
+                                    for e in np.eye(3)])
+        np.testing.assert_allclose(self.system.jac(0.5, y), expected, rtol=1e-6, atol=1e-8)
+        self.assertIsNone(parse_system(self.equations, self.vars, self.params).jac)
+
+    def test_with_params_recompiles_values(self):
+        other = self.system.with_params({"a": 0.3, "b": 2.0, "c": 0.0})
+        self.assertAlmostEqual(other(0.0, [1.0, 0.0, 5.0])[2], 1.0)
+        with self.assertRaises(ValueError):
+            self.system.with_params({"a": 1.0})
+
+    def test_check_param_names(self):
+        """
+        Имена параметров не могут перекрыть имена сгенерированного кода, переменные и состояния.
+        """
+        check_param_names({"alpha": 1.0, "k2": 2.0}, ["t", "x"])
+        for name in ("rhs", "jac", "numpy", "_Y_", "_cse0", "lambda", "2k", "a-b", "t"):
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    check_param_names({name: 1.0}, ["t", "x"])
+        with self.assertRaises(ValueError):
+            parse_system(["x' = -x_0"], ["t", "x"], {"x_0": 1.0})
+
+
+class TestSystemCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.equations = ["x'' + a*x = 0"]
+        self.vars = ["t", "x"]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def cache(self, **kwargs):
+        return SystemCache(cache_dir=self.directory.name, **kwargs)
+
+    def test_memory_cache_is_lru(self):
+        """
+        Повторный запрос освежает систему, поэтому третья вытесняет вторую; другие значения параметров —
+        попадание с перекомпиляцией.
+        """
+        cache = self.cache(max_entries=2, persistent=False)
+        first = cache.get(["x' = -a*x"], self.vars, {"a": 1.0})
+        cache.get(["x' = a*x"], self.vars, {"a": 1.0})
+        self.assertIs(cache.get(["x' = -a*x"], self.vars, {"a": 1.0}), first)
+        cache.get(["x' = x**2"], self.vars, {})
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        other = cache.get(["x' = -a*x"], self.vars, {"a": 3.0})
+        self.assertEqual(cache.hits, 2)
+        self.assertAlmostEqual(other(0.0, [1.0])[0], -3.0)
+        cache.get(["x' = a*x"], self.vars, {"a": 1.0})
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_disk_cache_round_trip(self):
+        """
+        Новый кэш над тем же каталогом берёт разобранные выражения с диска, без sympy.solve.
+        """
+        system = self.cache().get(self.equations, self.vars, {"a": 4.0}, jacobian=True)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+        cache = self.cache()
+        restored = cache.get(self.equations, self.vars, {"a": 4.0}, jacobian=True)
+        self.assertEqual((cache.disk_hits, cache.misses), (1, 0))
+        self.assertEqual(restored.source, system.source)
+        np.testing.assert_allclose(restored(0.0, [1.0, 2.0]), [2.0, -4.0])
+        np.testing.assert_allclose(restored.jac(0.0, [1.0, 2.0]), [[0.0, 1.0], [-4.0, 0.0]])
+
+    def test_corrupted_file_is_a_miss(self):
+        self.cache().get(self.equations, self.vars, {"a": 4.0})
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        for content in ("{not json", '{"version": 2, "t": {"symbol": "t"}, "states": [], "rhs": []}'):
+            with self.subTest(content=content):
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(content)
+                cache = self.cache()
+                system = cache.get(self.equations, self.vars, {"a": 4.0})
+                self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+                np.testing.assert_allclose(system(0.0, [1.0, 2.0]), [2.0, -4.0])
+        cache = self.cache()
+        cache.get(self.equations, self.vars, {"a": 4.0})
+        self.assertEqual(cache.disk_hits, 1)
+
+    def test_foreign_symbol_in_file_is_rejected(self):
+        """
+        Запись, где в правой части есть имя вне переменных и параметров, не попадает в генерируемый код.
+        """
+        self.cache().get(["x' = -a*x"], self.vars, {"a": 1.0})
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        with open(path, encoding="utf-8") as file:
+            entry = json.load(file)
+        entry["rhs"] = [{"symbol": "__import__"}]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        cache = self.cache()
+        system = cache.get(["x' = -a*x"], self.vars, {"a": 1.0})
+        self.assertEqual(cache.misses, 1)
+        self.assertAlmostEqual(system(0.0, [2.0])[0], -2.0)
+
+
+class TestVisualization(unittest.TestCase):
+    def setUp(self):
+        self.equations = ["x'' = -x + y", "y' = -y"]
+
+    def test_mixed_order_columns(self):
+        """
+        x'' и y' дают состояние (x, x', y): столбцы x = 0, x' = 1, y = 2.
+        """
+        orders, offsets = state_offsets(self.equations, ["x", "y"])
+        self.assertEqual(orders, {"x": 2, "y": 1})
+        self.assertEqual(offsets, {"x": 0, "y": 2})
+        self.assertEqual(phase_pairs(["x", "y"], orders, offsets), [(0, 1, "x", "x'"), (0, 2, "x", "y")])
+
+        sol, _, _ = solve_system(self.equations, ["t", "x", "y"], {}, (0, 2), [1.0, 0.0, 1.0],
+                                 t_eval=np.linspace(0, 2, 11))
+        np.testing.assert_allclose(sol.y[offsets["y"]], np.exp(-sol.t), atol=1e-3)
+
+    def test_render_batch_writes_png(self):
+        systems = [{"name": "mixed", "equations": self.equations, "vars": ["t", "x", "y"],
+                    "t_span": [0, 2], "y0": [1.0, 0.0, 1.0]},
+                   {"equations": ["y' = -a*y"], "vars": ["t", "y"], "params": {"a": 2.0},
+                    "t_span": [0, 1], "y0": [1.0]}]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = render_batch(systems, directory)
+            self.assertEqual([os.path.basename(path) for path in paths], ["mixed.png", "system_1.png"])
+            for path in paths:
+                with open(path, "rb") as file:
+                    self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
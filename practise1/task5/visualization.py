@@ -1,69 +1,209 @@
-import matplotlib.pyplot as plt
+import argparse
+import json
+import math
+import os
+
 import numpy as np
-from scipy.integrate import solve_ivp
-from parser import parse_system
+from scipy.integrate import RK45
+from cache import cached_parse_system
 from utils import compute_orders
 
-def plot_solution(equations, vars, params, t_span, y0, t_eval=None, title="Решение", xlabel="t", ylabel="y"):
-    system = parse_system(equations, vars, params)
-    
+
+def state_offsets(equations, dep_vars):
+    """
+    Порядки переменных и номер первого столбца каждой из них в векторе состояния:
+    переменная var занимает столбцы offsets[var] … offsets[var] + orders[var] − 1 (var, var', ...).
+
+    :return: (orders, offsets)
+    """
+    orders = compute_orders(equations, dep_vars)
+    offsets = {}
+    column = 0
+    for var in dep_vars:
+        offsets[var] = column
+        column += orders[var]
+    return orders, offsets
+
+
+class SolveCancelled(Exception):
+    """Решение прервано: функция progress вернула False."""
+
+
+class Solution:
+    """
+    Отсчёты решения: t (n,), y (число столбцов состояния, n), nfev — число вычислений правой части.
+    Если решатель остановился раньше конца интервала (как solve_ivp со status = -1), success = False,
+    в t и y — отсчёты до точки остановки, а message объясняет причину.
+    """
+
+    def __init__(self, t, y, nfev, success=True, message=""):
+        self.t = t
+        self.y = y
+        self.nfev = nfev
+        self.success = success
+        self.message = message
+
+
+def integrate(system, t_span, y0, t_eval, progress=None):
+    """
+    RK45 по шагам с выдачей отсчётов t_eval по интерполянту шага (как solve_ivp с t_eval).
+    t_eval упорядочена по направлению интегрирования (убывает при t_span[1] < t_span[0]).
+    Если шаг стал слишком мал, возвращаются отсчёты до этой точки с success = False.
+    После каждого шага вызывается progress(доля пройденного интервала); если она вернёт False,
+    счёт прерывается исключением SolveCancelled.
+    """
+    solver = RK45(system, t_span[0], np.asarray(y0, dtype=float), t_span[1])
+    y = np.empty((len(solver.y), len(t_eval)))
+    length = t_span[1] - t_span[0]
+    direction = -1.0 if length < 0 else 1.0
+    next_sample = 0
+    while solver.status == "running":
+        solver.step()
+        if solver.status == "failed":
+            return Solution(t_eval[:next_sample], y[:, :next_sample], solver.nfev, success=False,
+                            message=f"Интегрирование прервано при t = {solver.t:g}: шаг стал слишком мал")
+        stop = np.searchsorted(direction * t_eval, direction * solver.t, side="right")
+        if stop > next_sample:
+            y[:, next_sample:stop] = solver.dense_output()(t_eval[next_sample:stop])
+            next_sample = stop
+        if progress is not None and progress((solver.t - t_span[0]) / length if length else 1.0) is False:
+            raise SolveCancelled()
+    return Solution(t_eval[:next_sample], y[:, :next_sample], solver.nfev)
+
+
+def solve_system(equations, vars, params, t_span, y0, t_eval=None, progress=None):
+    """
+    Решение системы на сетке t_eval (по умолчанию 500 точек).
+
+    :param progress: progress(доля) после разбора (0.0) и после каждого шага; False — отмена (SolveCancelled).
+                     Символьный разбор не прерывается, отмена срабатывает сразу после него
+    :return: (Solution, orders, offsets)
+    """
+    system = cached_parse_system(equations, vars, params)
+    if progress is not None and progress(0.0) is False:
+        raise SolveCancelled()
     if t_eval is None:
         t_eval = np.linspace(t_span[0], t_span[1], 500)
-        
-    sol = solve_ivp(system, t_span, y0, t_eval=t_eval, method='RK45')
-    
-    dep_vars = vars[1:]
-    orders = compute_orders(equations, dep_vars)
-    
-    # Графики временных рядов
-    plt.figure(figsize=(12, 6))
-    cumulative_idx = 0
+    sol = integrate(system, t_span, y0, np.asarray(t_eval, dtype=float), progress)
+    orders, offsets = state_offsets(equations, vars[1:])
+    return sol, orders, offsets
+
+
+def phase_pairs(dep_vars, orders, offsets):
+    """
+    Пары столбцов для фазовых портретов: (var, var') для переменных порядка ≥ 2
+    и (var1, var2) для каждой пары переменных.
+
+    :return: список (столбец по x, столбец по y, подпись x, подпись y)
+    """
+    pairs = []
     for var in dep_vars:
-        order = orders.get(var, 1)
-        for i in range(order):
-            label = f"{var}" + "'" * i
-            plt.plot(sol.t, sol.y[cumulative_idx + i], label=label)
-        cumulative_idx += order
-    
-    plt.title(f"{title}\nВременные зависимости", fontsize=14)
-    plt.xlabel(xlabel, fontsize=12)
-    plt.ylabel(ylabel, fontsize=12)
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+        if orders[var] >= 2:
+            pairs.append((offsets[var], offsets[var] + 1, var, f"{var}'"))
+    for i, var1 in enumerate(dep_vars):
+        for var2 in dep_vars[i + 1:]:
+            pairs.append((offsets[var1], offsets[var2], var1, var2))
+    return pairs
 
-    # Фазовые портреты
-    cumulative_idx = 0
+
+def draw_solution(fig, t, y, dep_vars, orders, offsets, title="Решение", xlabel="t", ylabel="y", resize=True):
+    """
+    Рисует в фигуру fig сетку панелей: временные зависимости всех столбцов состояния и все фазовые
+    портреты. Панели берут строки y без копирования.
+
+    :param resize: подогнать размер фигуры под число панелей (для встроенного в окно холста — False)
+    """
+    pairs = phase_pairs(dep_vars, orders, offsets)
+    panels = 1 + len(pairs)
+    columns = min(panels, 3)
+    rows = math.ceil(panels / columns)
+    if resize:
+        fig.set_size_inches(5 * columns, 4 * rows)
+    axes = fig.subplots(rows, columns, squeeze=False).ravel()
+
+    ax = axes[0]
     for var in dep_vars:
-        order = orders.get(var, 1)
-        if order >= 2:
-            plt.figure(figsize=(8, 6))
-            x = sol.y[cumulative_idx]
-            dx = sol.y[cumulative_idx + 1]
-            plt.plot(x, dx, color='purple')
-            plt.title(f"{title}\nФазовый портрет: {var}' vs {var}", fontsize=14)
-            plt.xlabel(var, fontsize=12)
-            plt.ylabel(f"{var}'", fontsize=12)
-            plt.grid(True)
-            plt.tight_layout()
-            plt.show()
-        cumulative_idx += order
-
-    # Дополнительные фазовые портреты между переменными
-    if len(dep_vars) >= 2:
-        plt.figure(figsize=(8, 6))
-        idx = 0
-        for i, var1 in enumerate(dep_vars):
-            for j, var2 in enumerate(dep_vars):
-                if i < j:
-                    x = sol.y[idx]
-                    y = sol.y[idx + orders[var1]]
-                    plt.plot(x, y, label=f"{var1} vs {var2}")
-        plt.title(f"{title}\nФазовый портрет системы", fontsize=14)
-        plt.xlabel(dep_vars[0], fontsize=12)
-        plt.ylabel(dep_vars[1], fontsize=12)
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        for i in range(orders[var]):
+            ax.plot(t, y[offsets[var] + i], label=f"{var}" + "'" * i)
+    ax.set_title("Временные зависимости")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid(True)
+
+    for ax, (x_column, y_column, x_label, y_label) in zip(axes[1:], pairs):
+        ax.plot(y[x_column], y[y_column], color='purple')
+        ax.set_title(f"Фазовый портрет: {y_label} vs {x_label}")
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.grid(True)
+
+    for ax in axes[panels:]:
+        ax.set_visible(False)
+    fig.suptitle(title, fontsize=14)
+    fig.tight_layout()
+    return fig
+
+
+def render_to_file(filename, sol, dep_vars, orders, offsets, **labels):
+    """Отрисовка без pyplot и без оконного бэкенда — в файл (формат по расширению)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    draw_solution(fig, sol.t, sol.y, dep_vars, orders, offsets, **labels)
+    fig.savefig(filename)
+    return filename
+
+
+def plot_solution(equations, vars, params, t_span, y0, t_eval=None, title="Решение", xlabel="t", ylabel="y",
+                  filename=None):
+    """
+    Решает систему и строит все графики в одной фигуре. Если задан filename — фигура сохраняется
+    в файл без открытия окна, иначе показывается через plt.show().
+    """
+    sol, orders, offsets = solve_system(equations, vars, params, t_span, y0, t_eval)
+    labels = {"title": title, "xlabel": xlabel, "ylabel": ylabel}
+    if filename is not None:
+        return render_to_file(filename, sol, vars[1:], orders, offsets, **labels)
+
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    draw_solution(fig, sol.t, sol.y, vars[1:], orders, offsets, **labels)
+    plt.show()
+
+
+def render_batch(systems, output_dir, extension="png"):
+    """
+    Пакетная отрисовка в файлы. systems — список словарей с ключами equations, vars, params,
+    t_span, y0 и необязательными name, title, t_eval.
+
+    :return: список путей к файлам
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for number, spec in enumerate(systems):
+        name = spec.get("name", f"system_{number}")
+        sol, orders, offsets = solve_system(spec["equations"], spec["vars"], spec.get("params", {}),
+                                            tuple(spec["t_span"]), spec["y0"], spec.get("t_eval"))
+        filename = os.path.join(output_dir, f"{name}.{extension}")
+        paths.append(render_to_file(filename, sol, spec["vars"][1:], orders, offsets,
+                                    title=spec.get("title", name)))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная отрисовка решений систем ОДУ в файлы")
+    parser.add_argument("systems", help="JSON-файл со списком систем (см. render_batch)")
+    parser.add_argument("output_dir", help="каталог для изображений")
+    parser.add_argument("--format", default="png", help="расширение файлов (png, svg, pdf)")
+    args = parser.parse_args()
+    with open(args.systems, encoding="utf-8") as file:
+        systems = json.load(file)
+    for path in render_batch(systems, args.output_dir, args.format):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from scipy.integrate import solve_ivp
+from ensemble import integrate_ensemble
+from ode_solver import trial_stiffness
+from streaming import integrate_streaming, local_maximum, open_samples, stream_solution
+from task3 import ode2
+from task4 import predator_prey_system, solve_predator_prey
+from trajectories import AdaptiveIntegrator, open_output, rk4_integrate
+
+
+def blowup_or_decay(t, Y, growth, rate):
+    """y' = growth·y² + rate·y: при growth > 0 и y(0) = 1 решение уходит в бесконечность при t = 1/growth."""
+    y, = Y
+    return [growth * y**2 + rate * y]
+
+
+class TestEnsemble(unittest.TestCase):
+    def test_diverged_member_does_not_spoil_others(self):
+        """
+        Член, уходящий в бесконечность, замораживается, а соседи по блоку считаются с обычной точностью.
+        """
+        params = [[1.0, 0.0], [0.0, -1.0], [0.0, 0.0], [0.0, -0.5]]
+        summary = integrate_ensemble(blowup_or_decay, (0, 5), [1.0], params, use_processes=False,
+                                     rtol=1e-8, atol=1e-10)
+        np.testing.assert_array_equal(summary.diverged, [True, False, False, False])
+        self.assertTrue(np.all(np.isfinite(summary.final_state)))
+        self.assertLessEqual(abs(summary.final_state[0, 0]), 1e8)
+        np.testing.assert_allclose(summary.final_state[1:, 0], np.exp([-5.0, 0.0, -2.5]), rtol=1e-6)
+
+
+class TestTrajectories(unittest.TestCase):
+    def setUp(self):
+        self.y0 = np.array([[1.0, 0.0], [0.5, 0.2], [2.0, -1.0], [-3.0, 3.0]])
+        self.t_eval = np.linspace(0, 10, 101)
+        self.reference = np.stack([solve_ivp(ode2, (0, 10), y, t_eval=self.t_eval, args=(1.0,),
+                                             rtol=1e-11, atol=1e-13).y.T for y in self.y0], axis=1)
+
+    def test_rk4_matches_solve_ivp(self):
+        out = rk4_integrate(ode2, self.t_eval, self.y0, args=(1.0,), steps_per_output=20)
+        self.assertEqual(out.shape, (len(self.t_eval), len(self.y0), 2))
+        np.testing.assert_allclose(out, self.reference, atol=1e-6)
+
+    def test_adaptive_matches_solve_ivp(self):
+        for method in ("RK45", "RK23"):
+            with self.subTest(method=method):
+                out = AdaptiveIntegrator(rtol=1e-8, atol=1e-10, method=method).integrate(
+                    ode2, self.t_eval, self.y0, args=(1.0,))
+                np.testing.assert_allclose(out, self.reference, atol=1e-6)
+
+    def test_adaptive_steps_do_not_depend_on_output_grid(self):
+        """
+        Шаг выбирает контроль ошибки: при 100-кратно более густой сетке вывода число шагов почти то же,
+        а точки между шагами берутся из плотного вывода.
+        """
+        coarse = AdaptiveIntegrator(rtol=1e-8, atol=1e-10)
+        coarse.integrate(ode2, self.t_eval, self.y0, args=(1.0,))
+        dense = AdaptiveIntegrator(rtol=1e-8, atol=1e-10)
+        t_eval = np.linspace(0, 10, 10001)
+        out = dense.integrate(ode2, t_eval, self.y0, args=(1.0,))
+        self.assertLess(dense.statistics.steps, 1.1 * coarse.statistics.steps)
+        self.assertLess(dense.statistics.steps, len(t_eval))
+        np.testing.assert_allclose(out[::100], self.reference, atol=1e-6)
+
+    def test_memmapped_output_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.npy")
+            out = open_output(path, len(self.t_eval), len(self.y0), 2)
+            result = AdaptiveIntegrator(rtol=1e-8, atol=1e-10).integrate(ode2, self.t_eval, self.y0, args=(1.0,),
+                                                                          out=out)
+            self.assertIs(result, out)
+            out.flush()
+            del out, result
+            loaded = np.load(path)
+            self.assertEqual(loaded.shape, (len(self.t_eval), len(self.y0), 2))
+            np.testing.assert_allclose(loaded, self.reference, atol=1e-6)
+
+
+class TestSolverChoice(unittest.TestCase):
+    def test_trial_probes_are_subsampled(self):
+        """
+        Якобиан оценивается в нескольких точках пробного RK45 — и когда прогон дошёл до конца, и когда нет.
+        """
+        for t_end in (10, 1000):
+            with self.subTest(t_end=t_end):
+                _, _, probes, trial = trial_stiffness(lambda t, y: -y, (0, t_end), [1.0], 1e-8, 1e-10)
+                self.assertEqual(trial.finished, t_end == 10)
+                self.assertGreater(len(trial.ts), 50)
+                self.assertLessEqual(len(probes), 6)
+
+    def test_streamed_evaluations_include_trial_run(self):
+        params = (0.5, 0.01, 0.01, 0.2, 0.0005)
+        result = solve_predator_prey(predator_prey_system, [25, 5], (0, 1000), params)
+        reference = solve_ivp(lambda t, Z: predator_prey_system(t, Z, *params), (0, 1000), [25, 5],
+                              method=result.choice.method, rtol=result.choice.rtol, atol=result.choice.atol)
+        self.assertEqual(result.nfev, result.choice.trial.nfev + reference.nfev)
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.params = (0.5, 0.01, 0.01, 0.2, 0.0005)
+        self.fun = lambda t, Z: predator_prey_system(t, Z, *self.params)
+        self.t_eval = np.linspace(0, 1000, 1000)
+        self.options = dict(rtol=1e-9, atol=1e-9, checkpoint_extra=self.params)
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, "checkpoint.npz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def events(self):
+        return [local_maximum(self.fun, 0, "max x"), local_maximum(self.fun, 1, "max y")]
+
+    def test_stream_matches_solve_ivp(self):
+        """
+        Те же шаги RK45, что у solve_ivp: отсчёты по интерполянту шага совпадают с t_eval solve_ivp.
+        """
+        reference = solve_ivp(self.fun, (0, 1000), [25, 5], t_eval=self.t_eval, rtol=1e-6, atol=1e-9)
+        samples = [item for item in stream_solution(self.fun, (0, 1000), [25, 5], self.t_eval, rtol=1e-6, atol=1e-9)
+                   if item.kind == "sample"]
+        self.assertEqual([sample.index for sample in samples], list(range(len(self.t_eval))))
+        np.testing.assert_allclose(np.column_stack([sample.y for sample in samples]), reference.y,
+                                   rtol=1e-12, atol=1e-12)
+
+    def test_resume_reproduces_uninterrupted_run(self):
+        """
+        Счёт, прерванный на середине и продолженный с контрольной точки, даёт те же отсчёты и
+        все 48 максимумов жертвы, что и непрерывный.
+        """
+        full = integrate_streaming(self.fun, (0, 1000), [25, 5], self.t_eval, events=self.events(), **self.options)
+        self.assertEqual(len(full.event_times("max x")), 48)
+
+        samples_path = f"{self.checkpoint_path}.samples.npy"
+        items = []
+        interrupted = integrate_streaming(self.fun, (0, 1000), [25, 5], self.t_eval,
+                                          callback=lambda item: items.append(item) or len(items) < 600,
+                                          out=open_samples(samples_path, 2, len(self.t_eval)), events=self.events(),
+                                          checkpoint_path=self.checkpoint_path, checkpoint_every=50, resume=True,
+                                          **self.options)
+        self.assertIsNone(interrupted.nfev)
+        self.assertTrue(np.any(np.isnan(interrupted.y)))
+        del interrupted
+
+        resumed = integrate_streaming(self.fun, (0, 1000), [25, 5], self.t_eval,
+                                      out=open_samples(samples_path, 2, len(self.t_eval), resume=True),
+                                      events=self.events(), checkpoint_path=self.checkpoint_path, checkpoint_every=50,
+                                      resume=True, **self.options)
+        np.testing.assert_allclose(resumed.y, full.y, atol=1e-7)
+        for name in ("max x", "max y"):
+            np.testing.assert_allclose(resumed.event_times(name), full.event_times(name), atol=1e-7)
+        self.assertGreaterEqual(resumed.nfev, full.nfev)
+
+    def test_checkpoint_of_other_problem_is_rejected(self):
+        integrate_streaming(self.fun, (0, 1000), [25, 5], self.t_eval, events=self.events(),
+                            checkpoint_path=self.checkpoint_path, **self.options)
+        options = dict(self.options, checkpoint_extra=(0.6,) + self.params[1:])
+        with self.assertRaises(ValueError):
+            integrate_streaming(self.fun, (0, 1000), [25, 5], self.t_eval, events=self.events(),
+                                checkpoint_path=self.checkpoint_path, resume=True, **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
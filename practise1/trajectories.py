@@ -0,0 +1,252 @@
+import os
+import tempfile
+
+import numpy as np
+from scipy.integrate import RK23, RK45
+
+from task3 import ode2
+from task4 import predator_prey_system
+
+
+def open_output(path, n_times, n_trajectories, dim, dtype=np.float64):
+    """
+    Массив вывода (n_times, n_trajectories, dim) в .npy-файле, отображённом в память.
+    Каждый момент времени — непрерывный блок, поэтому запись идёт последовательно.
+    """
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n_times, n_trajectories, dim))
+
+
+def _as_batch_function(fun, args):
+    """
+    Правая часть для внутреннего состояния (dim, n): функции задач (task3.ode2,
+    task4.predator_prey_system) распаковывают состояние по первой оси, а непрерывные строки
+    по компонентам считаются быстрее, чем столбцы массива (n, dim).
+    """
+    def batch(t, state):
+        return np.asarray(fun(t, state, *args), dtype=float).reshape(state.shape)
+    return batch
+
+
+def _prepare(y0, t_eval, out):
+    y0 = np.atleast_2d(np.asarray(y0, dtype=float))
+    t_eval = np.asarray(t_eval, dtype=float)
+    if t_eval.ndim != 1 or len(t_eval) < 1 or np.any(np.diff(t_eval) <= 0):
+        raise ValueError("t_eval должна быть возрастающей одномерной сеткой")
+    shape = (len(t_eval),) + y0.shape
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"Форма out {out.shape} не совпадает с ожидаемой {shape}")
+    out[0] = y0
+    return np.ascontiguousarray(y0.T), t_eval, out
+
+
+def rk4_integrate(fun, t_eval, y0, args=(), steps_per_output=10, out=None):
+    """
+    Классический метод Рунге–Кутты 4-го порядка с постоянным шагом для пучка траекторий.
+
+    :param fun: правая часть fun(t, Y, *args), поэлементная по траекториям
+    :param t_eval: моменты вывода; между соседними делается steps_per_output равных шагов
+    :param y0: начальные состояния (n_trajectories, dim)
+    :param out: массив (len(t_eval), n_trajectories, dim) для результата, например open_output(...)
+    :return: out
+    """
+    batch = _as_batch_function(fun, args)
+    state, t_eval, out = _prepare(y0, t_eval, out)
+    for i in range(1, len(t_eval)):
+        t = t_eval[i - 1]
+        h = (t_eval[i] - t) / steps_per_output
+        for _ in range(steps_per_output):
+            k1 = batch(t, state)
+            k2 = batch(t + h / 2, state + h / 2 * k1)
+            k3 = batch(t + h / 2, state + h / 2 * k2)
+            k4 = batch(t + h, state + h * k3)
+            state += h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            t += h
+        out[i] = state.T
+    return out
+
+
+class IntegrationStatistics:
+    def __init__(self, steps=0, rejected_steps=0, rhs_evaluations=0):
+        self.steps = steps
+        self.rejected_steps = rejected_steps
+        self.rhs_evaluations = rhs_evaluations
+
+    def __str__(self):
+        return (f"шагов: {self.steps}, отброшено: {self.rejected_steps}, "
+                f"вычислений f (на траекторию): {self.rhs_evaluations}")
+
+
+class AdaptiveIntegrator:
+    """
+    Вложенная пара Рунге–Кутты из scipy (RK45 — Дорман–Принс 5(4), RK23 — Богацкий–Шампайн 3(2))
+    с выбором шага для каждой траектории отдельно. Коэффициенты (A, B, C, E) берутся из классов
+    scipy.integrate, здесь только пошаговый цикл по пучку траекторий.
+
+    Каждая траектория идёт своими шагами, которые выбирает только контроль ошибки; моменты t_eval
+    внутри принятого шага заполняются по плотному выводу метода (матрица P из scipy, как в solve_ivp).
+    На каждом проходе считаются только траектории, ещё не дошедшие до конца интервала.
+
+    :param rtol: относительная точность
+    :param atol: абсолютная точность
+    :param method: 'RK45' или 'RK23'
+    """
+
+    METHODS = {"RK45": RK45, "RK23": RK23}
+
+    def __init__(self, rtol=1e-6, atol=1e-9, method="RK45"):
+        if rtol <= 0 or atol <= 0:
+            raise ValueError("Точности rtol и atol должны быть положительными.")
+        if method not in self.METHODS:
+            raise ValueError(f"Неизвестный метод {method}; доступны {', '.join(self.METHODS)}")
+        self.rtol = rtol
+        self.atol = atol
+        self.tableau = self.METHODS[method]
+        self.statistics = IntegrationStatistics()
+
+    def integrate(self, fun, t_eval, y0, args=(), out=None, first_step=None):
+        """
+        :param fun: правая часть fun(t, Y, *args), поэлементная по траекториям
+        :param t_eval: моменты вывода
+        :param y0: начальные состояния (n_trajectories, dim)
+        :param out: массив (len(t_eval), n_trajectories, dim), например open_output(...)
+        :return: out; счётчики шагов — в self.statistics
+        """
+        batch = _as_batch_function(fun, args)
+        state, t_eval, out = _prepare(y0, t_eval, out)
+        tableau = self.tableau
+        n = state.shape[1]
+        t_end = t_eval[-1]
+        t_lane = np.full(n, t_eval[0])
+        next_output = np.ones(n, dtype=int)
+        output_step = (t_end - t_eval[0]) / max(len(t_eval) - 1, 1)
+        step = np.full(n, first_step if first_step is not None else output_step / 10)
+        exponent = -1 / (tableau.error_estimator_order + 1)
+        steps = rejected = evaluations = 0
+        # последняя стадия принятого шага (FSAL) — это первая стадия следующего
+        derivative = batch(t_eval[0], state)
+        evaluations += 1
+
+        while True:
+            lanes = np.flatnonzero(t_lane < t_end)
+            if len(lanes) == 0:
+                break
+            # пока идут все траектории, берутся срезы без копирования
+            index = slice(None) if len(lanes) == n else lanes
+            t0 = t_lane[index].copy()
+            remaining = t_end - t0
+            h = np.minimum(step[index], remaining)
+            min_step = 1e-12 * np.maximum(1.0, np.abs(t0))
+            h = np.maximum(h, np.minimum(min_step, remaining))
+            y = state[:, index]
+            # стадии k_1 … k_s и значение f в новой точке: (число стадий + 1, dim, число траекторий)
+            stages = np.empty((tableau.n_stages + 1,) + y.shape)
+            # тот же массив со стадиями-строками: линейные комбинации стадий — одно умножение матриц
+            rows = stages.reshape(len(stages), -1)
+            stages[0] = derivative[:, index]
+            for k in range(1, tableau.n_stages):
+                increment = (tableau.A[k, :k] @ rows[:k]).reshape(y.shape)
+                stages[k] = batch(t0 + tableau.C[k] * h, y + h * increment)
+            y_new = y + h * (tableau.B @ rows[:-1]).reshape(y.shape)
+            # значение f в новой точке входит в оценку ошибки и переходит в следующий шаг (FSAL)
+            stages[-1] = batch(t0 + h, y_new)
+            evaluations += tableau.n_stages * len(lanes) / n
+            error = h * (tableau.E @ rows).reshape(y.shape)
+
+            scale = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error_norm = np.sqrt(np.mean((error / scale) ** 2, axis=0))
+            accept = (error_norm <= 1) | (h <= min_step)
+            factor = np.clip(0.9 * np.where(error_norm > 0, error_norm, 1e-10) ** exponent, 0.2, 5.0)
+            step[index] = h * factor
+            steps += int(accept.sum())
+            rejected += int((~accept).sum())
+
+            accepted = lanes[accept]
+            # последний шаг попадает в t_end точно, без ошибки округления t + h
+            t_new = np.where(h[accept] >= remaining[accept], t_end, t0[accept] + h[accept])
+            self._fill_outputs(out, t_eval, next_output, accepted, np.flatnonzero(accept), t0, t_new, h, y, stages)
+            t_lane[accepted] = t_new
+            state[:, accepted] = y_new[:, accept]
+            derivative[:, accepted] = stages[-1][:, accept]
+
+        self.statistics = IntegrationStatistics(steps, rejected, int(round(evaluations)))
+        return out
+
+    def _fill_outputs(self, out, t_eval, next_output, lanes, positions, t_old, t_new, h, y_old, stages):
+        """
+        Записывает в out моменты t_eval из (t_old, t_new] каждого принятого шага по плотному выводу:
+        y(t_old + θh) = y_old + h·Σ_s k_s·(P[s] @ (θ, θ², ...)).
+
+        :param lanes: номера траекторий с принятым шагом; t_new — их новые моменты
+        :param positions: их места в массивах прохода t_old, h, y_old (dim, ·) и stages (·, dim, ·)
+        """
+        counts = np.searchsorted(t_eval, t_new, side="right") - next_output[lanes]
+        # многочлен нужен только шагам, внутри которых есть моменты вывода
+        has_output = counts > 0
+        if not np.any(has_output):
+            return
+        lanes, positions, counts = lanes[has_output], positions[has_output], counts[has_output]
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(lanes)), counts)
+        index = next_output[lanes][owner] + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        next_output[lanes] += counts
+
+        # коэффициенты многочлена при θ, θ², ...: (степень, dim, шаг) — по одному набору на шаг
+        selected = stages[:, :, positions]
+        coefficients = (self.tableau.P.T @ selected.reshape(len(selected), -1)).reshape((-1,) + selected.shape[1:])
+        step, start, y_start = h[positions], t_old[positions], y_old[:, positions]
+        if total > len(lanes):
+            coefficients, step, start, y_start = coefficients[:, :, owner], step[owner], start[owner], y_start[:, owner]
+            lanes = lanes[owner]
+        theta = (t_eval[index] - start) / step
+        # схема Горнера на месте: временные массивы такого размера стоят дороже самих операций
+        value = coefficients[-1].copy()
+        for coefficient in coefficients[-2::-1]:
+            value *= theta
+            value += coefficient
+        value *= step * theta
+        value += y_start
+        if out.flags.c_contiguous:
+            # построчная запись в плоском представлении (n_times · n_trajectories, dim) дешевле пары индексов
+            out.reshape(-1, out.shape[-1])[index * out.shape[1] + lanes] = value.T
+        else:
+            out[index, lanes] = value.T
+
+
+def initial_grid(bounds, counts):
+    """Начальные условия на равномерной сетке: bounds = [(min, max), ...], counts = [n1, n2, ...]."""
+    axes = [np.linspace(low, high, count) for (low, high), count in zip(bounds, counts)]
+    return np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing="ij")], axis=1)
+
+
+def main():
+    import time
+
+    directory = tempfile.mkdtemp(prefix="trajectories_")
+
+    # Ван дер Поль (task3.ode2): 10^5 начальных условий, RK4 с постоянным шагом
+    y0 = initial_grid([(-3, 3), (-3, 3)], [400, 250])
+    t_eval = np.linspace(0, 30, 301)
+    out = open_output(os.path.join(directory, "van_der_pol.npy"), len(t_eval), len(y0), 2)
+    started = time.perf_counter()
+    rk4_integrate(ode2, t_eval, y0, args=(1.0,), steps_per_output=10, out=out)
+    out.flush()
+    print(f"Ван дер Поль, RK4: {len(y0)} траекторий за {time.perf_counter() - started:.2f} с, "
+          f"max|y(30)| = {np.abs(out[-1]).max():.4f}")
+
+    # хищник-жертва (task4): адаптивный шаг для каждой траектории
+    y0 = initial_grid([(5, 60), (1, 20)], [400, 250])
+    t_eval = np.linspace(0, 200, 401)
+    out = open_output(os.path.join(directory, "predator_prey.npy"), len(t_eval), len(y0), 2)
+    integrator = AdaptiveIntegrator(rtol=1e-6, atol=1e-9)
+    started = time.perf_counter()
+    integrator.integrate(predator_prey_system, t_eval, y0, args=(0.5, 0.01, 0.01, 0.2, 0.0005), out=out)
+    out.flush()
+    print(f"Хищник-жертва, RK45 (DOPRI5(4)): {len(y0)} траекторий за {time.perf_counter() - started:.2f} с, "
+          f"{integrator.statistics}")
+    print(f"Результаты: {directory}")
+
+
+if __name__ == "__main__":
+    main()